@@ -12,7 +12,14 @@ from homeassistant.components.http import StaticPathConfig  # type: ignore
 from homeassistant.exceptions import Unauthorized  # type: ignore
 from homeassistant.helpers import config_validation as cv  # type: ignore
 
+from .activity import async_setup_activity_tracker, async_unload_activity_tracker
+from .change_feed import async_setup_change_feed, async_unload_change_feed
 from .const import DOMAIN
+from .export import EntityExportView
+from .jobs import async_unload_jobs
+from .journal import async_setup_journal, async_unload_journal
+from .reference_graph import async_setup_reference_graph, async_unload_reference_graph
+from .registry_index import async_setup_registry_index, async_unload_registry_index
 from .websocket_api import async_setup_ws_api, enable_entity, disable_entity
 from .voice_assistant import async_setup_intents
 
@@ -30,6 +37,8 @@ SERVICE_SCHEMA = vol.Schema(
 
 async def async_setup(hass: HomeAssistant, config: dict) -> bool:
     """Set up the Entity Manager component."""
+    # Views can't be unregistered, so register once here rather than per entry
+    hass.http.register_view(EntityExportView())
     return True
 
 
@@ -42,6 +51,21 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         [StaticPathConfig(f"/api/{DOMAIN}/frontend", str(frontend_path), True)]
     )
 
+    # Build the registry index used by the listing commands
+    async_setup_registry_index(hass)
+
+    # Follow reloads so reference lookups can reuse the cached graph
+    async_setup_reference_graph(hass)
+
+    # Watch the config dir so file scans can skip unchanged files
+    await async_setup_change_feed(hass)
+
+    # Load the server-side undo/redo journal
+    await async_setup_journal(hass)
+
+    # Keep last-activity timestamps current from state_changed events
+    await async_setup_activity_tracker(hass)
+
     # Register WebSocket API
     async_setup_ws_api(hass)
 
@@ -118,4 +142,10 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     frontend.async_remove_panel(hass, DOMAIN)
     hass.services.async_remove(DOMAIN, SERVICE_ENABLE_ENTITY)
     hass.services.async_remove(DOMAIN, SERVICE_DISABLE_ENTITY)
+    async_unload_jobs(hass)
+    async_unload_journal(hass)
+    async_unload_registry_index(hass)
+    async_unload_reference_graph(hass)
+    await async_unload_change_feed(hass)
+    await async_unload_activity_tracker(hass)
     return True
@@ -0,0 +1,441 @@
+"""Last-activity timestamps per entity, kept current from state_changed."""
+
+import asyncio
+import logging
+from collections.abc import Callable, Collection
+from typing import Any
+
+from homeassistant.const import EVENT_STATE_CHANGED, STATE_UNAVAILABLE, STATE_UNKNOWN
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+from .jobs import Job, JobCancelled
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_ACTIVITY = "activity"
+STORAGE_KEY = f"{DOMAIN}.last_activity"
+STORAGE_VERSION = 1
+SAVE_DELAY = 60
+
+_INACTIVE_STATES = (STATE_UNAVAILABLE, STATE_UNKNOWN)
+
+
+# Latest valid row per metadata_id: a backward seek on the recorder's
+# (metadata_id, last_updated_ts) index that stops at the first row whose state
+# is not unavailable/unknown. last_changed_ts is NULL when it equals
+# last_updated_ts.
+_LATEST_VALID_ROW = """
+    SELECT COALESCE(s.last_changed_ts, s.last_updated_ts)
+    FROM states s
+    WHERE s.metadata_id = sm.metadata_id
+    AND s.state NOT IN ('unavailable', 'unknown'){since}
+    ORDER BY s.last_updated_ts DESC
+    LIMIT 1
+"""
+LAST_ACTIVITY_SQL = (
+    "SELECT sm.metadata_id, ("
+    + _LATEST_VALID_ROW
+    + ") FROM states_meta sm WHERE sm.metadata_id IN :metadata_ids"
+)
+# Statistics outlive purged states (statistics are never purged by default),
+# but a period is written every 5 minutes / hour even while the value stays
+# constant. The newest period whose value moved counts instead: min and max
+# differ within it (measurements), or its mean, state or sum differs from the
+# previous period's (totals). A statistic's first period counts as well. The
+# (metadata_id, start_ts) unique index serves the ordered window.
+STATISTICS_TABLES = ("statistics_short_term", "statistics")
+STATISTICS_ACTIVITY_SQL = """
+    SELECT metadata_id, MAX(start_ts) FROM (
+        SELECT metadata_id, start_ts, min, max, mean, state, sum,
+            LAG(start_ts) OVER (PARTITION BY metadata_id ORDER BY start_ts)
+                AS prev_start_ts,
+            LAG(mean) OVER (PARTITION BY metadata_id ORDER BY start_ts) AS prev_mean,
+            LAG(state) OVER (PARTITION BY metadata_id ORDER BY start_ts) AS prev_state,
+            LAG(sum) OVER (PARTITION BY metadata_id ORDER BY start_ts) AS prev_sum
+        FROM {table}
+        WHERE metadata_id IN :metadata_ids
+    ) periods
+    WHERE prev_start_ts IS NULL OR max <> min OR mean <> prev_mean
+    OR state <> prev_state OR sum <> prev_sum
+    GROUP BY metadata_id
+"""
+# metadata_ids per expanding IN. Chunks keep each statement under SQLite's
+# bound-variable limit without DDL on the recorder's pooled connections, and
+# give a job its progress and cancel points.
+METADATA_CHUNK = 500
+
+
+def _resolve_entity_ids(session: Any, column: str, values: list[Any]) -> dict[int, str]:
+    """Return metadata_id → entity_id for the states_meta rows matching values.
+
+    ``column`` is metadata_id or entity_id; values are bound in chunks of
+    METADATA_CHUNK as an expanding parameter.
+    """
+    from sqlalchemy import bindparam
+    from sqlalchemy import text as sa_text
+
+    stmt = sa_text(
+        f"SELECT metadata_id, entity_id FROM states_meta WHERE {column} IN :values"
+    ).bindparams(bindparam("values", expanding=True))
+    meta: dict[int, str] = {}
+    for i in range(0, len(values), METADATA_CHUNK):
+        chunk = values[i : i + METADATA_CHUNK]
+        for metadata_id, entity_id in session.execute(stmt, {"values": chunk}):
+            meta[metadata_id] = entity_id
+    return meta
+
+
+def _select_statistics_activity(
+    session: Any,
+    wanted: set[str] | None,
+    found: Collection[str],
+    since: float | None,
+) -> dict[str, float]:
+    """Return entity_id → Unix ms from statistics for entities not in found.
+
+    One windowed query per statistics table; the newer of the two wins.
+    """
+    from sqlalchemy import bindparam
+    from sqlalchemy import text as sa_text
+
+    meta = {
+        metadata_id: statistic_id
+        for metadata_id, statistic_id in session.execute(
+            sa_text("SELECT id, statistic_id FROM statistics_meta")
+        )
+        # External statistics use "domain:id"; entity statistics use entity_ids
+        if ":" not in statistic_id
+        and statistic_id not in found
+        and (wanted is None or statistic_id in wanted)
+    }
+    result: dict[str, float] = {}
+    metadata_ids = sorted(meta)
+    for table in STATISTICS_TABLES:
+        stmt = sa_text(STATISTICS_ACTIVITY_SQL.format(table=table)).bindparams(
+            bindparam("metadata_ids", expanding=True)
+        )
+        for i in range(0, len(metadata_ids), METADATA_CHUNK):
+            chunk = metadata_ids[i : i + METADATA_CHUNK]
+            for metadata_id, ts in session.execute(stmt, {"metadata_ids": chunk}):
+                if ts is not None and (since is None or ts >= since):
+                    entity_id = meta[metadata_id]
+                    result[entity_id] = max(result.get(entity_id, 0), float(ts) * 1000)
+    return result
+
+
+def select_last_activity(
+    session: Any,
+    entity_ids: list[str] | None,
+    since: float | None = None,
+    job: Job | None = None,
+    known: Collection[str] = (),
+) -> dict[str, float]:
+    """Run the last-activity query on a recorder session; entity_id → Unix ms.
+
+    The metadata_ids are resolved once (all of states_meta, or only the
+    requested entity_ids), then one index seek per metadata_id runs in chunks
+    of METADATA_CHUNK bound as an expanding parameter. ``since`` (Unix seconds) bounds the lookback.
+    Entities with no valid row left in ``states`` (purged) fall back to the
+    start of their newest short-term or long-term statistics period in which
+    the value moved, unless they are in ``known`` (timestamps the caller
+    already has and that statistics must not replace). With a job, reports
+    per-chunk progress and stops between chunks once cancelled.
+    """
+    from sqlalchemy import bindparam
+    from sqlalchemy import text as sa_text
+
+    wanted = set(entity_ids) if entity_ids else None
+    if wanted is None:
+        meta = {
+            metadata_id: entity_id
+            for metadata_id, entity_id in session.execute(
+                sa_text("SELECT metadata_id, entity_id FROM states_meta")
+            )
+        }
+    else:
+        meta = _resolve_entity_ids(session, "entity_id", sorted(wanted))
+    sql = LAST_ACTIVITY_SQL.format(
+        since="" if since is None else "\n    AND s.last_updated_ts >= :since"
+    )
+    stmt = sa_text(sql).bindparams(bindparam("metadata_ids", expanding=True))
+    params: dict[str, Any] = {} if since is None else {"since": since}
+    metadata_ids = sorted(meta)
+    if job is not None:
+        job.set_total_threadsafe(len(metadata_ids))
+    result: dict[str, float] = {}
+    for i in range(0, len(metadata_ids), METADATA_CHUNK):
+        if job is not None:
+            job.raise_if_cancelled()
+        chunk = metadata_ids[i : i + METADATA_CHUNK]
+        for metadata_id, ts in session.execute(stmt, {**params, "metadata_ids": chunk}):
+            if ts is not None:
+                result[meta[metadata_id]] = float(ts) * 1000  # s → ms
+        if job is not None:
+            job.advance_threadsafe(len(chunk))
+    found = set(result).union(known)
+    if wanted is None or not wanted.issubset(found):
+        result.update(_select_statistics_activity(session, wanted, found, since))
+    return result
+
+
+def query_last_activity(
+    hass: HomeAssistant,
+    entity_ids: list[str] | None,
+    job: Job | None = None,
+    since: float | None = None,
+    known: Collection[str] = (),
+) -> dict[str, float]:
+    """Return entity_id → last non-unavailable/unknown change (Unix ms).
+
+    Runs blocking recorder queries (see select_last_activity); returns {}
+    when the recorder is unavailable or the query fails.
+    """
+    try:
+        from homeassistant.components.recorder import get_instance
+    except ImportError:
+        return {}
+
+    try:
+        recorder = get_instance(hass)
+    except Exception:  # noqa: BLE001
+        return {}
+
+    try:
+        with recorder.get_session() as session:
+            return select_last_activity(session, entity_ids, since, job, known)
+    except JobCancelled:
+        raise
+    except Exception as exc:  # noqa: BLE001
+        _LOGGER.warning("Last activity recorder query failed: %s", exc)
+    return {}
+
+
+async def _async_recorder_ready(hass: HomeAssistant) -> bool:
+    """Wait for the recorder's database; False if it failed to come up.
+
+    Without a recorder there is nothing to wait for (the queries return {}).
+    """
+    try:
+        from homeassistant.components.recorder import get_instance
+    except ImportError:
+        return True
+
+    try:
+        recorder = get_instance(hass)
+    except Exception:  # noqa: BLE001
+        return True
+    return await recorder.async_db_ready
+
+
+# State changes (not attribute-only updates) per metadata_id and time bucket
+# in one range scan on the recorder's last_updated_ts index. last_changed_ts
+# is NULL (or equal) exactly when the state itself changed. The bucket is
+# computed in SQL: SQLite's CAST truncates, PostgreSQL and MySQL round, so
+# they floor instead.
+ACTIVITY_SUMMARY_SQL = (
+    "SELECT metadata_id, {bucket} AS bucket, COUNT(*), MIN(last_updated_ts),"
+    " MAX(last_updated_ts)"
+    " FROM states WHERE last_updated_ts >= :start AND last_updated_ts < :end"
+    " AND (last_changed_ts IS NULL OR last_changed_ts = last_updated_ts)"
+    " GROUP BY metadata_id, bucket"
+)
+_SQLITE_BUCKET = "CAST((last_updated_ts - :start) / :width AS INTEGER)"
+_FLOOR_BUCKET = "FLOOR((last_updated_ts - :start) / :width)"
+
+
+def select_activity_summary(
+    session: Any,
+    start: float,
+    end: float,
+    buckets: int,
+    entity_ids: list[str] | None = None,
+) -> dict[str, dict[str, Any]]:
+    """Return entity_id → {changes, first_changed, last_changed, histogram}.
+
+    [start, end) (Unix seconds) is split into ``buckets`` equal buckets and
+    one query groups the window by metadata_id and bucket; totals and
+    first/last change (Unix ms) are folded from the buckets. Only the
+    metadata_ids in the result (or those of ``entity_ids``) are resolved
+    through states_meta. Entities without changes are left out.
+    """
+    from sqlalchemy import text as sa_text
+
+    bucket_sql = (
+        _SQLITE_BUCKET if session.get_bind().dialect.name == "sqlite" else _FLOOR_BUCKET
+    )
+    stmt = sa_text(ACTIVITY_SUMMARY_SQL.format(bucket=bucket_sql))
+    params = {"start": start, "end": end, "width": (end - start) / buckets}
+    rows = session.execute(stmt, params).all()
+    if entity_ids is not None:
+        meta = _resolve_entity_ids(session, "entity_id", sorted(set(entity_ids)))
+    else:
+        meta = _resolve_entity_ids(session, "metadata_id", sorted({r[0] for r in rows}))
+    result: dict[str, dict[str, Any]] = {}
+    for metadata_id, bucket, count, first, last in rows:
+        if (entity_id := meta.get(metadata_id)) is None:
+            continue
+        row = result.get(entity_id)
+        if row is None:
+            row = result[entity_id] = {
+                "changes": 0,
+                "first_changed": first * 1000,
+                "last_changed": last * 1000,
+                "histogram": [0] * buckets,
+            }
+        row["changes"] += count
+        row["first_changed"] = min(row["first_changed"], first * 1000)
+        row["last_changed"] = max(row["last_changed"], last * 1000)
+        # Float rounding can push a row just below end past the last bucket
+        row["histogram"][min(int(bucket), buckets - 1)] += count
+    return result
+
+
+def query_activity_summary(
+    hass: HomeAssistant,
+    start: float,
+    end: float,
+    buckets: int,
+    entity_ids: list[str] | None = None,
+) -> dict[str, dict[str, Any]]:
+    """Run select_activity_summary on a recorder session; {} without a recorder.
+
+    Query errors propagate to the caller.
+    """
+    try:
+        from homeassistant.components.recorder import get_instance
+    except ImportError:
+        return {}
+
+    try:
+        recorder = get_instance(hass)
+    except Exception:  # noqa: BLE001
+        return {}
+
+    with recorder.get_session() as session:
+        return select_activity_summary(session, start, end, buckets, entity_ids)
+
+
+class ActivityTracker:
+    """entity_id → last non-unavailable/unknown change (Unix ms), in memory.
+
+    Seeded once per setup from the saved map and one recorder query, run once
+    the recorder's database is ready, then updated from every state_changed
+    event, so lookups never touch the database. The map is saved to .storage
+    with a delayed, coalesced save; it also keeps entities whose history the
+    recorder already purged.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialise an empty tracker."""
+        self.hass = hass
+        self._store: Store = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self._last: dict[str, float] = {}
+        self._seed_task: asyncio.Task | None = None
+        self._querying = False
+        self._unsubs: list[Callable[[], None]] = []
+
+    async def async_start(self) -> None:
+        """Load the saved map, start following events and seed in the background."""
+        data = await self._store.async_load()
+        if data:
+            self._last = data.get("last", {})
+        self._unsubs = [
+            self.hass.bus.async_listen(EVENT_STATE_CHANGED, self._async_state_changed),
+            self.hass.bus.async_listen(
+                er.EVENT_ENTITY_REGISTRY_UPDATED, self._async_registry_updated
+            ),
+        ]
+        self._seed_task = self.hass.async_create_background_task(
+            self._async_seed(), f"{DOMAIN} last activity seed"
+        )
+
+    async def async_stop(self) -> None:
+        """Stop following events and save the map now."""
+        for unsub in self._unsubs:
+            unsub()
+        self._unsubs = []
+        if self._seed_task is not None and not self._seed_task.done():
+            self._seed_task.cancel()
+        await self._store.async_save(self._data_to_save())
+
+    def _data_to_save(self) -> dict[str, Any]:
+        return {"last": self._last}
+
+    async def _async_seed(self) -> None:
+        if not await _async_recorder_ready(self.hass):
+            _LOGGER.warning("Recorder did not start; last activity not seeded")
+            return
+        self._querying = True
+        try:
+            # Statistics only fill in entities the saved map doesn't know
+            seeded = await self.hass.async_add_executor_job(
+                query_last_activity, self.hass, None, None, None, set(self._last)
+            )
+        finally:
+            self._querying = False
+        # Keep whichever is newer: events may have arrived during the query
+        for entity_id, ts in seeded.items():
+            if ts > self._last.get(entity_id, 0):
+                self._last[entity_id] = ts
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+        _LOGGER.debug("Last activity seeded for %d entities", len(seeded))
+
+    @callback
+    def _async_state_changed(self, event: Event) -> None:
+        new_state = event.data["new_state"]
+        if new_state is None or new_state.state in _INACTIVE_STATES:
+            return
+        ts = new_state.last_changed_timestamp * 1000
+        entity_id = event.data["entity_id"]
+        if ts > self._last.get(entity_id, 0):
+            self._last[entity_id] = ts
+            self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    @callback
+    def _async_registry_updated(self, event: Event) -> None:
+        data = event.data
+        if data["action"] == "remove":
+            if self._last.pop(data["entity_id"], None) is not None:
+                self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+        elif data["action"] == "update" and (
+            (ts := self._last.pop(data.get("old_entity_id"), None)) is not None
+        ):
+            # Carry the timestamp over a rename
+            new_id = data["entity_id"]
+            self._last[new_id] = max(ts, self._last.get(new_id, 0))
+            self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    async def async_get(self, entity_ids: list[str] | None) -> dict[str, float]:
+        """Return entity_id → Unix ms for the given entities (or all known).
+
+        Waits for a running seed query, but not for the recorder to start.
+        """
+        if self._querying and self._seed_task is not None:
+            await asyncio.shield(self._seed_task)
+        if entity_ids is None:
+            return dict(self._last)
+        return {eid: self._last[eid] for eid in entity_ids if eid in self._last}
+
+
+async def async_setup_activity_tracker(hass: HomeAssistant) -> ActivityTracker:
+    """Create the activity tracker and start following state changes."""
+    tracker = ActivityTracker(hass)
+    await tracker.async_start()
+    hass.data.setdefault(DOMAIN, {})[DATA_ACTIVITY] = tracker
+    return tracker
+
+
+async def async_unload_activity_tracker(hass: HomeAssistant) -> None:
+    """Stop the activity tracker and save its map."""
+    tracker: ActivityTracker | None = hass.data.get(DOMAIN, {}).pop(DATA_ACTIVITY, None)
+    if tracker is not None:
+        await tracker.async_stop()
+
+
+@callback
+def async_get_activity_tracker(hass: HomeAssistant) -> ActivityTracker | None:
+    """Return the activity tracker, or None when the config entry is not set up."""
+    return hass.data.get(DOMAIN, {}).get(DATA_ACTIVITY)
@@ -0,0 +1,169 @@
+"""Content-addressed, compressed backups of config files edited by Entity Manager."""
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import threading
+import uuid
+from pathlib import Path
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, MAX_BACKUP_BYTES
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_BACKUPS = "backups"
+MANIFEST = "backups.json"
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+class BackupStore:
+    """Pre-edit copies of config files under .storage/entity_manager/backups.
+
+    Content is stored once per SHA-256 (gzip-compressed), so repeated
+    rewrites of the same content cost one object. The manifest lists every
+    backup point (file, time, reason, hash); when the stored objects exceed
+    ``max_bytes`` the oldest backups are evicted first. Methods are blocking
+    and thread-safe: YAML rewrites call ``add`` from executor worker threads.
+    """
+
+    def __init__(self, config_path: Path, max_bytes: int = MAX_BACKUP_BYTES) -> None:
+        """Initialise the store; the manifest is read on first use."""
+        self.config_path = config_path
+        self.directory = config_path / ".storage" / DOMAIN / "backups"
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: list[dict[str, Any]] | None = None
+        self._stored: dict[str, int] = {}
+
+    def _object(self, digest: str) -> Path:
+        return self.directory / f"{digest}.gz"
+
+    def _load(self) -> list[dict[str, Any]]:
+        """Read the manifest once and drop entries whose object is missing."""
+        if self._entries is not None:
+            return self._entries
+        try:
+            entries = json.loads((self.directory / MANIFEST).read_bytes())["backups"]
+        except (OSError, ValueError, KeyError, TypeError):
+            entries = []
+        self._entries = []
+        for entry in entries:
+            digest = entry["hash"]
+            if digest not in self._stored:
+                try:
+                    self._stored[digest] = self._object(digest).stat().st_size
+                except OSError:
+                    continue
+            self._entries.append(entry)
+        return self._entries
+
+    def _save(self) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        _write_atomic(
+            self.directory / MANIFEST,
+            json.dumps({"version": 1, "backups": self._entries}).encode(),
+        )
+
+    def _evict(self) -> None:
+        """Drop the oldest backups until the stored objects fit max_bytes."""
+        entries = self._load()
+        while len(entries) > 1 and sum(self._stored.values()) > self.max_bytes:
+            digest = entries.pop(0)["hash"]
+            if all(entry["hash"] != digest for entry in entries):
+                self._object(digest).unlink(missing_ok=True)
+                del self._stored[digest]
+
+    def add(self, filepath: Path, content: str, reason: str) -> dict[str, Any] | None:
+        """Record the content a file had before an edit.
+
+        Returns the new backup entry, or None when the newest backup of the
+        same file already holds this exact content.
+        """
+        data = content.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        rel = filepath.relative_to(self.config_path).as_posix()
+        with self._lock:
+            entries = self._load()
+            latest = next((e for e in reversed(entries) if e["file"] == rel), None)
+            if latest is not None and latest["hash"] == digest:
+                return None
+            if digest not in self._stored:
+                self.directory.mkdir(parents=True, exist_ok=True)
+                compressed = gzip.compress(data, compresslevel=6)
+                _write_atomic(self._object(digest), compressed)
+                self._stored[digest] = len(compressed)
+            entry = {
+                "id": uuid.uuid4().hex[:12],
+                "ts": dt_util.utcnow().isoformat(),
+                "file": rel,
+                "hash": digest,
+                "size": len(data),
+                "reason": reason,
+            }
+            entries.append(entry)
+            self._evict()
+            self._save()
+            return entry
+
+    def entries(self, file: str | None = None) -> list[dict[str, Any]]:
+        """Return backup entries, newest first, optionally for one file."""
+        with self._lock:
+            return [
+                {**entry, "stored": self._stored[entry["hash"]]}
+                for entry in reversed(self._load())
+                if file is None or entry["file"] == file
+            ]
+
+    def stored_bytes(self) -> int:
+        """Return the compressed size of every stored object."""
+        with self._lock:
+            self._load()
+            return sum(self._stored.values())
+
+    def read(self, backup_id: str) -> tuple[dict[str, Any], str]:
+        """Return (entry, content) for a backup id; KeyError when unknown."""
+        with self._lock:
+            entry = next((e for e in self._load() if e["id"] == backup_id), None)
+            if entry is None:
+                raise KeyError(backup_id)
+            data = gzip.decompress(self._object(entry["hash"]).read_bytes())
+        return entry, data.decode("utf-8")
+
+    def restore(self, backup_id: str) -> dict[str, Any]:
+        """Write a backup's content back to its file.
+
+        The current content is backed up first (reason "restore"), so a
+        restore can itself be undone.
+        """
+        entry, content = self.read(backup_id)
+        target = self.config_path / entry["file"]
+        if not target.resolve().is_relative_to(self.config_path.resolve()):
+            raise ValueError(f"{entry['file']} is outside the config directory")
+        if target.name == "secrets.yaml":
+            raise ValueError("secrets.yaml is never written")
+        if target.is_file():
+            self.add(target, target.read_text(encoding="utf-8"), "restore")
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(content, encoding="utf-8")
+        return {"file": entry["file"], "size": entry["size"], "ts": entry["ts"]}
+
+
+@callback
+def async_get_backup_store(hass: HomeAssistant) -> BackupStore:
+    """Return the backup store, creating it on first use."""
+    data = hass.data.setdefault(DOMAIN, {})
+    store: BackupStore | None = data.get(DATA_BACKUPS)
+    if store is None or store.config_path != Path(hass.config.config_dir):
+        store = data[DATA_BACKUPS] = BackupStore(Path(hass.config.config_dir))
+    return store
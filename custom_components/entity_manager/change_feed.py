@@ -0,0 +1,233 @@
+"""Config directory change feed for Entity Manager.
+
+File-based consumers (the YAML reference and template indexes, the HACS
+listing) ask "what changed since token X?" instead of re-reading or
+re-walking the config dir on every request.
+
+Normally the feed runs an on-demand stat sweep of the paths consumers asked
+it to watch, which is far cheaper than re-reading the files. ``watchdog`` is
+not a requirement of the integration; when it happens to be importable
+(another integration installed it) changes are pushed by the OS (inotify on
+Linux) instead and an unchanged config costs no disk I/O.
+"""
+
+import logging
+import os
+import uuid
+from collections import deque
+from collections.abc import Callable, Iterable
+from pathlib import Path
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DOMAIN
+
+try:
+    from watchdog.events import FileSystemEvent, FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:  # pragma: no cover - optional dependency
+    Observer = None
+    FileSystemEventHandler = object
+    FileSystemEvent = Any
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_CHANGE_FEED = "change_feed"
+
+# Changed paths remembered for changes_since(); older tokens get None
+# ("unknown, rescan everything").
+MAX_CHANGE_LOG = 10000
+
+# Top-level names whose churn is never interesting to a consumer
+_IGNORED_TOP = {"deps", "tts", "backups", "__pycache__", ".git", ".cloud"}
+_IGNORED_SUFFIXES = (".db", ".db-wal", ".db-shm", ".log", ".log.1", ".tmp", ".pyc")
+
+
+def is_relevant(rel: str) -> bool:
+    """Return True for paths worth reporting (filters recorder/log churn)."""
+    parts = rel.split("/")
+    if parts[0] in _IGNORED_TOP or rel.endswith(_IGNORED_SUFFIXES):
+        return False
+    if parts[0] == ".storage":
+        return len(parts) == 2 and parts[1].startswith("hacs")
+    return True
+
+
+def _stat(path: Path) -> tuple[int, int] | None:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def stat_paths(
+    config_path: Path, paths: Iterable[str]
+) -> dict[str, tuple[int, int] | None]:
+    """Return (mtime_ns, size) per config-relative path for async_watch. Blocking."""
+    return {rel: _stat(config_path / rel) for rel in paths}
+
+
+class _Handler(FileSystemEventHandler):
+    """Forward watchdog events to the feed on the event loop."""
+
+    def __init__(self, feed: "ChangeFeed") -> None:
+        self._feed = feed
+
+    def on_any_event(self, event: FileSystemEvent) -> None:
+        for path in (event.src_path, getattr(event, "dest_path", "")):
+            if path:
+                self._feed.record_threadsafe(os.fsdecode(path))
+
+
+class ChangeFeed:
+    """Sequence-numbered log of changed paths under the config dir.
+
+    Tokens are "<feed id>:<sequence number>"; ``async_changes_since(token)``
+    returns the current token and the relative paths changed after it, or
+    None when that is unknown (first call, a token from an earlier feed, or
+    one that fell out of the log).
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialise the feed in polling mode."""
+        self.hass = hass
+        self.config_path = Path(hass.config.config_dir)
+        self.id = uuid.uuid4().hex[:8]
+        self.seq = 0
+        self._log: deque[tuple[int, str]] = deque(maxlen=MAX_CHANGE_LOG)
+        self._observer: Any = None
+        self._watched: dict[str, tuple[int, int] | None] = {}
+        self._pending: dict[str, tuple[int, int] | None] = {}
+
+    @property
+    def live(self) -> bool:
+        """Return True when changes are pushed by the OS (no polling needed)."""
+        return self._observer is not None
+
+    def start(self) -> bool:
+        """Start the OS watcher if watchdog is available. Blocking."""
+        if Observer is None:
+            return False
+        try:
+            observer = Observer()
+            observer.schedule(_Handler(self), str(self.config_path), recursive=True)
+            observer.daemon = True
+            observer.start()
+        except Exception as err:  # noqa: BLE001
+            _LOGGER.warning("Config watcher unavailable, using stat polling: %s", err)
+            return False
+        self._observer = observer
+        return True
+
+    def stop(self) -> None:
+        """Stop the OS watcher. Blocking."""
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join(5)
+            self._observer = None
+
+    def record_threadsafe(self, path: str) -> None:
+        """Record a change reported from the watcher thread."""
+        self.hass.loop.call_soon_threadsafe(self._record_path, path)
+
+    @callback
+    def _record_path(self, path: str) -> None:
+        try:
+            rel = Path(path).relative_to(self.config_path).as_posix()
+        except ValueError:
+            return
+        if is_relevant(rel):
+            self.async_record(rel)
+
+    @callback
+    def async_record(self, rel: str) -> None:
+        """Record that a config-relative path changed."""
+        self.seq += 1
+        self._log.append((self.seq, rel))
+
+    @callback
+    def async_watch(self, stats: dict[str, tuple[int, int] | None]) -> None:
+        """Add paths (files or dirs) to the polling sweep.
+
+        ``stats`` maps each path to the (mtime_ns, size) the consumer saw
+        when it read it (see stat_paths), so a change between that read and
+        the next sweep is not missed. No-op when live.
+        """
+        if self.live:
+            return
+        for rel, seen in stats.items():
+            if rel not in self._watched and rel not in self._pending:
+                self._pending[rel] = seen
+
+    def _poll(
+        self,
+        watched: dict[str, tuple[int, int] | None],
+        pending: dict[str, tuple[int, int] | None],
+    ) -> tuple[list[str], dict[str, tuple[int, int] | None]]:
+        """Stat every watched path; return (changed, new stats). Blocking."""
+        changed: list[str] = []
+        stats: dict[str, tuple[int, int] | None] = {}
+        for rel, seen in watched.items():
+            stats[rel] = _stat(self.config_path / rel)
+            if stats[rel] != seen:
+                changed.append(rel)
+        for rel, seen in pending.items():
+            stats[rel] = _stat(self.config_path / rel)
+            if stats[rel] != seen:
+                changed.append(rel)
+        return changed, stats
+
+    async def async_changes_since(
+        self, token: str | None
+    ) -> tuple[str, set[str] | None]:
+        """Return (token, paths changed after ``token`` or None if unknown)."""
+        if not self.live and (self._watched or self._pending):
+            pending, self._pending = self._pending, {}
+            changed, stats = await self.hass.async_add_executor_job(
+                self._poll, dict(self._watched), pending
+            )
+            self._watched.update(stats)
+            for rel in changed:
+                self.async_record(rel)
+        current = f"{self.id}:{self.seq}"
+        feed_id, _, seq_text = (token or "").partition(":")
+        if feed_id != self.id:
+            return current, None
+        since = int(seq_text)
+        if since < self.seq and self._log[0][0] > since + 1:
+            return current, None
+        return current, {rel for seq, rel in self._log if seq > since}
+
+    async def async_has_changes(
+        self, token: str | None, relevant: Callable[[str], bool]
+    ) -> tuple[str, bool]:
+        """Return (token, whether any relevant path changed after ``token``)."""
+        token, changed = await self.async_changes_since(token)
+        return token, changed is None or any(relevant(rel) for rel in changed)
+
+
+async def async_setup_change_feed(hass: HomeAssistant) -> ChangeFeed:
+    """Create the change feed and start the OS watcher when available."""
+    feed = async_get_change_feed(hass)
+    if await hass.async_add_executor_job(feed.start):
+        _LOGGER.debug("Watching %s for changes", feed.config_path)
+    return feed
+
+
+async def async_unload_change_feed(hass: HomeAssistant) -> None:
+    """Stop the OS watcher and drop the feed."""
+    feed: ChangeFeed | None = hass.data.get(DOMAIN, {}).pop(DATA_CHANGE_FEED, None)
+    if feed is not None:
+        await hass.async_add_executor_job(feed.stop)
+
+
+@callback
+def async_get_change_feed(hass: HomeAssistant) -> ChangeFeed:
+    """Return the change feed, creating a polling one on first use."""
+    data = hass.data.setdefault(DOMAIN, {})
+    feed: ChangeFeed | None = data.get(DATA_CHANGE_FEED)
+    if feed is None or feed.config_path != Path(hass.config.config_dir):
+        feed = data[DATA_CHANGE_FEED] = ChangeFeed(hass)
+    return feed
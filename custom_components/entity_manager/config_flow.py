@@ -6,8 +6,17 @@ from typing import Any
 import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.config_entries import ConfigFlowResult as FlowResult  # type: ignore[attr-defined]
+from homeassistant.core import callback
 
-from .const import DOMAIN
+from .const import (
+    CONF_YAML_EXCLUDE,
+    CONF_YAML_MAX_FILE_KB,
+    CONF_YAML_SCAN_MODE,
+    DEFAULT_YAML_MAX_FILE_KB,
+    DOMAIN,
+    YAML_SCAN_ALL,
+    YAML_SCAN_INCLUDE_GRAPH,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -31,3 +40,49 @@ class EntityManagerConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             step_id="user",
             data_schema=vol.Schema({}),
         )
+
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> config_entries.OptionsFlow:
+        """Return the options flow."""
+        return EntityManagerOptionsFlow(config_entry)
+
+
+class EntityManagerOptionsFlow(config_entries.OptionsFlow):
+    """Options for which YAML files the reference scans read."""
+
+    def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
+        """Initialise the options flow."""
+        self._entry = config_entry
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Manage the YAML scan options."""
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
+
+        options = self._entry.options
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        CONF_YAML_SCAN_MODE,
+                        default=options.get(CONF_YAML_SCAN_MODE, YAML_SCAN_ALL),
+                    ): vol.In([YAML_SCAN_ALL, YAML_SCAN_INCLUDE_GRAPH]),
+                    vol.Optional(
+                        CONF_YAML_EXCLUDE,
+                        default=options.get(CONF_YAML_EXCLUDE, ""),
+                    ): str,
+                    vol.Required(
+                        CONF_YAML_MAX_FILE_KB,
+                        default=options.get(
+                            CONF_YAML_MAX_FILE_KB, DEFAULT_YAML_MAX_FILE_KB
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=102400)),
+                }
+            ),
+        )
@@ -4,4 +4,26 @@ import re
 
 DOMAIN = "entity_manager"
 MAX_BULK_ENTITIES = 500
+MAX_BULK_TOGGLE_ENTITIES = 10000
+BULK_WRITE_BATCH_SIZE = 500
+MAX_PAGE_SIZE = 5000
+MAX_IMPORT_CHUNK_ROWS = 5000
+MAX_IMPORT_ROWS = 100000
+IMPORT_SESSION_TTL = 3600
+MAX_CONCURRENT_JOBS = 2
+MAX_FINISHED_JOBS = 50
+MAX_JOURNAL_ENTRIES = 100
+MAX_JOURNAL_CHANGES = 20000
+MAX_BACKUP_BYTES = 50 * 1024 * 1024
+MAX_ACTIVITY_HOURS = 24 * 30
+MAX_ACTIVITY_BUCKETS = 168
+
+# Options: which YAML files the reference scans read
+CONF_YAML_SCAN_MODE = "yaml_scan_mode"
+CONF_YAML_EXCLUDE = "yaml_exclude"
+CONF_YAML_MAX_FILE_KB = "yaml_max_file_kb"
+YAML_SCAN_INCLUDE_GRAPH = "include_graph"
+YAML_SCAN_ALL = "all"
+DEFAULT_YAML_MAX_FILE_KB = 1024
+
 VALID_ENTITY_ID = re.compile(r"^[a-z][a-z0-9_]*\.[a-z0-9_]+$")
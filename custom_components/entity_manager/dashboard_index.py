@@ -0,0 +1,348 @@
+"""Cached per-dashboard card and entity usage for Entity Manager."""
+
+import asyncio
+import json
+import logging
+import re
+from collections import Counter
+from collections.abc import Iterator, Mapping
+from pathlib import Path
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util.yaml import Secrets, load_yaml
+
+from .const import DOMAIN
+from .yaml_index import ENTITY_REF
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_DASHBOARD_INDEX = "dashboard_index"
+
+DEFAULT_DASHBOARD_TITLE = "Overview"
+MODE_STORAGE = "storage"
+MODE_YAML = "yaml"
+
+
+def _iter_strings(node: Any) -> Iterator[str]:
+    if isinstance(node, str):
+        yield node
+    elif isinstance(node, dict):
+        for key, value in node.items():
+            if isinstance(key, str):
+                yield key
+            yield from _iter_strings(value)
+    elif isinstance(node, list):
+        for value in node:
+            yield from _iter_strings(value)
+
+
+def config_entity_ids(config: Any) -> set[str]:
+    """Return every entity_id-shaped token anywhere in a dashboard config.
+
+    Plain values, dict keys and entity_ids inside templates (markdown
+    content, card_mod, …) all count; callers filter against known IDs.
+    """
+    found: set[str] = set()
+    for text in _iter_strings(config):
+        if "." in text:
+            found.update(ENTITY_REF.findall(text))
+    return found
+
+
+def _iter_cards(cards: Any) -> Iterator[dict[str, Any]]:
+    """Yield cards depth-first through stacks, wrappers and picture elements."""
+    for card in cards if isinstance(cards, list) else ():
+        if not isinstance(card, dict):
+            continue
+        yield card
+        yield from _iter_cards(card.get("cards"))
+        if isinstance(card.get("card"), dict):
+            yield from _iter_cards([card["card"]])
+        yield from _iter_cards(card.get("elements"))
+
+
+def scan_dashboard_config(config: Any) -> dict[str, Any]:
+    """Return {"views": [...], "card_types": [...]} for one dashboard config.
+
+    Each view row holds view (path or position), view_title, cards, a
+    {card type: count} map and the unfiltered entity_id candidates it mentions.
+    """
+    views: list[dict[str, Any]] = []
+    card_types: set[str] = set()
+    raw_views = config.get("views") if isinstance(config, dict) else None
+    for position, view in enumerate(raw_views or []):
+        if not isinstance(view, dict):
+            continue
+        cards = list(_iter_cards(view.get("cards")))
+        for section in view.get("sections") or []:
+            if isinstance(section, dict):
+                cards.extend(_iter_cards(section.get("cards")))
+        types = Counter(
+            card["type"] for card in cards if isinstance(card.get("type"), str)
+        )
+        card_types.update(types)
+        views.append(
+            {
+                "view": view.get("path") or position,
+                "view_title": view.get("title"),
+                "cards": len(cards),
+                "card_types": dict(types),
+                "entities": sorted(config_entity_ids(view)),
+            }
+        )
+    return {"views": views, "card_types": sorted(card_types)}
+
+
+def _load_json(path: Path) -> dict[str, Any]:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def dashboard_meta(storage: Path) -> dict[str, dict[str, str]]:
+    """Return {storage suffix: {url_path, title}} from lovelace_dashboards."""
+    items = (_load_json(storage / "lovelace_dashboards").get("data") or {}).get(
+        "items"
+    ) or []
+    return {
+        item["id"]: {
+            "url_path": item.get("url_path") or item["id"],
+            "title": item.get("title") or item["id"],
+        }
+        for item in items
+        if isinstance(item, dict) and item.get("id")
+    }
+
+
+def lovelace_storage_files(storage: Path) -> list[Path]:
+    """Return the storage-mode dashboard config files under .storage."""
+    if not storage.is_dir():
+        return []
+    return sorted(
+        path
+        for path in storage.iterdir()
+        if path.name == "lovelace" or path.name.startswith("lovelace.")
+    )
+
+
+def scan_dashboard_file(path: Path, mode: str, config_path: Path) -> dict[str, Any]:
+    """Parse one dashboard file; {"error": ...} when it can't be read."""
+    try:
+        if mode == MODE_YAML:
+            config = load_yaml(path, Secrets(config_path))
+        else:
+            config = (
+                json.loads(path.read_text(encoding="utf-8")).get("data") or {}
+            ).get("config")
+    except Exception as exc:  # noqa: BLE001
+        return {"error": str(exc)}
+    return scan_dashboard_config(config)
+
+
+@callback
+def _live_dashboards(hass: HomeAssistant) -> dict[str | None, Any]:
+    """Return the lovelace integration's {url_path: dashboard} objects."""
+    data = hass.data.get("lovelace")
+    dashboards = getattr(data, "dashboards", None)
+    if dashboards is None and isinstance(data, dict):
+        dashboards = data.get("dashboards")
+    return dashboards or {}
+
+
+def _dashboard_title(url_path: str | None, dashboard: Any) -> str:
+    config = getattr(dashboard, "config", None) or {}
+    return config.get("title") or url_path or DEFAULT_DASHBOARD_TITLE
+
+
+@callback
+def _yaml_dashboards(hass: HomeAssistant) -> list[dict[str, Any]]:
+    """Return the YAML-mode dashboards the lovelace integration loaded."""
+    found: list[dict[str, Any]] = []
+    for url_path, dashboard in _live_dashboards(hass).items():
+        # Only LovelaceYAML has a file path; storage dashboards are read below
+        path = getattr(dashboard, "path", None)
+        if not isinstance(path, str):
+            continue
+        found.append(
+            {
+                "url_path": url_path,
+                "title": _dashboard_title(url_path, dashboard),
+                "mode": MODE_YAML,
+                "path": path,
+            }
+        )
+    return found
+
+
+def rewrite_config(
+    node: Any, pattern: re.Pattern[str], renames: Mapping[str, str]
+) -> tuple[Any, int]:
+    """Return a copy of a dashboard config with renames applied, and the count.
+
+    Every string value and dict key is rewritten with the whole-token
+    ``pattern`` (see the YAML rewrite); the input is never modified.
+    """
+    if isinstance(node, str):
+        if "." not in node:
+            return node, 0
+        return pattern.subn(lambda match: renames[match.group()], node)
+    if isinstance(node, dict):
+        total = 0
+        result = {}
+        for key, value in node.items():
+            new_key, key_count = rewrite_config(key, pattern, renames)
+            new_value, value_count = rewrite_config(value, pattern, renames)
+            result[new_key] = new_value
+            total += key_count + value_count
+        return (result, total) if total else (node, 0)
+    if isinstance(node, list):
+        pairs = [rewrite_config(value, pattern, renames) for value in node]
+        total = sum(count for _, count in pairs)
+        return ([value for value, _ in pairs], total) if total else (node, 0)
+    return node, 0
+
+
+async def async_rewrite_dashboard_references(
+    hass: HomeAssistant,
+    pattern: re.Pattern[str],
+    renames: Mapping[str, str],
+    dry_run: bool,
+) -> dict[str, Any]:
+    """Apply renames to every storage-mode dashboard config.
+
+    Each config is rewritten in memory in one pass and saved once through
+    the lovelace integration, which reloads the dashboard for open
+    frontends (``lovelace_updated``). YAML dashboards are covered by the
+    YAML rewrite.
+    """
+    updated: list[dict[str, Any]] = []
+    errors: list[dict[str, Any]] = []
+    for url_path, dashboard in _live_dashboards(hass).items():
+        if getattr(dashboard, "mode", None) != MODE_STORAGE:
+            continue
+        title = _dashboard_title(url_path, dashboard)
+        try:
+            config = await dashboard.async_load(False)
+        except HomeAssistantError:
+            # Auto-generated dashboard: nothing stored to rewrite
+            continue
+        try:
+            new_config, count = await hass.async_add_executor_job(
+                rewrite_config, config, pattern, renames
+            )
+            if not count:
+                continue
+            if not dry_run:
+                await dashboard.async_save(new_config)
+        except Exception as exc:  # noqa: BLE001
+            errors.append({"dashboard": url_path, "title": title, "error": str(exc)})
+            continue
+        updated.append({"dashboard": url_path, "title": title, "replacements": count})
+    return {
+        "dry_run": dry_run,
+        "dashboards_updated": updated,
+        "errors": errors,
+        "total_replacements": sum(row["replacements"] for row in updated),
+    }
+
+
+class DashboardIndex:
+    """Views, cards and entity_ids per dashboard, cached per file by mtime/size.
+
+    Storage-mode dashboards are read from ``.storage/lovelace*`` and YAML
+    dashboards from the files the lovelace integration loaded, so one query
+    replaces a ``lovelace/config`` round trip per dashboard. Only files whose
+    mtime or size changed are parsed again.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialise an empty index."""
+        self.hass = hass
+        self.config_path = Path(hass.config.config_dir)
+        self._files: dict[str, dict[str, Any]] = {}
+        self._lock = asyncio.Lock()
+
+    def _sources(self, yaml_sources: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        storage = self.config_path / ".storage"
+        meta = dashboard_meta(storage)
+        sources = list(yaml_sources)
+        yaml_default = any(source["url_path"] is None for source in sources)
+        for path in lovelace_storage_files(storage):
+            suffix = path.name.partition(".")[2]
+            if not suffix:
+                if yaml_default:
+                    # A leftover storage config is ignored in YAML mode
+                    continue
+                info = {"url_path": None, "title": DEFAULT_DASHBOARD_TITLE}
+            else:
+                info = meta.get(suffix, {"url_path": suffix, "title": suffix})
+            sources.append({**info, "mode": MODE_STORAGE, "path": str(path)})
+        return sources
+
+    def _refresh(
+        self, yaml_sources: list[dict[str, Any]]
+    ) -> tuple[list[dict[str, Any]], dict[str, dict[str, Any]], int]:
+        """Stat every dashboard file and re-parse only changed ones. Blocking."""
+        dashboards: list[dict[str, Any]] = []
+        files: dict[str, dict[str, Any]] = {}
+        rescanned = 0
+        for source in self._sources(yaml_sources):
+            path = Path(source.pop("path"))
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            key = str(path)
+            cached = self._files.get(key)
+            if (
+                cached is None
+                or cached["mtime_ns"] != st.st_mtime_ns
+                or cached["size"] != st.st_size
+            ):
+                cached = {
+                    "mtime_ns": st.st_mtime_ns,
+                    "size": st.st_size,
+                    **scan_dashboard_file(path, source["mode"], self.config_path),
+                }
+                rescanned += 1
+            files[key] = cached
+            try:
+                source["file"] = path.relative_to(self.config_path).as_posix()
+            except ValueError:
+                source["file"] = key
+            dashboards.append({**source, **cached})
+        return dashboards, files, rescanned
+
+    async def async_dashboards(self) -> list[dict[str, Any]]:
+        """Return {url_path, title, mode, file, views, card_types} per dashboard.
+
+        Dashboards that could not be parsed carry ``error`` instead of views.
+        """
+        yaml_sources = _yaml_dashboards(self.hass)
+        async with self._lock:
+            dashboards, self._files, rescanned = await self.hass.async_add_executor_job(
+                self._refresh, yaml_sources
+            )
+        if rescanned:
+            _LOGGER.debug("Dashboard index: parsed %d file(s)", rescanned)
+        return [
+            {
+                key: value
+                for key, value in dashboard.items()
+                if key not in ("mtime_ns", "size")
+            }
+            for dashboard in dashboards
+        ]
+
+
+@callback
+def async_get_dashboard_index(hass: HomeAssistant) -> DashboardIndex:
+    """Return the dashboard index, creating it on first use."""
+    data = hass.data.setdefault(DOMAIN, {})
+    index: DashboardIndex | None = data.get(DATA_DASHBOARD_INDEX)
+    if index is None or index.config_path != Path(hass.config.config_dir):
+        index = data[DATA_DASHBOARD_INDEX] = DashboardIndex(hass)
+    return index
@@ -0,0 +1,263 @@
+"""File-backed, gzip-compressed entity export for Entity Manager."""
+
+import asyncio
+import gzip
+import hashlib
+import json
+import logging
+import os
+import uuid
+from collections.abc import Iterable, Iterator
+from datetime import datetime
+from http import HTTPStatus
+from pathlib import Path
+from typing import Any, BinaryIO
+from wsgiref.handlers import format_date_time
+
+from aiohttp import hdrs, web
+from homeassistant.components.http import KEY_HASS, KEY_HASS_USER, HomeAssistantView
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import Unauthorized
+from homeassistant.helpers import area_registry as ar
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers import label_registry as lr
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+from .registry_index import async_get_registry_index
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_EXPORT = "export"
+EXPORT_URL = f"/api/{DOMAIN}/export"
+EXPORT_FORMATS = ("json", "ndjson")
+EXPORT_READ_SIZE = 1 << 16
+
+
+def export_row(entity: er.RegistryEntry) -> dict[str, Any]:
+    """Return the export representation of a registry entry."""
+    return {
+        "entity_id": entity.entity_id,
+        "platform": entity.platform or "unknown",
+        "device_id": entity.device_id,
+        "disabled_by": entity.disabled_by.value if entity.disabled_by else None,
+        "is_disabled": bool(entity.disabled),
+        "original_name": entity.original_name,
+        "entity_category": entity.entity_category.value
+        if entity.entity_category
+        else None,
+    }
+
+
+class _NameLookups:
+    """Device/area/label names captured on the loop for the executor writer."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self.devices = {
+            device.id: (device.name_by_user or device.name, device.area_id)
+            for device in dr.async_get(hass).devices.values()
+        }
+        self.areas = {a.id: a.name for a in ar.async_get(hass).async_list_areas()}
+        self.labels = {
+            label.label_id: label.name
+            for label in lr.async_get(hass).async_list_labels()
+        }
+
+    def digest(self) -> str:
+        """Return a digest of the area and label names (devices are versioned)."""
+        payload = json.dumps([sorted(self.areas.items()), sorted(self.labels.items())])
+        return hashlib.sha1(payload.encode(), usedforsecurity=False).hexdigest()
+
+    def join(self, entity: er.RegistryEntry, row: dict[str, Any]) -> dict[str, Any]:
+        """Add device, area and label names to an export row."""
+        device_name, device_area = self.devices.get(
+            entity.device_id or "", (None, None)
+        )
+        area_id = entity.area_id or device_area
+        row["device_name"] = device_name
+        row["area_id"] = area_id
+        row["area_name"] = self.areas.get(area_id) if area_id else None
+        row["labels"] = sorted(
+            self.labels.get(label_id, label_id) for label_id in entity.labels
+        )
+        return row
+
+
+def _iter_rows(
+    entities: Iterable[er.RegistryEntry], lookups: _NameLookups | None
+) -> Iterator[dict[str, Any]]:
+    for entity in entities:
+        row = export_row(entity)
+        yield lookups.join(entity, row) if lookups else row
+
+
+def write_export(
+    path: Path,
+    entities: list[er.RegistryEntry],
+    fmt: str,
+    lookups: _NameLookups | None,
+) -> None:
+    """Stream rows into a gzip file, replacing ``path`` atomically.
+
+    Rows are serialised one at a time, so memory stays flat however large
+    the registry is. Runs in the executor.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    with gzip.open(tmp, "wt", encoding="utf-8", compresslevel=6) as fh:
+        if fmt == "ndjson":
+            for row in _iter_rows(entities, lookups):
+                fh.write(json.dumps(row, separators=(",", ":")))
+                fh.write("\n")
+        else:
+            fh.write("[")
+            for position, row in enumerate(_iter_rows(entities, lookups)):
+                if position:
+                    fh.write(",")
+                fh.write(json.dumps(row, separators=(",", ":")))
+            fh.write("]")
+    os.replace(tmp, path)
+
+
+class ExportFile:
+    """A written export file with its validators."""
+
+    def __init__(
+        self, path: Path, key: str, etag: str, size: int, last_modified: datetime
+    ) -> None:
+        """Initialise the file record."""
+        self.path = path
+        self.key = key
+        self.etag = etag
+        self.size = size
+        self.last_modified = last_modified
+
+
+def _file_etag(path: Path) -> tuple[str, int]:
+    """Return the content ETag and size of a file. Runs in the executor."""
+    digest = hashlib.sha1(usedforsecurity=False)
+    size = 0
+    with path.open("rb") as fh:
+        while block := fh.read(EXPORT_READ_SIZE):
+            digest.update(block)
+            size += len(block)
+    return f'"{digest.hexdigest()}"', size
+
+
+class ExportCache:
+    """Export files keyed by registry generation, reused while nothing changes."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialise an empty cache under .storage/entity_manager/export."""
+        self.hass = hass
+        self.directory = Path(hass.config.path(".storage", DOMAIN, "export"))
+        self._token = uuid.uuid4().hex
+        self._files: dict[str, ExportFile] = {}
+        self._lock = asyncio.Lock()
+
+    async def async_get_file(self, fmt: str, names: bool) -> ExportFile:
+        """Return an up-to-date export file, writing it in the executor if stale."""
+        async with self._lock:
+            return await self._async_refresh(fmt, names)
+
+    async def async_open(self, fmt: str, names: bool) -> tuple[ExportFile, BinaryIO]:
+        """Return an up-to-date export file and an open handle on its bytes.
+
+        The handle is opened under the lock, so a regeneration that replaces
+        the path afterwards cannot change the body served for this ETag.
+        """
+        async with self._lock:
+            export = await self._async_refresh(fmt, names)
+            handle = await self.hass.async_add_executor_job(export.path.open, "rb")
+            return export, handle
+
+    async def _async_refresh(self, fmt: str, names: bool) -> ExportFile:
+        """Rewrite the variant if the registry or names changed. Hold the lock."""
+        variant = f"{fmt}-names" if names else fmt
+        index = async_get_registry_index(self.hass)
+        lookups = _NameLookups(self.hass) if names else None
+        digest = lookups.digest() if lookups else ""
+        key = f"{self._token}:{index.generation}:{digest}"
+        cached = self._files.get(variant)
+        if index.is_live and cached is not None and cached.key == key:
+            return cached
+        path = self.directory / f"entities-{variant}.{fmt}.gz"
+        entities = index.async_query()
+        entities.sort(key=lambda entity: entity.entity_id)
+        await self.hass.async_add_executor_job(
+            write_export, path, entities, fmt, lookups
+        )
+        etag, size = await self.hass.async_add_executor_job(_file_etag, path)
+        self._files[variant] = ExportFile(path, key, etag, size, dt_util.utcnow())
+        _LOGGER.debug("Wrote %s export with %d rows", variant, len(entities))
+        return self._files[variant]
+
+
+@callback
+def async_get_export_cache(hass: HomeAssistant) -> ExportCache:
+    """Return the export cache, creating it on first use."""
+    data = hass.data.setdefault(DOMAIN, {})
+    if DATA_EXPORT not in data:
+        data[DATA_EXPORT] = ExportCache(hass)
+    return data[DATA_EXPORT]
+
+
+class EntityExportView(HomeAssistantView):
+    """Serve the entity export as a gzip download (admin only).
+
+    ``?format=json|ndjson`` picks the encoding and ``?names=1`` joins device,
+    area and label names. Responses carry a content ETag and Last-Modified,
+    and matching conditional requests get a 304, so unchanged exports are
+    not re-sent. The body is streamed from a handle opened together with the
+    ETag, never read into memory whole.
+    """
+
+    url = EXPORT_URL
+    name = f"api:{DOMAIN}:export"
+    requires_auth = True
+
+    async def get(self, request: web.Request) -> web.StreamResponse:
+        """Return the export file."""
+        hass: HomeAssistant = request.app[KEY_HASS]
+        if not request[KEY_HASS_USER].is_admin:
+            raise Unauthorized
+        fmt = request.query.get("format", "json")
+        if fmt not in EXPORT_FORMATS:
+            return self.json_message(
+                f"Unsupported format {fmt}", HTTPStatus.BAD_REQUEST
+            )
+        names = request.query.get("names", "").lower() in ("1", "true", "yes")
+        export, handle = await async_get_export_cache(hass).async_open(fmt, names)
+        try:
+            headers = {
+                hdrs.CACHE_CONTROL: "no-cache",
+                hdrs.ETAG: export.etag,
+                hdrs.LAST_MODIFIED: format_date_time(export.last_modified.timestamp()),
+            }
+            if _not_modified(request, export):
+                return web.Response(status=HTTPStatus.NOT_MODIFIED, headers=headers)
+            headers[hdrs.CONTENT_DISPOSITION] = (
+                f'attachment; filename="entity_manager_export.{fmt}.gz"'
+            )
+            response = web.StreamResponse(headers=headers)
+            response.content_type = "application/gzip"
+            response.content_length = export.size
+            await response.prepare(request)
+            while block := await hass.async_add_executor_job(
+                handle.read, EXPORT_READ_SIZE
+            ):
+                await response.write(block)
+            await response.write_eof()
+            return response
+        finally:
+            await hass.async_add_executor_job(handle.close)
+
+
+def _not_modified(request: web.Request, export: ExportFile) -> bool:
+    """Return True when the client's validators still match the export."""
+    if (etags := request.headers.get(hdrs.IF_NONE_MATCH)) is not None:
+        return export.etag in (tag.strip() for tag in etags.split(","))
+    if (since := request.if_modified_since) is not None:
+        return export.last_modified.replace(microsecond=0) <= since
+    return False
@@ -0,0 +1,269 @@
+"""Recorder database footprint per entity, integration and device."""
+
+import logging
+from collections.abc import Iterable
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers import entity_registry as er
+from homeassistant.util import dt as dt_util
+
+from .jobs import Job
+
+_LOGGER = logging.getLogger(__name__)
+
+# Rough per-row cost of the fixed-width columns plus index entries; the
+# variable part (state string, shared attributes JSON) is measured.
+STATES_ROW_BYTES = 120
+STATISTICS_ROW_BYTES = 90
+FOOTPRINT_CHUNK = 200
+
+STATES_FOOTPRINT_SQL = (
+    "SELECT metadata_id, COUNT(*), SUM(LENGTH(state)), MIN(last_updated_ts)"
+    " FROM states WHERE metadata_id IN :ids GROUP BY metadata_id"
+)
+# Attribute rows are shared by hash, so each distinct attributes_id an
+# entity references is counted once for it
+ATTRIBUTES_FOOTPRINT_SQL = (
+    "SELECT s.metadata_id, COUNT(*), SUM(LENGTH(a.shared_attrs))"
+    " FROM (SELECT DISTINCT metadata_id, attributes_id FROM states"
+    " WHERE metadata_id IN :ids) s"
+    " JOIN state_attributes a ON a.attributes_id = s.attributes_id"
+    " GROUP BY s.metadata_id"
+)
+STATISTICS_FOOTPRINT_SQL = (
+    "SELECT metadata_id, COUNT(*) FROM {table}"
+    " WHERE metadata_id IN :ids GROUP BY metadata_id"
+)
+STATISTICS_TABLES = ("statistics", "statistics_short_term")
+
+
+def _empty_row() -> dict[str, Any]:
+    return {
+        "states": 0,
+        "state_bytes": 0,
+        "attributes": 0,
+        "attribute_bytes": 0,
+        "statistics": 0,
+        "statistics_bytes": 0,
+        "oldest": None,
+    }
+
+
+def _chunks(ids: list[int]) -> Iterable[list[int]]:
+    for i in range(0, len(ids), FOOTPRINT_CHUNK):
+        yield ids[i : i + FOOTPRINT_CHUNK]
+
+
+def select_footprint(session: Any, job: Job | None = None) -> dict[str, dict[str, Any]]:
+    """Return entity_id → row counts and estimated bytes in the recorder tables.
+
+    Grouped queries run per chunk of FOOTPRINT_CHUNK metadata_ids, so each
+    one reads a bounded slice of the (metadata_id, …) indexes; with a job,
+    progress advances per chunk and cancellation is checked between chunks.
+    """
+    from sqlalchemy import bindparam
+    from sqlalchemy import text as sa_text
+
+    def _stmt(sql: str) -> Any:
+        return sa_text(sql).bindparams(bindparam("ids", expanding=True))
+
+    states_meta = {
+        metadata_id: entity_id
+        for metadata_id, entity_id in session.execute(
+            sa_text("SELECT metadata_id, entity_id FROM states_meta")
+        )
+    }
+    # Entity statistics use the entity_id; external ones are "domain:id"
+    statistics_meta = {
+        metadata_id: statistic_id
+        for metadata_id, statistic_id in session.execute(
+            sa_text("SELECT id, statistic_id FROM statistics_meta")
+        )
+        if ":" not in statistic_id
+    }
+    state_ids, statistic_ids = sorted(states_meta), sorted(statistics_meta)
+    if job is not None:
+        job.set_total_threadsafe(len(state_ids) + len(statistic_ids))
+
+    result: dict[str, dict[str, Any]] = {}
+
+    def _row(entity_id: str) -> dict[str, Any]:
+        return result.setdefault(entity_id, _empty_row())
+
+    states_stmt = _stmt(STATES_FOOTPRINT_SQL)
+    attributes_stmt = _stmt(ATTRIBUTES_FOOTPRINT_SQL)
+    for chunk in _chunks(state_ids):
+        if job is not None:
+            job.raise_if_cancelled()
+        for metadata_id, count, size, oldest in session.execute(
+            states_stmt, {"ids": chunk}
+        ):
+            row = _row(states_meta[metadata_id])
+            row["states"] = count
+            row["state_bytes"] = count * STATES_ROW_BYTES + int(size or 0)
+            row["oldest"] = oldest
+        for metadata_id, count, size in session.execute(
+            attributes_stmt, {"ids": chunk}
+        ):
+            row = _row(states_meta[metadata_id])
+            row["attributes"] = count
+            row["attribute_bytes"] = int(size or 0)
+        if job is not None:
+            job.advance_threadsafe(len(chunk))
+
+    for table in STATISTICS_TABLES:
+        stmt = _stmt(STATISTICS_FOOTPRINT_SQL.format(table=table))
+        for chunk in _chunks(statistic_ids):
+            if job is not None:
+                job.raise_if_cancelled()
+            for metadata_id, count in session.execute(stmt, {"ids": chunk}):
+                row = _row(statistics_meta[metadata_id])
+                row["statistics"] += count
+                row["statistics_bytes"] += count * STATISTICS_ROW_BYTES
+            if job is not None and table == STATISTICS_TABLES[-1]:
+                job.advance_threadsafe(len(chunk))
+    return result
+
+
+def query_recorder_footprint(
+    hass: HomeAssistant, job: Job | None = None
+) -> dict[str, dict[str, Any]]:
+    """Run select_footprint on a recorder session. Blocking."""
+    try:
+        from homeassistant.components.recorder import get_instance
+    except ImportError as err:
+        raise HomeAssistantError("The recorder is not available") from err
+
+    try:
+        recorder = get_instance(hass)
+    except KeyError as err:
+        raise HomeAssistantError("The recorder is not available") from err
+
+    with recorder.get_session() as session:
+        return select_footprint(session, job)
+
+
+def _rollup(
+    rows: list[dict[str, Any]], key: str, total_bytes: int
+) -> list[dict[str, Any]]:
+    groups: dict[Any, dict[str, Any]] = {}
+    for row in rows:
+        group = groups.setdefault(
+            row[key], {key: row[key], "entities": 0, "states": 0, "bytes": 0}
+        )
+        group["entities"] += 1
+        group["states"] += row["states"]
+        group["bytes"] += row["bytes"]
+    ranked = sorted(groups.values(), key=lambda group: group["bytes"], reverse=True)
+    for group in ranked:
+        group["share"] = group["bytes"] / total_bytes if total_bytes else 0
+    return ranked
+
+
+def build_footprint_report(
+    footprint: dict[str, dict[str, Any]],
+    entities: dict[str, tuple[str, str | None]],
+    device_names: dict[str, str | None],
+    now: float,
+    top: int,
+    min_share: float,
+) -> dict[str, Any]:
+    """Rank a footprint and derive recorder exclude suggestions.
+
+    ``entities`` maps entity_id → (platform, device_id) from the registry.
+    Entities holding at least ``min_share`` of the estimated bytes are
+    suggested; only those without long-term statistics go into the exclude
+    snippet, since excluding an entity also stops its statistics.
+    """
+    rows: list[dict[str, Any]] = []
+    for entity_id, usage in footprint.items():
+        platform, device_id = entities.get(entity_id, (entity_id.split(".")[0], None))
+        oldest = usage.pop("oldest")
+        days = max((now - oldest) / 86400, 1 / 24) if oldest else None
+        rows.append(
+            {
+                "entity_id": entity_id,
+                "platform": platform,
+                "device_id": device_id,
+                **usage,
+                "states_per_day": round(usage["states"] / days, 1) if days else 0,
+                "bytes": usage["state_bytes"]
+                + usage["attribute_bytes"]
+                + usage["statistics_bytes"],
+            }
+        )
+    total_bytes = sum(row["bytes"] for row in rows)
+    rows.sort(key=lambda row: row["bytes"], reverse=True)
+    for row in rows:
+        row["share"] = row["bytes"] / total_bytes if total_bytes else 0
+
+    devices = _rollup(
+        [row for row in rows if row["device_id"]], "device_id", total_bytes
+    )
+    for device in devices:
+        device["name"] = device_names.get(device["device_id"])
+
+    suggested = [
+        {
+            "entity_id": row["entity_id"],
+            "bytes": row["bytes"],
+            "share": row["share"],
+            "states_per_day": row["states_per_day"],
+            "has_statistics": row["statistics"] > 0,
+        }
+        for row in rows
+        if row["states"] and row["share"] >= min_share
+    ]
+    exclude = sorted(s["entity_id"] for s in suggested if not s["has_statistics"])
+    yaml = (
+        "recorder:\n  exclude:\n    entities:\n"
+        + "".join(f"      - {entity_id}\n" for entity_id in exclude)
+        if exclude
+        else ""
+    )
+    return {
+        "totals": {
+            "entities": len(rows),
+            "states": sum(row["states"] for row in rows),
+            "attributes": sum(row["attributes"] for row in rows),
+            "statistics": sum(row["statistics"] for row in rows),
+            "bytes": total_bytes,
+        },
+        "entities": rows[:top],
+        "integrations": _rollup(rows, "platform", total_bytes),
+        "devices": devices[:top],
+        "suggestions": {
+            "entities": suggested,
+            "exclude": {"entities": exclude},
+            "yaml": yaml,
+        },
+    }
+
+
+async def async_recorder_footprint(
+    hass: HomeAssistant, job: Job | None, top: int, min_share: float
+) -> dict[str, Any]:
+    """Measure the recorder footprint in the executor and rank it."""
+    entity_reg = er.async_get(hass)
+    device_reg = dr.async_get(hass)
+    entities = {
+        entry.entity_id: (entry.platform, entry.device_id)
+        for entry in entity_reg.entities.values()
+    }
+    device_names = {
+        device.id: device.name_by_user or device.name
+        for device in device_reg.devices.values()
+    }
+    footprint = await hass.async_add_executor_job(query_recorder_footprint, hass, job)
+    report = build_footprint_report(
+        footprint, entities, device_names, dt_util.utcnow().timestamp(), top, min_share
+    )
+    _LOGGER.debug(
+        "Recorder footprint: %d entities, ~%d bytes",
+        report["totals"]["entities"],
+        report["totals"]["bytes"],
+    )
+    return report
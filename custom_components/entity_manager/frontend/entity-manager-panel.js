@@ -4415,6 +4415,8 @@ class EntityManagerPanel extends HTMLElement {
   }
   
   // ===== UNDO/REDO SYSTEM =====
+  // Panel undo/redo replays its own actions with journal: false, so they never add
+  // entries to (or clear the redo stack of) the server journal behind journal/undo.
   
   _pushUndoAction(action) {
     this.undoStack.push(action);
@@ -4486,14 +4488,15 @@ class EntityManagerPanel extends HTMLElement {
           type: 'entity_manager/update_entity_display_name',
           entity_id: action.entityId,
           name: (isUndo ? action.oldName : action.newName) || null,
+          journal: false,
         });
         this._showToast(`${verb} display name`, 'info');
         break;
       case 'assign_entity_device':
         if (isUndo) {
-          await this._hass.callWS({ type: 'entity_manager/unassign_entity_device', entity_id: action.entityId });
+          await this._hass.callWS({ type: 'entity_manager/unassign_entity_device', entity_id: action.entityId, journal: false });
         } else {
-          await this._hass.callWS({ type: 'entity_manager/assign_entity_device', entity_id: action.entityId, device_id: action.newDeviceId });
+          await this._hass.callWS({ type: 'entity_manager/assign_entity_device', entity_id: action.entityId, device_id: action.newDeviceId, journal: false });
         }
         this._showToast(`${verb} device assignment`, 'info');
         break;
@@ -6748,21 +6751,11 @@ class EntityManagerPanel extends HTMLElement {
     }
   }
 
-  // Fetch last-activity timestamps from the recorder DB (survives HA restarts).
-  // Results are cached in localStorage for 1 hour to avoid hammering the DB on every loadData().
-  // Falls back to state.last_changed in the entity card if cache is empty (first load or recorder unavailable).
+  // Fetch last-activity timestamps (survive HA restarts). The backend keeps them in
+  // memory, updated from state_changed events, so every call is cheap and current.
+  // Falls back to state.last_changed in the entity card if the map is empty (recorder unavailable).
   async _loadLastActivityCache() {
-    const CACHE_KEY = 'em_lastActivityCache';
-    const TTL = 60 * 60 * 1000; // 1 hour
-
-    // Check if localStorage cache is still fresh
-    try {
-      const cached = JSON.parse(localStorage.getItem(CACHE_KEY) || 'null');
-      if (cached && (Date.now() - cached.ts) < TTL) {
-        this._lastActivityCache = new Map(Object.entries(cached.data || {}));
-        return; // cache is fresh — no WS call needed
-      }
-    } catch (_) { /* corrupt cache — refetch */ }
+    try { localStorage.removeItem('em_lastActivityCache'); } catch (_) {} // superseded 1-hour cache
 
     // Collect all entity IDs currently loaded
     const entityIds = [];
@@ -6781,9 +6774,6 @@ class EntityManagerPanel extends HTMLElement {
         entity_ids: entityIds,
       });
       this._lastActivityCache = new Map(Object.entries(result || {}));
-      try {
-        localStorage.setItem(CACHE_KEY, JSON.stringify({ ts: Date.now(), data: result || {} }));
-      } catch (_) { /* storage full — cache in memory only */ }
       // Re-render with accurate timestamps now that the cache is loaded
       this.updateView();
     } catch (err) {
@@ -7101,7 +7091,7 @@ class EntityManagerPanel extends HTMLElement {
         this.hacsItems = null;
         this.hacsCount = 0;
       }
-      // Collect unique card types across dashboards (recursive, cache configs for dialog reuse)
+      // Collect unique card types across dashboards (recursive)
       const _llCollectTypes = (cards, types) => {
         for (const c of (cards || [])) {
           if (!c || typeof c !== 'object') continue;
@@ -7112,29 +7102,37 @@ class EntityManagerPanel extends HTMLElement {
         }
       };
       try {
-        const dashboards = await this._hass.callWS({ type: 'lovelace/dashboards/list' });
-        this.lovelaceDashboardList = dashboards || [];
-        const types = new Set();
-        for (const dashboard of this.lovelaceDashboardList) {
-          try {
-            const config = await this._hass.callWS({ type: 'lovelace/config', url_path: dashboard.url_path || null });
-            dashboard._config = config;
-            (config?.views || []).forEach(view => {
-              _llCollectTypes(view.cards || [], types);
-              (view.sections || []).forEach(s => { if (s) _llCollectTypes(s.cards || [], types); });
-            });
-          } catch (e) { console.warn('[EM] lovelace config fetch failed for dashboard', dashboard.url_path, e); }
-        }
-        this.lovelaceCardCount = types.size;
-      } catch (e) {
-        this.lovelaceDashboardList = [];
+        // One server-side scan of every dashboard, reused by the Lovelace dialog
+        const usage = await this._hass.callWS({ type: 'entity_manager/get_dashboard_usage' });
+        this.dashboardUsage = usage;
+        this.lovelaceDashboardList = (usage.dashboards || []).map(d => ({ url_path: d.url_path, title: d.title, mode: d.mode }));
+        this.lovelaceCardCount = (usage.card_types || []).length;
+      } catch (usageError) {
+        this.dashboardUsage = null;
         try {
-          const config = await this._hass.callWS({ type: 'lovelace/config' });
-          const fallbackTypes = new Set();
-          _llCollectTypes(config?.views?.flatMap(v => v.cards || []) || [], fallbackTypes);
-          this.lovelaceCardCount = fallbackTypes.size;
-        } catch (e2) {
-          this.lovelaceCardCount = 0;
+          const dashboards = await this._hass.callWS({ type: 'lovelace/dashboards/list' });
+          this.lovelaceDashboardList = dashboards || [];
+          const types = new Set();
+          for (const dashboard of this.lovelaceDashboardList) {
+            try {
+              const config = await this._hass.callWS({ type: 'lovelace/config', url_path: dashboard.url_path || null });
+              (config?.views || []).forEach(view => {
+                _llCollectTypes(view.cards || [], types);
+                (view.sections || []).forEach(s => { if (s) _llCollectTypes(s.cards || [], types); });
+              });
+            } catch (e) { console.warn('[EM] lovelace config fetch failed for dashboard', dashboard.url_path, e); }
+          }
+          this.lovelaceCardCount = types.size;
+        } catch (e) {
+          this.lovelaceDashboardList = [];
+          try {
+            const config = await this._hass.callWS({ type: 'lovelace/config' });
+            const fallbackTypes = new Set();
+            _llCollectTypes(config?.views?.flatMap(v => v.cards || []) || [], fallbackTypes);
+            this.lovelaceCardCount = fallbackTypes.size;
+          } catch (e2) {
+            this.lovelaceCardCount = 0;
+          }
         }
       }
       
@@ -10355,6 +10353,7 @@ class EntityManagerPanel extends HTMLElement {
       await this._hass.callWS({
         type: 'entity_manager/enable_entity',
         entity_id: entityId,
+        journal: !skipUndo,
       });
       
       // Push undo action (skip when called from undo/redo)
@@ -10381,6 +10380,7 @@ class EntityManagerPanel extends HTMLElement {
       await this._hass.callWS({
         type: 'entity_manager/disable_entity',
         entity_id: entityId,
+        journal: !skipUndo,
       });
 
       // Push undo action (skip when called from undo/redo)
@@ -11305,7 +11305,10 @@ class EntityManagerPanel extends HTMLElement {
 
     const watchKey = 'em-activity-watch';
     let watchConfig  = this._loadFromStorage(watchKey, { rooms: null });
-    let allEvents    = [];
+    let summaryRows  = [];          // entity rows from entity_manager/get_activity_summary
+    let summaryStart = 0;
+    let eventsByEntity = new Map(); // entity_id → changes, fetched when a device group is opened
+    const openGroups = new Set();
     let searchTerm   = '';
     let currentHours = 1;
     let checkedRooms = watchConfig.rooms === null ? null : new Set(watchConfig.rooms || []);
@@ -11371,26 +11374,52 @@ class EntityManagerPanel extends HTMLElement {
       return { contentHtml, currentFmt: `${fmt(current)} ${this._escapeHtml(unit)}`, avgFmt: `${fmt(avgV)} ${this._escapeHtml(unit)}` };
     };
 
+    const renderHistogram = (hist) => {
+      const max = Math.max(1, ...hist);
+      const bars = hist.map((n, i) => {
+        const h = n ? Math.max(1.5, n / max * 18) : 0;
+        return `<rect x="${i * 4}" y="${(20 - h).toFixed(1)}" width="3" height="${h.toFixed(1)}" rx="0.5"><title>${n}</title></rect>`;
+      }).join('');
+      return `<svg viewBox="0 0 ${hist.length * 4} 20" preserveAspectRatio="none" style="display:block;width:100%;height:24px;color:var(--em-primary)" fill="currentColor" xmlns="http://www.w3.org/2000/svg">${bars}</svg>`;
+    };
+
+    // Individual changes are only fetched for the entities of an opened device group
+    const loadEvents = async (entityIds) => {
+      try {
+        const history = await this._hass.callWS({
+          type: 'history/history_during_period',
+          start_time: new Date(summaryStart).toISOString(), end_time: new Date().toISOString(),
+          entity_ids: entityIds,
+          significant_changes_only: true, minimal_response: true, no_attributes: true,
+        });
+        for (const eid of entityIds) {
+          eventsByEntity.set(eid, (history?.[eid] || []).map(s => {
+            const ts = s.lc ?? s.lu ?? s.last_changed ?? s.last_updated;
+            return { entity_id: eid, when: ts > 1e10 ? ts : ts * 1000, state: s.s ?? s.state };
+          }));
+        }
+      } catch (err) {
+        console.warn('Entity Manager: Activity history load failed:', err);
+      }
+    };
+
     const renderBody = () => {
       const body = container.querySelector('#act-log-body');
       const term = searchTerm.toLowerCase();
       const grouped = {};
-      for (const evt of allEvents) {
-        const eid = evt.entity_id;
-        if (!eid) continue;
-        const info = entityMap[eid] || { integration: eid.split('.')[0], device_name: evt.name || eid, area_name: 'No Room' };
+      for (const row of summaryRows) {
+        const eid = row.entity_id;
+        const name = this._hass?.states?.[eid]?.attributes?.friendly_name || eid;
+        const info = entityMap[eid] || { integration: eid.split('.')[0], device_name: name, area_name: 'No Room' };
         const { device_name, area_name } = info;
         if (checkedRooms instanceof Set && !checkedRooms.has(area_name)) continue;
         if (term && !eid.toLowerCase().includes(term) &&
             !device_name.toLowerCase().includes(term) &&
             !area_name.toLowerCase().includes(term) &&
-            !(evt.message || '').toLowerCase().includes(term) &&
-            !(evt.name || '').toLowerCase().includes(term) &&
-            !(evt.context_name || '').toLowerCase().includes(term)) continue;
+            !name.toLowerCase().includes(term)) continue;
         if (!grouped[area_name]) grouped[area_name] = {};
         if (!grouped[area_name][device_name]) grouped[area_name][device_name] = {};
-        if (!grouped[area_name][device_name][eid]) grouped[area_name][device_name][eid] = [];
-        grouped[area_name][device_name][eid].push(evt);
+        grouped[area_name][device_name][eid] = row;
       }
 
       if (!Object.keys(grouped).length) {
@@ -11404,15 +11433,16 @@ class EntityManagerPanel extends HTMLElement {
       const today = new Date().toDateString();
       const roomOrder = Object.keys(grouped).sort((a,b) => a==='No Room'?1:b==='No Room'?-1:a.localeCompare(b));
 
-      const expandGroup = (headerHtml, bodyHtml) => {
+      const expandGroup = (key, headerHtml, bodyHtml, entityIds = []) => {
+        const open = openGroups.has(key);
         return `<div style="margin-bottom:4px">
-          <div class="act-group-hdr"
+          <div class="act-group-hdr" data-key="${this._escapeAttr(key)}" data-entities="${this._escapeAttr(entityIds.join(','))}"
             style="display:flex;align-items:center;gap:6px;padding:5px 8px;border-radius:6px;
                    background:var(--em-bg-secondary);cursor:pointer;user-select:none;border:1px solid var(--em-border)">
-            <span class="act-arrow" style="display:inline-flex;align-items:center;opacity:0.6;transition:transform 0.2s;transform:rotate(-90deg)"><svg viewBox="0 0 24 24" width="14" height="14" fill="none" stroke="currentColor" stroke-width="2.5" stroke-linecap="round" stroke-linejoin="round"><polyline points="6 9 12 15 18 9"/></svg></span>
+            <span class="act-arrow" style="display:inline-flex;align-items:center;opacity:0.6;transition:transform 0.2s;transform:${open ? 'none' : 'rotate(-90deg)'}"><svg viewBox="0 0 24 24" width="14" height="14" fill="none" stroke="currentColor" stroke-width="2.5" stroke-linecap="round" stroke-linejoin="round"><polyline points="6 9 12 15 18 9"/></svg></span>
             ${headerHtml}
           </div>
-          <div style="padding-left:10px;display:none">${bodyHtml}</div>
+          <div style="padding-left:10px;display:${open ? '' : 'none'}">${bodyHtml}</div>
         </div>`;
       };
 
@@ -11421,23 +11451,28 @@ class EntityManagerPanel extends HTMLElement {
         let roomTotal = 0, devicesHtml = '';
         for (const [devName, entities] of Object.entries(grouped[roomName]).sort(([a],[b]) => a.localeCompare(b))) {
           let devTotal = 0, entitiesHtml = '';
-          for (const [eid, evts] of Object.entries(entities)) {
-            const sorted = evts.slice().sort((a,b) => new Date(b.when)-new Date(a.when));
-            devTotal += sorted.length;
+          for (const [eid, row] of Object.entries(entities)) {
+            const evts = eventsByEntity.get(eid);
+            const sorted = (evts || []).slice().sort((a,b) => new Date(b.when)-new Date(a.when));
+            devTotal += row.changes;
             const friendlyName = this._hass?.states?.[eid]?.attributes?.friendly_name || eid.split('.')[1] || eid;
             const meta = entityMap[eid];
-            const mostRecent = sorted[0];
+            const mostRecent = sorted[0] || { state: this._hass?.states?.[eid]?.state };
             const unit = this._hass?.states?.[eid]?.attributes?.unit_of_measurement || '';
             const rawState = mostRecent?.state != null ? `${mostRecent.state}${unit?' '+unit:''}` : null;
             const stateVal = rawState && rawState.length > 14 ? rawState.slice(0,12)+'…' : rawState;
             const infoLine = meta?.integration || eid.split('.')[0];
             const chartColor = CHART_UNIT_COLORS[unit] || null;
-            const chartResult = chartColor ? renderSensorChart(sorted, unit, chartColor) : null;
+            const chartResult = chartColor && evts ? renderSensorChart(sorted, unit, chartColor) : null;
             const ROW_CAP = 15;
             const overflow = !chartResult && sorted.length > ROW_CAP ? sorted.length - ROW_CAP : 0;
             const visibleRows = !chartResult ? sorted.slice(0, ROW_CAP) : sorted;
             const moreNote = overflow > 0 ? `<div style="font-size:11px;text-align:center;padding:4px 0;opacity:0.55">… and ${overflow} more change${overflow!==1?'s':''}</div>` : '';
-            const contentHtml = chartResult ? chartResult.contentHtml : visibleRows.map(e => renderEventRow(e, today)).join('') + moreNote;
+            const lastAgo = row.last_changed ? this._fmtAgo(new Date(row.last_changed).toISOString()) : '';
+            const countLine = `<div style="font-size:11px;opacity:0.6;margin-top:2px">${row.changes} change${row.changes!==1?'s':''}${lastAgo ? ` · last ${lastAgo}` : ''}</div>`;
+            const contentHtml = !evts
+              ? `<div style="padding:6px 10px 4px">${renderHistogram(row.histogram)}${countLine}</div>`
+              : chartResult ? chartResult.contentHtml : visibleRows.map(e => renderEventRow(e, today)).join('') + moreNote;
             entitiesHtml += this._renderMiniEntityCard({
               entity_id: eid, name: friendlyName,
               state: chartResult ? chartResult.currentFmt : stateVal,
@@ -11448,14 +11483,17 @@ class EntityManagerPanel extends HTMLElement {
           }
           if (devTotal) {
             devicesHtml += expandGroup(
+              `${roomName}\u0000${devName}`,
               `<span style="font-size:12px">${this._icon('mdi:devices', '14px')} ${this._escapeHtml(devName)}</span><span style="font-size:10px;color:var(--em-text-secondary);margin-left:auto">(${devTotal})</span>`,
-              `<div style="display:flex;flex-direction:column;gap:8px;padding:6px 0 4px">${entitiesHtml}</div>`
+              `<div style="display:flex;flex-direction:column;gap:8px;padding:6px 0 4px">${entitiesHtml}</div>`,
+              Object.keys(entities)
             );
             roomTotal += devTotal;
           }
         }
         const roomIcon = roomName === 'No Room' ? this._icon(EM_ICONS.folder, '14px') : this._icon(EM_ICONS.home, '14px');
         html += expandGroup(
+          roomName,
           `<span style="font-size:13px;font-weight:600">${roomIcon} ${this._escapeHtml(roomName)}</span><span style="font-size:10px;color:var(--em-text-secondary);margin-left:auto">(${roomTotal})</span>`,
           devicesHtml
         );
@@ -11464,12 +11502,18 @@ class EntityManagerPanel extends HTMLElement {
       body.style.cssText = 'min-height:80px';
       body.innerHTML = `<div style="padding:4px 0 8px">${html}</div>`;
       body.querySelectorAll('.act-group-hdr').forEach(hdr => {
-        hdr.addEventListener('click', () => {
+        hdr.addEventListener('click', async () => {
           const target = hdr.nextElementSibling;
           const arrow  = hdr.querySelector('.act-arrow');
-          const isOpen = target.style.display !== 'none';
+          const isOpen = openGroups.has(hdr.dataset.key);
+          if (isOpen) openGroups.delete(hdr.dataset.key); else openGroups.add(hdr.dataset.key);
           target.style.display = isOpen ? 'none' : '';
           if (arrow) arrow.style.transform = isOpen ? 'rotate(-90deg)' : '';
+          const missing = hdr.dataset.entities.split(',').filter(eid => eid && !eventsByEntity.has(eid));
+          if (!isOpen && missing.length) {
+            await loadEvents(missing);
+            renderBody();
+          }
         });
       });
     };
@@ -11520,58 +11564,55 @@ class EntityManagerPanel extends HTMLElement {
       if (checkedRooms instanceof Set && checkedRooms.size === 0) {
         body.style.cssText = 'min-height:80px';
         body.innerHTML = `<div style="text-align:center;padding:32px;color:var(--em-text-secondary);font-size:13px">☝️ Select rooms above to view activity</div>`;
-        allEvents = [];
+        summaryRows = [];
         return;
       }
       body.style.cssText = 'min-height:80px;display:flex;align-items:center;justify-content:center';
       body.innerHTML = `<span style="color:var(--em-text-secondary);font-size:13px">Loading…</span>`;
-      const ENTITY_FETCH_CAP = 400;
-      let entityIdsToFetch;
-      if (checkedRooms === null) {
-        entityIdsToFetch = Object.keys(entityMap).slice(0, ENTITY_FETCH_CAP);
-      } else {
-        entityIdsToFetch = Object.entries(entityMap)
+      let entityIds;
+      if (checkedRooms !== null) {
+        entityIds = Object.entries(entityMap)
           .filter(([, info]) => checkedRooms.has(info.area_name))
-          .map(([eid]) => eid).slice(0, ENTITY_FETCH_CAP);
-      }
-      if (!entityIdsToFetch.length) {
-        body.style.cssText = 'min-height:80px';
-        body.innerHTML = `<div style="text-align:center;padding:32px;color:var(--em-text-secondary);font-size:13px">No entities found for selected rooms.</div>`;
-        allEvents = [];
-        return;
+          .map(([eid]) => eid);
+        if (!entityIds.length) {
+          body.style.cssText = 'min-height:80px';
+          body.innerHTML = `<div style="text-align:center;padding:32px;color:var(--em-text-secondary);font-size:13px">No entities found for selected rooms.</div>`;
+          summaryRows = [];
+          return;
+        }
       }
-      const endTime   = new Date().toISOString();
-      const startTime = new Date(Date.now() - hours * 3600000).toISOString();
       try {
-        const history = await this._hass.callWS({
-          type: 'history/history_during_period',
-          start_time: startTime, end_time: endTime,
-          entity_ids: entityIdsToFetch,
-          significant_changes_only: true, minimal_response: true, no_attributes: true,
-        });
-        allEvents = [];
-        for (const [eid, states] of Object.entries(history || {})) {
-          for (const s of states) {
-            const ts = s.lc ?? s.lu ?? s.last_changed ?? s.last_updated;
-            allEvents.push({ entity_id: eid, when: ts > 1e10 ? ts : ts * 1000, state: s.s ?? s.state, name: this._hass?.states?.[eid]?.attributes?.friendly_name || eid });
-          }
-        }
-        allEvents.sort((a,b) => new Date(b.when)-new Date(a.when));
+        // Change counts, first/last change and histograms come from grouped recorder
+        // SQL on the backend; individual changes load per device group (loadEvents).
+        summaryRows = [];
+        eventsByEntity = new Map();
+        let offset = 0;
+        do {
+          const page = await this._hass.callWS({
+            type: 'entity_manager/get_activity_summary',
+            hours, buckets: 24, offset, limit: 5000,
+            ...(entityIds ? { entity_ids: entityIds } : {}),
+          });
+          summaryStart = page.start;
+          summaryRows.push(...(page.entities || []));
+          offset = page.next_offset;
+        } while (offset != null);
 
         // ── Most Active insights ──────────────────────────────────────────
         const entityCounts={}, deviceCounts={}, integCounts={};
         const entityLastSeen={}, deviceLastSeen={}, integLastSeen={};
-        for (const ev of allEvents) {
-          entityCounts[ev.entity_id]=(entityCounts[ev.entity_id]||0)+1;
-          if (!entityLastSeen[ev.entity_id]||ev.when>entityLastSeen[ev.entity_id]) entityLastSeen[ev.entity_id]=ev.when;
-          const meta=entityMap[ev.entity_id];
-          if (meta?.device_name&&meta.device_name!==ev.entity_id) {
-            deviceCounts[meta.device_name]=(deviceCounts[meta.device_name]||0)+1;
-            if (!deviceLastSeen[meta.device_name]||ev.when>deviceLastSeen[meta.device_name]) deviceLastSeen[meta.device_name]=ev.when;
+        for (const row of summaryRows) {
+          const eid=row.entity_id, when=row.last_changed;
+          entityCounts[eid]=row.changes;
+          entityLastSeen[eid]=when;
+          const meta=entityMap[eid];
+          if (meta?.device_name&&meta.device_name!==eid) {
+            deviceCounts[meta.device_name]=(deviceCounts[meta.device_name]||0)+row.changes;
+            if (!deviceLastSeen[meta.device_name]||when>deviceLastSeen[meta.device_name]) deviceLastSeen[meta.device_name]=when;
           }
-          const integ=meta?.integration||ev.entity_id.split('.')[0];
-          integCounts[integ]=(integCounts[integ]||0)+1;
-          if (!integLastSeen[integ]||ev.when>integLastSeen[integ]) integLastSeen[integ]=ev.when;
+          const integ=meta?.integration||eid.split('.')[0];
+          integCounts[integ]=(integCounts[integ]||0)+row.changes;
+          if (!integLastSeen[integ]||when>integLastSeen[integ]) integLastSeen[integ]=when;
         }
         const topN=(obj,n=7)=>Object.entries(obj).sort((a,b)=>b[1]-a[1]).slice(0,n);
         const topEntities=topN(entityCounts), topDevices=topN(deviceCounts), topInteg=topN(integCounts);
@@ -11611,7 +11652,7 @@ class EntityManagerPanel extends HTMLElement {
         body2.innerHTML = `<div style="padding:16px;color:var(--em-danger);font-size:13px">⚠ Could not load history: ${this._escapeHtml(e.message || String(e))}</div>`;
         return;
       }
-      if (!allEvents.length) {
+      if (!summaryRows.length) {
         body.style.cssText = 'min-height:80px';
         body.innerHTML = `<div style="text-align:center;padding:32px;color:var(--em-text-secondary);font-size:13px">No entity activity in this period.</div>`;
         return;
@@ -11873,10 +11914,9 @@ class EntityManagerPanel extends HTMLElement {
       }, 200);
     });
 
-    // Refresh — invalidate cache and reload
+    // Refresh — reload from the backend
     contentEl.querySelector('#em-at-refresh')?.addEventListener('click', () => {
-      try { localStorage.removeItem('em_lastActivityCache'); } catch (_) {}
-      this._loadLastActivityCache(); // re-fetches from recorder; calls updateView() when done
+      this._loadLastActivityCache(); // calls updateView() when done
     });
 
     // Row click → entity details
@@ -15044,81 +15084,21 @@ class EntityManagerPanel extends HTMLElement {
           color = '#9c27b0';
           allowToggle = false;
           try {
-            // Use cached data from loadCounts or re-fetch
-            let dashboardList = this.lovelaceDashboardList;
-            if (!dashboardList) {
-              dashboardList = await this._hass.callWS({ type: 'lovelace/dashboards/list' }) || [];
-            }
-            // Ensure configs are loaded
-            for (const dash of dashboardList) {
-              if (!dash._config) {
-                try {
-                  dash._config = await this._hass.callWS({ type: 'lovelace/config', url_path: dash.url_path || null });
-                } catch (e) { console.warn('[EM] lovelace config fetch failed', dash.url_path, e); }
-              }
-            }
-
-            // Recursively extract all card objects with their location path
-            const extractAllCards = (cards, path) => {
-              const out = [];
-              for (const card of (cards || [])) {
-                if (!card || typeof card !== 'object') continue;
-                out.push({ card, path });
-                if (card.cards) out.push(...extractAllCards(card.cards, path));
-                if (card.card) out.push(...extractAllCards([card.card], path));
-                if (card.elements) out.push(...extractAllCards(card.elements, path));
-              }
-              return out;
-            };
-
-            // Extract entity_ids referenced in a card config
-            const extractEntities = (card) => {
-              const ids = new Set();
-              const add = (v) => { if (typeof v === 'string' && v.includes('.')) ids.add(v); };
-              add(card.entity);
-              add(card.entity_id);
-              add(card.camera_image);
-              (Array.isArray(card.entities) ? card.entities : []).forEach(e => {
-                if (typeof e === 'string') add(e);
-                else if (e?.entity) add(e.entity);
-              });
-              (card.conditions || []).forEach(c => { if (c) add(c.entity); });
-              return [...ids];
-            };
-
-            // Build stats
-            const cardTypeCount = {};
-            const entityRefs = {}; // entity_id → Set of paths
-            const dashboardStats = [];
-            let totalCards = 0;
-
-            for (const dash of dashboardList) {
-              if (!dash._config) continue;
-              const dashName = dash.title || dash.url_path || 'Overview';
-              const dashUrl = dash.url_path ? `/lovelace/${dash.url_path}` : '/lovelace';
-              let dashCards = 0;
-              let dashViews = 0;
-
-              for (const [vi, view] of (dash._config.views || []).entries()) {
-                dashViews++;
-                const viewName = view.title || view.path || `View ${vi + 1}`;
-                const viewCards = [...(view.cards || [])];
-                (view.sections || []).forEach(s => { if (s) viewCards.push(...(s.cards || [])); });
-                const allCards = extractAllCards(viewCards, `${dashName} › ${viewName}`);
-                dashCards += allCards.length;
-
-                for (const { card, path } of allCards) {
-                  const t = card.type || 'entities';
-                  cardTypeCount[t] = (cardTypeCount[t] || 0) + 1;
-                  extractEntities(card).forEach(eid => {
-                    if (!entityRefs[eid]) entityRefs[eid] = new Set();
-                    entityRefs[eid].add(path);
-                  });
-                }
-              }
-              totalCards += dashCards;
-              dashboardStats.push({ name: dashName, url: dashUrl, views: dashViews, cards: dashCards });
-            }
+            // Use the server-side dashboard scan from loadCounts or re-fetch (no per-dashboard lovelace/config calls)
+            const usage = this.dashboardUsage || await this._hass.callWS({ type: 'entity_manager/get_dashboard_usage' });
+            this.dashboardUsage = usage;
+
+            const dashboardStats = (usage.dashboards || []).map(d => ({
+              name: d.title || d.url_path || 'Overview',
+              url: d.url_path ? `/lovelace/${d.url_path}` : '/lovelace',
+              views: d.views,
+              cards: d.cards,
+              entities: d.entities,
+            }));
+            const totalCards = dashboardStats.reduce((sum, d) => sum + d.cards, 0);
+            const cardTypeCount = usage.card_type_counts || {};
+            const entityRefs = usage.locations || {}; // entity_id → ["Dashboard › View", ...]
+            const unusedIds = usage.unused || [];
 
             // ── Group 1: Dashboards ──────────────────────────────────────────
             const dashHtml = dashboardStats.length ? dashboardStats.map(d => `
@@ -15128,6 +15108,7 @@ class EntityManagerPanel extends HTMLElement {
                   <span style="font-size:0.8em;opacity:0.55">${this._escapeHtml(d.url)}</span>
                   <span style="font-size:0.82em;opacity:0.75">${d.views} view${d.views !== 1 ? 's' : ''}</span>
                   <span style="font-size:0.82em;font-weight:600;color:#9c27b0">${d.cards} card${d.cards !== 1 ? 's' : ''}</span>
+                  <span style="font-size:0.82em;opacity:0.75">${d.entities} entit${d.entities !== 1 ? 'ies' : 'y'}</span>
                   <a href="${this._escapeHtml(d.url)}" target="_blank"
                      style="font-size:0.8em;color:var(--em-primary);text-decoration:none;flex-shrink:0">Open ↗</a>
                 </div>
@@ -15198,7 +15179,6 @@ class EntityManagerPanel extends HTMLElement {
 
             // ── Group 3: Entity references ───────────────────────────────────
             const sortedRefs = Object.entries(entityRefs)
-              .map(([eid, paths]) => [eid, [...paths]])
               .sort((a, b) => b[1].length - a[1].length);
             const entityRefHtml = sortedRefs.length ? sortedRefs.map(([eid, locs]) => {
               const state = this._hass.states?.[eid];
@@ -15216,10 +15196,23 @@ class EntityManagerPanel extends HTMLElement {
                 </div>`;
             }).join('') : '<p style="padding:12px;opacity:0.6">No entity references found.</p>';
 
+            // ── Group 4: Entities on no dashboard ────────────────────────────
+            const unusedHtml = unusedIds.length ? unusedIds.map(eid => {
+              const fname = this._hass.states?.[eid]?.attributes?.friendly_name || '';
+              return `
+                <div class="entity-list-item" style="padding:7px 12px">
+                  <div style="display:flex;align-items:center;gap:8px;flex-wrap:wrap">
+                    ${fname ? `<span style="font-weight:600">${this._escapeHtml(fname)}</span>` : ''}
+                    <span style="font-size:0.82em;opacity:0.65">${this._escapeHtml(eid)}</span>
+                  </div>
+                </div>`;
+            }).join('') : '<p style="padding:12px;opacity:0.6">Every entity is on a dashboard.</p>';
+
             groupedHtml = [
               `<div class="em-sug-section em-sug-naming">${this._collGroup(`${this._icon(EM_ICONS.dashboard, '16px')} Dashboards (${dashboardStats.length})`, dashHtml)}</div>`,
               `<div class="em-sug-section em-sug-labels">${this._collGroup(`${this._icon(EM_ICONS.customGroup, '16px')} Card Types (${sortedTypes.length} types · ${totalCards} total · ${hacsInUseCount} HACS)`, cardTypeHtml)}</div>`,
               `<div class="em-sug-section em-sug-area">${this._collGroup(`${this._icon(EM_ICONS.link, '16px')} Entities in Lovelace (${sortedRefs.length})`, entityRefHtml)}</div>`,
+              `<div class="em-sug-section em-sug-area">${this._collGroup(`${this._icon(EM_ICONS.link, '16px')} Not on any dashboard (${unusedIds.length})`, unusedHtml)}</div>`,
             ].join('');
 
             entities = new Array(totalCards).fill(null); // drives the dialog title count
@@ -15633,6 +15626,7 @@ class EntityManagerPanel extends HTMLElement {
                   type: 'entity_manager/rename_entity',
                   old_entity_id: entityId,
                   new_entity_id: newEntityId,
+                  update_dashboards: true,
                 });
                 idChanged = true;
               }
@@ -16761,6 +16755,8 @@ class EntityManagerPanel extends HTMLElement {
         type: 'entity_manager/rename_entity',
         old_entity_id: oldEntityId,
         new_entity_id: newEntityId,
+        update_dashboards: true,
+        journal: !skipUndo,
       });
 
       // Push undo action and log activity (skip when called from undo/redo)
@@ -0,0 +1,105 @@
+"""Chunked, diff-planned import sessions for Entity Manager."""
+
+import time
+import uuid
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+
+from .const import DOMAIN, IMPORT_SESSION_TTL, MAX_IMPORT_ROWS
+
+DATA_IMPORT_SESSIONS = "import_sessions"
+
+# Entity ids listed per plan in the not_found preview.
+NOT_FOUND_PREVIEW = 100
+
+
+class ImportSession:
+    """Rows uploaded in chunks for one import, keyed by entity_id.
+
+    Re-sending a row replaces the earlier value, so retried chunks are
+    harmless and the last value for an entity wins.
+    """
+
+    def __init__(self) -> None:
+        """Initialise an empty session."""
+        self.id = uuid.uuid4().hex
+        self.rows: dict[str, bool] = {}
+        self.touched = time.monotonic()
+
+    def add(self, entities: list[dict[str, Any]]) -> None:
+        """Merge a chunk of {entity_id, is_disabled} rows into the session."""
+        for item in entities:
+            self.rows[item["entity_id"]] = item["is_disabled"]
+        self.touched = time.monotonic()
+
+
+@callback
+def plan_import(hass: HomeAssistant, rows: dict[str, bool]) -> dict[str, Any]:
+    """Diff imported rows against the registry.
+
+    Returns only the rows that would change, plus counts. Applying the
+    same plan twice is a no-op the second time.
+    """
+    entity_reg = er.async_get(hass)
+    changes: list[dict[str, Any]] = []
+    not_found: list[str] = []
+    to_enable = to_disable = 0
+    for entity_id, is_disabled in rows.items():
+        entry = entity_reg.async_get(entity_id)
+        if entry is None:
+            not_found.append(entity_id)
+            continue
+        if is_disabled == bool(entry.disabled_by):
+            continue
+        changes.append({"entity_id": entity_id, "is_disabled": is_disabled})
+        if is_disabled:
+            to_disable += 1
+        else:
+            to_enable += 1
+    return {
+        "changes": changes,
+        "counts": {
+            "total": len(rows),
+            "to_enable": to_enable,
+            "to_disable": to_disable,
+            "unchanged": len(rows) - len(changes) - len(not_found),
+            "not_found": len(not_found),
+        },
+        "not_found": not_found[:NOT_FOUND_PREVIEW],
+    }
+
+
+def _sessions(hass: HomeAssistant) -> dict[str, ImportSession]:
+    return hass.data.setdefault(DOMAIN, {}).setdefault(DATA_IMPORT_SESSIONS, {})
+
+
+@callback
+def async_begin_session(hass: HomeAssistant) -> ImportSession:
+    """Start a new import session, dropping sessions idle past the TTL."""
+    sessions = _sessions(hass)
+    cutoff = time.monotonic() - IMPORT_SESSION_TTL
+    for session_id in [k for k, v in sessions.items() if v.touched < cutoff]:
+        del sessions[session_id]
+    session = ImportSession()
+    sessions[session.id] = session
+    return session
+
+
+@callback
+def async_get_session(hass: HomeAssistant, session_id: str) -> ImportSession | None:
+    """Return an open import session."""
+    return _sessions(hass).get(session_id)
+
+
+@callback
+def async_end_session(hass: HomeAssistant, session_id: str) -> ImportSession | None:
+    """Close an import session and return it."""
+    return _sessions(hass).pop(session_id, None)
+
+
+def session_full(session: ImportSession, entities: list[dict[str, Any]]) -> bool:
+    """Return True when adding a chunk would exceed MAX_IMPORT_ROWS."""
+    new_ids = {item["entity_id"] for item in entities} - session.rows.keys()
+    return len(session.rows) + len(new_ids) > MAX_IMPORT_ROWS
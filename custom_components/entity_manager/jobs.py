@@ -0,0 +1,228 @@
+"""Background job engine for long-running Entity Manager operations."""
+
+import asyncio
+import logging
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DOMAIN, MAX_CONCURRENT_JOBS, MAX_FINISHED_JOBS
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_JOBS = "jobs"
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+FINISHED_STATES = (JOB_DONE, JOB_FAILED, JOB_CANCELLED)
+
+# Minimum seconds between progress notifications for one job; state changes
+# (queued → running → finished) are always reported immediately.
+PROGRESS_INTERVAL = 0.25
+
+
+class JobCancelled(Exception):
+    """Raised inside executor work when its job has been cancelled."""
+
+
+class Job:
+    """One queued or running operation with processed/total progress."""
+
+    def __init__(self, manager: "JobManager", kind: str, params: dict[str, Any]):
+        """Initialise a queued job."""
+        self.manager = manager
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.params = params
+        self.status = JOB_QUEUED
+        self.processed = 0
+        self.total: int | None = None
+        self.result: Any = None
+        self.error: str | None = None
+        self.created = time.time()
+        self.started: float | None = None
+        self.finished: float | None = None
+        self.cancel_requested = False
+        self.task: asyncio.Task | None = None
+        self._last_notify = 0.0
+
+    @property
+    def done(self) -> bool:
+        """Return True once the job has finished, failed or been cancelled."""
+        return self.status in FINISHED_STATES
+
+    @callback
+    def set_total(self, total: int) -> None:
+        """Set the number of units of work the job will process."""
+        self.total = total
+        self._notify(force=True)
+
+    @callback
+    def advance(self, count: int = 1) -> None:
+        """Record ``count`` more processed units."""
+        self.processed += count
+        self._notify()
+
+    def advance_threadsafe(self, count: int = 1) -> None:
+        """Record progress from executor code."""
+        self.manager.hass.loop.call_soon_threadsafe(self.advance, count)
+
+    def set_total_threadsafe(self, total: int) -> None:
+        """Set the total from executor code."""
+        self.manager.hass.loop.call_soon_threadsafe(self.set_total, total)
+
+    def raise_if_cancelled(self) -> None:
+        """Abort executor work between units once the job is cancelled."""
+        if self.cancel_requested:
+            raise JobCancelled
+
+    def _notify(self, force: bool = False) -> None:
+        now = time.monotonic()
+        if not force and now - self._last_notify < PROGRESS_INTERVAL:
+            return
+        self._last_notify = now
+        self.manager.notify(self)
+
+    def as_dict(self, with_result: bool = False) -> dict[str, Any]:
+        """Return the JSON-serialisable job status."""
+        data: dict[str, Any] = {
+            "job_id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "processed": self.processed,
+            "total": self.total,
+            "error": self.error,
+            "created": self.created,
+            "started": self.started,
+            "finished": self.finished,
+        }
+        if with_result:
+            data["result"] = self.result
+        return data
+
+
+JobRunner = Callable[[HomeAssistant, Job, dict[str, Any]], Awaitable[Any]]
+
+
+class JobManager:
+    """Run jobs in the background with bounded concurrency.
+
+    At most MAX_CONCURRENT_JOBS run at once; the rest wait in FIFO order.
+    The MAX_FINISHED_JOBS most recent finished jobs are kept for status
+    queries.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, max_concurrent: int = MAX_CONCURRENT_JOBS
+    ) -> None:
+        """Initialise an empty job manager."""
+        self.hass = hass
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._jobs: dict[str, Job] = {}
+        self._listeners: list[Callable[[Job], None]] = []
+
+    @callback
+    def async_start(self, kind: str, params: dict[str, Any], runner: JobRunner) -> Job:
+        """Queue ``runner(hass, job, params)`` and return its job."""
+        job = Job(self, kind, params)
+        self._jobs[job.id] = job
+        job.task = self.hass.async_create_background_task(
+            self._async_run(job, runner), f"{DOMAIN} job {kind} {job.id}"
+        )
+        self._prune()
+        self.notify(job)
+        return job
+
+    async def _async_run(self, job: Job, runner: JobRunner) -> None:
+        try:
+            async with self._semaphore:
+                job.status = JOB_RUNNING
+                job.started = time.time()
+                self.notify(job)
+                job.result = await runner(self.hass, job, job.params)
+        except (asyncio.CancelledError, JobCancelled):
+            job.status = JOB_CANCELLED
+        except Exception as err:
+            _LOGGER.error(
+                "Entity Manager job %s (%s) failed", job.id, job.kind, exc_info=True
+            )
+            job.status = JOB_FAILED
+            job.error = str(err)
+        else:
+            job.status = JOB_DONE
+        finally:
+            job.finished = time.time()
+            if job.total is not None and job.status == JOB_DONE:
+                job.processed = job.total
+            self.notify(job)
+
+    def _prune(self) -> None:
+        finished = [job for job in self._jobs.values() if job.done]
+        for job in finished[: max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            del self._jobs[job.id]
+
+    @callback
+    def async_get(self, job_id: str) -> Job | None:
+        """Return a job by id."""
+        return self._jobs.get(job_id)
+
+    @callback
+    def async_jobs(self) -> list[Job]:
+        """Return all known jobs, oldest first."""
+        return list(self._jobs.values())
+
+    @callback
+    def async_cancel(self, job_id: str) -> Job | None:
+        """Request cancellation of a job; returns None for unknown ids."""
+        job = self._jobs.get(job_id)
+        if job is None or job.done:
+            return job
+        job.cancel_requested = True
+        if job.task is not None:
+            job.task.cancel()
+        return job
+
+    @callback
+    def async_cancel_all(self) -> None:
+        """Cancel every unfinished job."""
+        for job_id in list(self._jobs):
+            self.async_cancel(job_id)
+
+    @callback
+    def async_add_listener(self, listener: Callable[[Job], None]) -> Callable[[], None]:
+        """Call ``listener(job)`` on every job state or progress change."""
+        self._listeners.append(listener)
+
+        @callback
+        def _remove() -> None:
+            self._listeners.remove(listener)
+
+        return _remove
+
+    def notify(self, job: Job) -> None:
+        """Send a job update to every listener."""
+        for listener in list(self._listeners):
+            listener(job)
+
+
+@callback
+def async_get_job_manager(hass: HomeAssistant) -> JobManager:
+    """Return the integration-owned job manager, creating it on first use."""
+    data = hass.data.setdefault(DOMAIN, {})
+    if DATA_JOBS not in data:
+        data[DATA_JOBS] = JobManager(hass)
+    return data[DATA_JOBS]
+
+
+@callback
+def async_unload_jobs(hass: HomeAssistant) -> None:
+    """Cancel unfinished jobs and drop the job manager."""
+    manager: JobManager | None = hass.data.get(DOMAIN, {}).pop(DATA_JOBS, None)
+    if manager is not None:
+        manager.async_cancel_all()
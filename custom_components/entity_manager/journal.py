@@ -0,0 +1,256 @@
+"""Persistent undo/redo journal for Entity Manager registry changes."""
+
+import logging
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN, MAX_JOURNAL_CHANGES, MAX_JOURNAL_ENTRIES
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_JOURNAL = "journal"
+STORAGE_KEY = f"{DOMAIN}.journal"
+STORAGE_VERSION = 1
+SAVE_DELAY = 5
+
+# Registry fields the journal knows how to restore.
+FIELD_DISABLED_BY = "disabled_by"
+FIELD_ENTITY_ID = "entity_id"
+FIELD_NAME = "name"
+FIELD_DEVICE_ID = "device_id"
+
+# Changes included per entry in journal/list responses.
+LIST_CHANGES_LIMIT = 50
+
+
+class JournalConflict(Exception):
+    """Raised when an undo/redo no longer applies to the current registry."""
+
+
+def change(entity_id: str, field: str, old: Any, new: Any) -> dict[str, Any]:
+    """Return a journal change; ``entity_id`` is the id after the change."""
+    return {"entity_id": entity_id, "field": field, "old": old, "new": new}
+
+
+class Journal:
+    """Bounded undo/redo stacks of registry changes, persisted in .storage.
+
+    Each entry groups the changes of one command (e.g. a whole bulk disable),
+    so undo and redo pop and apply a single entry. The undo stack keeps at
+    most MAX_JOURNAL_ENTRIES entries and MAX_JOURNAL_CHANGES changes; the
+    oldest entries are dropped first. Saves are delayed and coalesced.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialise an empty journal."""
+        self.hass = hass
+        self._store: Store = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self._undo: list[dict[str, Any]] = []
+        self._redo: list[dict[str, Any]] = []
+        self._next_id = 1
+
+    async def async_load(self) -> None:
+        """Load the stacks from storage."""
+        data = await self._store.async_load()
+        if data:
+            self._undo = data.get("undo", [])
+            self._redo = data.get("redo", [])
+            self._next_id = data.get("next_id", 1)
+
+    def _data_to_save(self) -> dict[str, Any]:
+        return {"undo": self._undo, "redo": self._redo, "next_id": self._next_id}
+
+    def _schedule_save(self) -> None:
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    @callback
+    def async_record(self, kind: str, changes: list[dict[str, Any]]) -> None:
+        """Append an entry for a completed command and clear the redo stack."""
+        if not changes:
+            return
+        self._undo.append(
+            {"id": self._next_id, "ts": time.time(), "kind": kind, "changes": changes}
+        )
+        self._next_id += 1
+        self._redo.clear()
+        total = sum(len(entry["changes"]) for entry in self._undo)
+        while len(self._undo) > 1 and (
+            len(self._undo) > MAX_JOURNAL_ENTRIES or total > MAX_JOURNAL_CHANGES
+        ):
+            total -= len(self._undo.pop(0)["changes"])
+        self._schedule_save()
+
+    @callback
+    def async_undo(self) -> dict[str, Any] | None:
+        """Revert the newest entry; returns it, or None when there is nothing to undo."""
+        if not self._undo:
+            return None
+        entry = self._undo[-1]
+        _apply_changes(self.hass, entry["changes"], undo=True)
+        self._redo.append(self._undo.pop())
+        self._schedule_save()
+        return entry
+
+    @callback
+    def async_redo(self) -> dict[str, Any] | None:
+        """Re-apply the newest undone entry; returns it, or None when empty."""
+        if not self._redo:
+            return None
+        entry = self._redo[-1]
+        _apply_changes(self.hass, entry["changes"], undo=False)
+        self._undo.append(self._redo.pop())
+        self._schedule_save()
+        return entry
+
+    @callback
+    def async_clear(self) -> None:
+        """Drop both stacks."""
+        self._undo.clear()
+        self._redo.clear()
+        self._schedule_save()
+
+    @callback
+    def async_list(self) -> dict[str, list[dict[str, Any]]]:
+        """Return both stacks newest first, with changes truncated per entry."""
+        return {
+            "undo": [summarize(entry) for entry in reversed(self._undo)],
+            "redo": [summarize(entry) for entry in reversed(self._redo)],
+        }
+
+
+def summarize(entry: dict[str, Any]) -> dict[str, Any]:
+    """Return a journal entry with at most LIST_CHANGES_LIMIT changes."""
+    return {
+        "id": entry["id"],
+        "ts": entry["ts"],
+        "kind": entry["kind"],
+        "count": len(entry["changes"]),
+        "changes": entry["changes"][:LIST_CHANGES_LIMIT],
+    }
+
+
+def _registry_value(field: str, value: Any) -> Any:
+    if field == FIELD_DISABLED_BY and value is not None:
+        return er.RegistryEntryDisabler(value)
+    return value
+
+
+def _journal_value(field: str, entry: er.RegistryEntry) -> Any:
+    """Return an entry's field in the form the journal stores it."""
+    value = getattr(entry, field)
+    if field == FIELD_DISABLED_BY and value is not None:
+        return value.value
+    return value
+
+
+def _write(
+    entity_reg: er.EntityRegistry, entity_id: str, field: str, value: Any
+) -> None:
+    if field == FIELD_ENTITY_ID:
+        entity_reg.async_update_entity(entity_id, new_entity_id=value)
+    else:
+        entity_reg.async_update_entity(
+            entity_id, **{field: _registry_value(field, value)}
+        )
+
+
+def _apply_changes(
+    hass: HomeAssistant, changes: list[dict[str, Any]], undo: bool
+) -> None:
+    """Apply an entry's old (undo) or new (redo) values as one unit.
+
+    Every change is validated against the registry before anything is
+    written: the entity must exist, a rename target must be free and each
+    field must still hold the value the entry left there (``new`` for undo,
+    ``old`` for redo), so edits made after the entry are never overwritten.
+    A conflict raises JournalConflict with the registry untouched; a write
+    that fails part-way rolls the steps already written back and re-raises.
+    """
+    entity_reg = er.async_get(hass)
+    ordered = list(reversed(changes)) if undo else changes
+    steps: list[tuple[str, str, Any, Any]] = []
+    # entity_id → registry entity_id it names after the steps planned so far,
+    # or None once renamed away (overrides the registry)
+    source: dict[str, str | None] = {}
+    # (entity_id, field) → value after the steps planned so far
+    planned: dict[tuple[str, str], Any] = {}
+
+    def _entry(entity_id: str) -> er.RegistryEntry | None:
+        registry_id = source.get(entity_id, entity_id)
+        return entity_reg.async_get(registry_id) if registry_id else None
+
+    for item in ordered:
+        field = item["field"]
+        value, expected = (
+            (item["old"], item["new"]) if undo else (item["new"], item["old"])
+        )
+        current = expected if field == FIELD_ENTITY_ID else item["entity_id"]
+        if (entry := _entry(current)) is None:
+            raise JournalConflict(f"Entity {current} not found")
+        if field == FIELD_ENTITY_ID:
+            if _entry(value) is not None:
+                raise JournalConflict(f"Entity {value} already exists")
+            source[value] = source.get(current, current)
+            source[current] = None
+            for key in [key for key in planned if key[0] == current]:
+                planned[(value, key[1])] = planned.pop(key)
+            steps.append((current, field, value, current))
+            continue
+        actual = planned.get((current, field), _journal_value(field, entry))
+        if actual != expected:
+            raise JournalConflict(
+                f"{current} {field} changed since this entry"
+                f" (expected {expected!r}, found {actual!r})"
+            )
+        planned[(current, field)] = value
+        steps.append((current, field, value, actual))
+
+    written: list[tuple[str, str, Any, Any]] = []
+    try:
+        for step in steps:
+            _write(entity_reg, *step[:3])
+            written.append(step)
+    except Exception:
+        for entity_id, field, value, previous in reversed(written):
+            target = value if field == FIELD_ENTITY_ID else entity_id
+            try:
+                _write(entity_reg, target, field, previous)
+            except Exception:
+                _LOGGER.error(
+                    "Could not roll back journal step %s %s",
+                    entity_id,
+                    field,
+                    exc_info=True,
+                )
+        raise
+
+
+async def async_setup_journal(hass: HomeAssistant) -> Journal:
+    """Load the journal and store it for the WebSocket handlers."""
+    journal = Journal(hass)
+    await journal.async_load()
+    hass.data.setdefault(DOMAIN, {})[DATA_JOURNAL] = journal
+    return journal
+
+
+@callback
+def async_unload_journal(hass: HomeAssistant) -> None:
+    """Drop the journal; a pending delayed save still runs."""
+    hass.data.get(DOMAIN, {}).pop(DATA_JOURNAL, None)
+
+
+@callback
+def async_get_journal(hass: HomeAssistant) -> Journal | None:
+    """Return the journal, or None when the config entry is not set up."""
+    return hass.data.get(DOMAIN, {}).get(DATA_JOURNAL)
+
+
+@callback
+def async_record(hass: HomeAssistant, kind: str, changes: list[dict[str, Any]]) -> None:
+    """Record changes when the journal is set up; otherwise do nothing."""
+    if (journal := async_get_journal(hass)) is not None:
+        journal.async_record(kind, changes)
@@ -0,0 +1,363 @@
+"""Cached reverse graph of what references each entity, for Entity Manager."""
+
+import logging
+from collections.abc import Callable
+from typing import Any
+
+from homeassistant.config import async_hass_config_yaml
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import (
+    EVENT_CALL_SERVICE,
+    EVENT_HOMEASSISTANT_STARTED,
+    EVENT_STATE_CHANGED,
+)
+from homeassistant.core import Event, HomeAssistant, State, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.entity_platform import async_get_platforms
+from homeassistant.util import slugify
+
+from .const import DOMAIN
+from .dashboard_index import async_get_dashboard_index, config_entity_ids
+from .template_index import LEGACY_KEYS, TEMPLATE_DOMAINS
+from .yaml_index import async_get_yaml_index
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_REFERENCE_GRAPH = "reference_graph"
+
+SOURCE_AUTOMATIONS = "automations"
+SOURCE_SCRIPTS = "scripts"
+SOURCE_TEMPLATES = "templates"
+SOURCE_DASHBOARDS = "dashboards"
+SOURCES = (SOURCE_AUTOMATIONS, SOURCE_SCRIPTS, SOURCE_TEMPLATES, SOURCE_DASHBOARDS)
+
+EVENT_AUTOMATION_RELOADED = "automation_reloaded"
+EVENT_TEMPLATE_RELOADED = "event_template_reloaded"
+EVENT_LOVELACE_UPDATED = "lovelace_updated"
+
+# Reload service calls that invalidate a source (script reload fires no event)
+_RELOAD_SERVICES = {
+    ("automation", "reload"): SOURCE_AUTOMATIONS,
+    ("script", "reload"): SOURCE_SCRIPTS,
+    ("template", "reload"): SOURCE_TEMPLATES,
+}
+# Entities appearing or disappearing in these domains invalidate a source
+_STATE_DOMAINS = {"automation": SOURCE_AUTOMATIONS, "script": SOURCE_SCRIPTS}
+
+
+class ReferenceGraph:
+    """entity_id → what references it, per source.
+
+    Automations and scripts come from their entities' referenced_entities,
+    templates from each template entity's connected_entities attribute or
+    its configuration (see _template_definitions), and dashboard views from the dashboard
+    index. Each source is rebuilt lazily after a reload event marks it dirty;
+    YAML references come from the YAML reference index at query time.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialise an empty graph with every source dirty."""
+        self.hass = hass
+        self._graph: dict[str, dict[str, list[dict[str, Any]]]] = {
+            source: {} for source in SOURCES
+        }
+        self._dirty: set[str] = set(SOURCES)
+        self._unsubs: list[Callable[[], None]] = []
+
+    @callback
+    def async_start(self) -> None:
+        """Start following the events that invalidate each source."""
+        bus = self.hass.bus
+        self._unsubs = [
+            bus.async_listen(EVENT_HOMEASSISTANT_STARTED, self._async_invalidate_all),
+            bus.async_listen(
+                er.EVENT_ENTITY_REGISTRY_UPDATED, self._async_invalidate_all
+            ),
+            bus.async_listen(
+                EVENT_AUTOMATION_RELOADED,
+                self._invalidator(SOURCE_AUTOMATIONS),
+            ),
+            bus.async_listen(
+                EVENT_TEMPLATE_RELOADED, self._invalidator(SOURCE_TEMPLATES)
+            ),
+            bus.async_listen(
+                EVENT_LOVELACE_UPDATED, self._invalidator(SOURCE_DASHBOARDS)
+            ),
+            bus.async_listen(
+                EVENT_CALL_SERVICE,
+                self._async_service_called,
+                event_filter=self._is_reload_call,
+            ),
+            bus.async_listen(
+                EVENT_STATE_CHANGED,
+                self._async_entity_added_or_removed,
+                event_filter=self._is_added_or_removed,
+            ),
+        ]
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop following events."""
+        for unsub in self._unsubs:
+            unsub()
+        self._unsubs = []
+
+    def _invalidator(self, source: str) -> Callable[[Event], None]:
+        @callback
+        def _invalidate(event: Event) -> None:
+            self._dirty.add(source)
+
+        return _invalidate
+
+    @callback
+    def _async_invalidate_all(self, event: Event | None = None) -> None:
+        self._dirty.update(SOURCES)
+
+    @callback
+    def _is_reload_call(self, event_data: Any) -> bool:
+        return (event_data.get("domain"), event_data.get("service")) in _RELOAD_SERVICES
+
+    @callback
+    def _async_service_called(self, event: Event) -> None:
+        self._dirty.add(_RELOAD_SERVICES[(event.data["domain"], event.data["service"])])
+
+    @callback
+    def _is_added_or_removed(self, event_data: Any) -> bool:
+        if event_data["old_state"] is not None and event_data["new_state"] is not None:
+            return False
+        return event_data["entity_id"].split(".", 1)[0] in _STATE_DOMAINS
+
+    @callback
+    def _async_entity_added_or_removed(self, event: Event) -> None:
+        self._dirty.add(_STATE_DOMAINS[event.data["entity_id"].split(".", 1)[0]])
+
+    @callback
+    def _build_component(self, domain: str) -> dict[str, list[dict[str, Any]]]:
+        graph: dict[str, list[dict[str, Any]]] = {}
+        component = self.hass.data.get(domain)
+        for entity in getattr(component, "entities", ()):
+            try:
+                referenced = entity.referenced_entities
+            except Exception as err:  # noqa: BLE001
+                _LOGGER.debug("No references for %s: %s", entity.entity_id, err)
+                continue
+            state = self.hass.states.get(entity.entity_id)
+            row = {
+                "entity_id": entity.entity_id,
+                "name": state.attributes.get("friendly_name", entity.entity_id)
+                if state
+                else entity.entity_id,
+            }
+            for entity_id in referenced:
+                graph.setdefault(entity_id, []).append(row)
+        return graph
+
+    @callback
+    async def _async_template_config(self) -> dict[str, Any]:
+        """Return configuration.yaml with packages merged, or {} if unreadable."""
+        try:
+            return await async_hass_config_yaml(self.hass)
+        except (HomeAssistantError, OSError) as err:
+            _LOGGER.debug("Reference graph: cannot read template config: %s", err)
+            return {}
+
+    async def _async_build_templates(self) -> dict[str, list[dict[str, Any]]]:
+        known = set(self.hass.states.async_entity_ids())
+        registry = er.async_get(self.hass)
+        definitions: dict[str, list[Any]] | None = None
+        graph: dict[str, list[dict[str, Any]]] = {}
+        for platform in async_get_platforms(self.hass, "template"):
+            for entity_id in platform.entities:
+                state = self.hass.states.get(entity_id)
+                name = state.attributes.get("friendly_name") if state else None
+                targets = _connected_entities(state)
+                if targets is None:
+                    if definitions is None:
+                        definitions = _template_definitions(
+                            await self._async_template_config(),
+                            self.hass.config_entries.async_entries("template"),
+                        )
+                    sources = _find_definition(
+                        definitions, entity_id, registry.async_get(entity_id), name
+                    )
+                    if sources is None:
+                        _LOGGER.debug(
+                            "Reference graph: no template definition for %s",
+                            entity_id,
+                        )
+                        continue
+                    targets = config_entity_ids(sources)
+                row = {"entity_id": entity_id, "name": name or entity_id}
+                for target in targets & known - {entity_id}:
+                    graph.setdefault(target, []).append(row)
+        return graph
+
+    async def _async_build_dashboards(self) -> dict[str, list[dict[str, Any]]]:
+        known = set(self.hass.states.async_entity_ids())
+        known.update(er.async_get(self.hass).entities)
+        graph: dict[str, list[dict[str, Any]]] = {}
+        for dashboard in await async_get_dashboard_index(self.hass).async_dashboards():
+            for view in dashboard.get("views", []):
+                where = {
+                    "dashboard": dashboard["url_path"],
+                    "title": dashboard["title"],
+                    "view": view["view"],
+                    "view_title": view["view_title"],
+                }
+                for entity_id in known.intersection(view["entities"]):
+                    graph.setdefault(entity_id, []).append(where)
+        return graph
+
+    async def async_refresh(self) -> None:
+        """Rebuild the sources that were invalidated since the last query."""
+        dirty, self._dirty = self._dirty, set()
+        if SOURCE_AUTOMATIONS in dirty:
+            self._graph[SOURCE_AUTOMATIONS] = self._build_component("automation")
+        if SOURCE_SCRIPTS in dirty:
+            self._graph[SOURCE_SCRIPTS] = self._build_component("script")
+        if SOURCE_TEMPLATES in dirty:
+            self._graph[SOURCE_TEMPLATES] = await self._async_build_templates()
+        if SOURCE_DASHBOARDS in dirty:
+            try:
+                self._graph[SOURCE_DASHBOARDS] = await self._async_build_dashboards()
+            except Exception:
+                self._dirty.add(SOURCE_DASHBOARDS)
+                raise
+        if dirty:
+            _LOGGER.debug("Reference graph: rebuilt %s", ", ".join(sorted(dirty)))
+
+    async def async_get(
+        self, entity_ids: list[str], include_yaml: bool = True
+    ) -> dict[str, dict[str, list[dict[str, Any]]]]:
+        """Return {entity_id: {source: [references]}} for each entity_id."""
+        await self.async_refresh()
+        yaml_index = None
+        if include_yaml:
+            yaml_index = async_get_yaml_index(self.hass)
+            await yaml_index.async_refresh()
+        result: dict[str, dict[str, list[dict[str, Any]]]] = {}
+        for entity_id in entity_ids:
+            refs = {
+                source: list(self._graph[source].get(entity_id, []))
+                for source in SOURCES
+            }
+            if yaml_index is not None:
+                refs["yaml"] = yaml_index.async_find(entity_id)
+            result[entity_id] = refs
+        return result
+
+
+def _connected_entities(state: State | None) -> set[str] | None:
+    """Return the entity_ids in a state's connected_entities attribute, if set."""
+    if state is None or (value := state.attributes.get("connected_entities")) is None:
+        return None
+    return config_entity_ids(value)
+
+
+def _template_definitions(
+    config: dict[str, Any], entries: list[ConfigEntry]
+) -> dict[str, list[Any]]:
+    """Index template entity configs by the keys an entity can be matched on.
+
+    Keys are ``entry:<config entry id>`` for UI helpers and, for YAML,
+    ``unique_id:<unique_id>`` (as the template integration composes it),
+    ``entity_id:<entity_id>`` (legacy object_id or slugified name) and
+    ``name:<domain>:<name>``. Each value lists the configs to scan: the
+    entity's own plus its block's trigger, condition, variables and actions.
+    """
+    found: dict[str, list[Any]] = {
+        f"entry:{entry.entry_id}": [dict(entry.options)] for entry in entries
+    }
+
+    for block in cv.ensure_list(config.get("template")):
+        if not isinstance(block, dict):
+            continue
+        prefix = block.get("unique_id")
+        shared = [value for key, value in block.items() if key not in TEMPLATE_DOMAINS]
+        for domain in TEMPLATE_DOMAINS & block.keys():
+            for entity in cv.ensure_list(block[domain]):
+                if not isinstance(entity, dict):
+                    continue
+                unique_id = entity.get("unique_id")
+                if unique_id is not None and prefix:
+                    unique_id = f"{prefix}-{unique_id}"
+                for key in _definition_keys(domain, unique_id, entity.get("name")):
+                    found.setdefault(key, [entity, *shared])
+    for domain in TEMPLATE_DOMAINS & config.keys():
+        for platform in cv.ensure_list(config[domain]):
+            if not isinstance(platform, dict) or platform.get("platform") != "template":
+                continue
+            for legacy_key in LEGACY_KEYS & platform.keys():
+                for object_id, entity in (platform[legacy_key] or {}).items():
+                    if not isinstance(entity, dict):
+                        continue
+                    keys = _definition_keys(
+                        domain, entity.get("unique_id"), entity.get("friendly_name")
+                    )
+                    for key in [f"entity_id:{domain}.{object_id}", *keys]:
+                        found.setdefault(key, [entity])
+    return found
+
+
+def _definition_keys(domain: str, unique_id: Any, name: Any) -> list[str]:
+    keys = [] if unique_id is None else [f"unique_id:{unique_id}"]
+    if isinstance(name, str):
+        keys += [f"name:{domain}:{name}", f"entity_id:{domain}.{slugify(name)}"]
+    return keys
+
+
+def _find_definition(
+    definitions: dict[str, list[Any]],
+    entity_id: str,
+    entry: er.RegistryEntry | None,
+    name: str | None,
+) -> list[Any] | None:
+    """Return the configs defining a template entity, or None if unmatched.
+
+    Registry-backed entities match on config entry or unique_id first; the
+    rest on entity_id, then on friendly name (entity_ids gain a suffix when
+    taken), the same order the template index uses.
+    """
+    keys = []
+    if entry is not None:
+        if entry.config_entry_id:
+            keys.append(f"entry:{entry.config_entry_id}")
+        keys.append(f"unique_id:{entry.unique_id}")
+    keys.append(f"entity_id:{entity_id}")
+    if name:
+        keys.append(f"name:{entity_id.split('.', 1)[0]}:{name}")
+    return next((definitions[key] for key in keys if key in definitions), None)
+
+
+@callback
+def async_setup_reference_graph(hass: HomeAssistant) -> ReferenceGraph:
+    """Create the integration-owned reference graph and start following events."""
+    graph = ReferenceGraph(hass)
+    graph.async_start()
+    hass.data.setdefault(DOMAIN, {})[DATA_REFERENCE_GRAPH] = graph
+    return graph
+
+
+@callback
+def async_unload_reference_graph(hass: HomeAssistant) -> None:
+    """Stop and drop the integration-owned reference graph."""
+    graph: ReferenceGraph | None = hass.data.get(DOMAIN, {}).pop(
+        DATA_REFERENCE_GRAPH, None
+    )
+    if graph is not None:
+        graph.async_stop()
+
+
+@callback
+def async_get_reference_graph(hass: HomeAssistant) -> ReferenceGraph:
+    """Return the live reference graph.
+
+    Falls back to a fresh, unfollowed graph when the config entry is not set
+    up; it is fully rebuilt on its first query.
+    """
+    graph: ReferenceGraph | None = hass.data.get(DOMAIN, {}).get(DATA_REFERENCE_GRAPH)
+    if graph is None:
+        graph = ReferenceGraph(hass)
+    return graph
@@ -0,0 +1,303 @@
+"""In-memory entity registry index for Entity Manager."""
+
+import logging
+from collections.abc import Callable
+from typing import Any
+
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers import entity_registry as er
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_REGISTRY_INDEX = "registry_index"
+
+# Fields the index is keyed by. Values are normalised by index_values() so that
+# unset fields can be queried too ("no_device" / "none").
+INDEX_KEYS = (
+    "platform",
+    "domain",
+    "device_id",
+    "config_entry_id",
+    "entity_category",
+    "disabled_by",
+)
+
+NO_DEVICE = "no_device"
+NONE = "none"
+
+
+def index_values(entry: er.RegistryEntry) -> dict[str, str]:
+    """Return the normalised value of every indexed field for a registry entry."""
+    return {
+        "platform": entry.platform or "unknown",
+        "domain": entry.domain,
+        "device_id": entry.device_id or NO_DEVICE,
+        "config_entry_id": entry.config_entry_id or NONE,
+        "entity_category": entry.entity_category.value
+        if entry.entity_category
+        else NONE,
+        "disabled_by": entry.disabled_by.value if entry.disabled_by else NONE,
+    }
+
+
+class RegistryIndex:
+    """Entity registry entries grouped by platform, device, config entry and state.
+
+    Built once from the registries and then kept current from
+    entity_registry_updated / device_registry_updated events, so listing
+    commands cost O(result) instead of a full registry scan per request.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialise an empty index."""
+        self.hass = hass
+        self._entries: dict[str, er.RegistryEntry] = {}
+        self._values: dict[str, dict[str, str]] = {}
+        self._by: dict[str, dict[str, set[str]]] = {key: {} for key in INDEX_KEYS}
+        self._groups: dict[str, dict[str, set[str]]] = {}
+        self._group_disabled: dict[tuple[str, str], int] = {}
+        self._disabled: set[str] = set()
+        self._device_names: dict[str, str | None] = {}
+        self._unsubs: list[Callable[[], None]] = []
+        self._listeners: list[Callable[[set[str], set[str]], None]] = []
+        self.generation = 0
+
+    @callback
+    def async_build(self) -> None:
+        """(Re)build the index from the current registries."""
+        self._entries.clear()
+        self._values.clear()
+        self._by = {key: {} for key in INDEX_KEYS}
+        self._groups.clear()
+        self._group_disabled.clear()
+        self._disabled.clear()
+        self._device_names = {
+            device.id: device.name_by_user or device.name
+            for device in dr.async_get(self.hass).devices.values()
+        }
+        for entry in er.async_get(self.hass).entities.values():
+            self._add(entry)
+        self.generation += 1
+
+    @callback
+    def async_start(self) -> None:
+        """Build the index and start following registry update events."""
+        self.async_build()
+        self._unsubs = [
+            self.hass.bus.async_listen(
+                er.EVENT_ENTITY_REGISTRY_UPDATED, self._async_entity_registry_updated
+            ),
+            self.hass.bus.async_listen(
+                dr.EVENT_DEVICE_REGISTRY_UPDATED, self._async_device_registry_updated
+            ),
+        ]
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop following registry events."""
+        for unsub in self._unsubs:
+            unsub()
+        self._unsubs = []
+
+    @property
+    def is_live(self) -> bool:
+        """Return True while the index follows registry events."""
+        return bool(self._unsubs)
+
+    @callback
+    def async_add_listener(
+        self, listener: Callable[[set[str], set[str]], None]
+    ) -> Callable[[], None]:
+        """Call ``listener(entity_ids, device_ids)`` after every index change.
+
+        Renames report both the old and the new entity_id. Returns a callable
+        that removes the listener.
+        """
+        self._listeners.append(listener)
+
+        @callback
+        def _remove() -> None:
+            self._listeners.remove(listener)
+
+        return _remove
+
+    def _notify(self, entity_ids: set[str], device_ids: set[str]) -> None:
+        for listener in list(self._listeners):
+            listener(entity_ids, device_ids)
+
+    def _add(self, entry: er.RegistryEntry) -> None:
+        entity_id = entry.entity_id
+        values = index_values(entry)
+        self._entries[entity_id] = entry
+        self._values[entity_id] = values
+        for key, value in values.items():
+            self._by[key].setdefault(value, set()).add(entity_id)
+        group = (values["platform"], values["device_id"])
+        self._groups.setdefault(group[0], {}).setdefault(group[1], set()).add(entity_id)
+        if entry.disabled:
+            self._disabled.add(entity_id)
+            self._group_disabled[group] = self._group_disabled.get(group, 0) + 1
+
+    def _remove(self, entity_id: str) -> None:
+        values = self._values.pop(entity_id, None)
+        if values is None:
+            return
+        del self._entries[entity_id]
+        for key, value in values.items():
+            bucket = self._by[key].get(value)
+            if bucket is not None:
+                bucket.discard(entity_id)
+                if not bucket:
+                    del self._by[key][value]
+        platform, device_key = values["platform"], values["device_id"]
+        devices = self._groups[platform]
+        devices[device_key].discard(entity_id)
+        if not devices[device_key]:
+            del devices[device_key]
+            if not devices:
+                del self._groups[platform]
+        if entity_id in self._disabled:
+            self._disabled.discard(entity_id)
+            group = (platform, device_key)
+            self._group_disabled[group] -= 1
+            if not self._group_disabled[group]:
+                del self._group_disabled[group]
+
+    @callback
+    def _async_entity_registry_updated(self, event: Event) -> None:
+        data = event.data
+        entity_id = data["entity_id"]
+        changed = {entity_id}
+        if data["action"] == "remove":
+            self._remove(entity_id)
+        else:
+            if old_entity_id := data.get("old_entity_id"):
+                self._remove(old_entity_id)
+                changed.add(old_entity_id)
+            self._remove(entity_id)
+            entry = er.async_get(self.hass).async_get(entity_id)
+            if entry is not None:
+                self._add(entry)
+        self.generation += 1
+        self._notify(changed, set())
+
+    @callback
+    def _async_device_registry_updated(self, event: Event) -> None:
+        device_id = event.data["device_id"]
+        if event.data["action"] == "remove":
+            self._device_names.pop(device_id, None)
+        else:
+            device = dr.async_get(self.hass).async_get(device_id)
+            if device is not None:
+                self._device_names[device_id] = device.name_by_user or device.name
+        self.generation += 1
+        self._notify(set(), {device_id})
+
+    def __len__(self) -> int:
+        """Return the number of indexed entities."""
+        return len(self._entries)
+
+    @callback
+    def async_get(self, entity_id: str) -> er.RegistryEntry | None:
+        """Return the indexed registry entry for an entity_id."""
+        return self._entries.get(entity_id)
+
+    @callback
+    def async_query(
+        self, filters: dict[str, set[str]] | None = None, state: str = "all"
+    ) -> list[er.RegistryEntry]:
+        """Return entries matching every filter and the enabled/disabled state.
+
+        ``filters`` maps an INDEX_KEYS field to the set of accepted values.
+        Candidate sets are intersected smallest-first, so the cost follows the
+        size of the result rather than the size of the registry.
+        """
+        buckets: list[set[str]] = []
+        for key, accepted in (filters or {}).items():
+            index = self._by[key]
+            if len(accepted) == 1:
+                buckets.append(index.get(next(iter(accepted)), set()))
+            else:
+                buckets.append(set().union(*(index.get(v, ()) for v in accepted)))
+        if state == "disabled":
+            buckets.append(self._disabled)
+
+        if not buckets:
+            entries = list(self._entries.values())
+        else:
+            buckets.sort(key=len)
+            candidates = buckets[0].intersection(*buckets[1:])
+            entries = [self._entries[entity_id] for entity_id in candidates]
+
+        if state == "enabled":
+            entries = [entry for entry in entries if not entry.disabled]
+        return entries
+
+    @callback
+    def async_platforms(self) -> list[str]:
+        """Return indexed platforms in first-seen order."""
+        return list(self._groups)
+
+    @callback
+    def async_group_totals(
+        self, platform: str, device_key: str | None = None
+    ) -> dict[str, int]:
+        """Return total/disabled counts for a platform or a platform's device group."""
+        devices = self._groups.get(platform, {})
+        if device_key is not None:
+            return {
+                "total_entities": len(devices.get(device_key, ())),
+                "disabled_entities": self._group_disabled.get(
+                    (platform, device_key), 0
+                ),
+            }
+        return {
+            "total_entities": sum(len(ids) for ids in devices.values()),
+            "disabled_entities": sum(
+                self._group_disabled.get((platform, key), 0) for key in devices
+            ),
+        }
+
+    @callback
+    def async_device_name(self, device_id: str | None) -> str | None:
+        """Return the display name of a device, or None for unknown devices."""
+        if not device_id or device_id == NO_DEVICE:
+            return None
+        return self._device_names.get(device_id)
+
+
+@callback
+def async_setup_registry_index(hass: HomeAssistant) -> RegistryIndex:
+    """Create the integration-owned registry index and start keeping it current."""
+    index = RegistryIndex(hass)
+    index.async_start()
+    hass.data.setdefault(DOMAIN, {})[DATA_REGISTRY_INDEX] = index
+    _LOGGER.debug("Entity Manager registry index built with %d entities", len(index))
+    return index
+
+
+@callback
+def async_unload_registry_index(hass: HomeAssistant) -> None:
+    """Stop and drop the integration-owned registry index."""
+    index: RegistryIndex | None = hass.data.get(DOMAIN, {}).pop(
+        DATA_REGISTRY_INDEX, None
+    )
+    if index is not None:
+        index.async_stop()
+
+
+@callback
+def async_get_registry_index(hass: HomeAssistant) -> RegistryIndex:
+    """Return the live registry index.
+
+    Falls back to a one-off snapshot when the config entry is not set up, so
+    the WebSocket handlers keep working when called directly.
+    """
+    index: Any = hass.data.get(DOMAIN, {}).get(DATA_REGISTRY_INDEX)
+    if index is None:
+        index = RegistryIndex(hass)
+        index.async_build()
+    return index
@@ -0,0 +1,323 @@
+"""Cached index of YAML template entity definitions for Entity Manager."""
+
+import asyncio
+import logging
+import re
+from pathlib import Path
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util import slugify
+
+from .backups import BackupStore
+from .const import DOMAIN
+from .yaml_index import YamlFileCache
+from .yaml_scan import strip_yaml_comment
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_TEMPLATE_INDEX = "template_index"
+
+# Entity domains the template integration can define
+TEMPLATE_DOMAINS = {
+    "alarm_control_panel",
+    "binary_sensor",
+    "button",
+    "cover",
+    "fan",
+    "image",
+    "light",
+    "lock",
+    "number",
+    "select",
+    "sensor",
+    "switch",
+    "vacuum",
+    "weather",
+}
+# Keys that mark a list item as a new-style template entity even when the
+# enclosing `template:` key lives in another file (`template: !include ...`)
+_TEMPLATE_ITEM_KEYS = {"state", "press", "turn_on", "set_value", "select_option"}
+# Legacy `platform: template` keys holding {object_id: config} mappings
+LEGACY_KEYS = {
+    "sensors",
+    "switches",
+    "covers",
+    "lights",
+    "fans",
+    "vacuums",
+    "panels",
+}
+
+_KEY_LINE = re.compile(r"([A-Za-z0-9_]+)\s*:(?:\s+(.*))?$")
+_BLOCK_SCALAR = re.compile(r"[|>][0-9+-]*$")
+
+
+class _Node:
+    """A mapping (key block or list item) in the YAML outline."""
+
+    def __init__(self, parent: "_Node | None", key: str | None, line: int) -> None:
+        self.parent = parent
+        self.key = key
+        self.line = line
+        self.open_col = -1
+        self.key_col = -1
+        self.is_item = False
+        # key → (line, inline value, column)
+        self.values: dict[str, tuple[int, str, int]] = {}
+        self.children: dict[str, _Node] = {}
+        self.items: list[_Node] = []
+
+    def ancestors(self) -> list["_Node"]:
+        node, found = self.parent, []
+        while node is not None:
+            found.append(node)
+            node = node.parent
+        return found
+
+    def contains(self, col: int, is_dash: bool) -> bool:
+        """Return True when a line starting at col is nested in this node."""
+        if self.parent is None:
+            return True
+        if self.is_item:
+            return col >= self.key_col
+        return col > self.open_col or (is_dash and col == self.open_col)
+
+
+def _outline(text: str) -> _Node:
+    """Parse the block structure of a YAML document into _Node mappings.
+
+    Only block mappings and sequences are tracked; scalar values are kept
+    as inline text and block scalars (| / >) are skipped. This is enough to
+    locate template definitions without resolving HA's custom YAML tags.
+    """
+    root = _Node(None, None, 0)
+    stack = [root]
+    skip_above: int | None = None
+    for lineno, raw in enumerate(text.split("\n"), 1):
+        stripped = raw.strip()
+        if not stripped or stripped.startswith("#"):
+            continue
+        col = len(raw) - len(raw.lstrip(" "))
+        if skip_above is not None:
+            if col > skip_above:
+                continue
+            skip_above = None
+        content = strip_yaml_comment(raw[col:]).rstrip()
+        is_dash = content == "-" or content.startswith("- ")
+        while not stack[-1].contains(col, is_dash):
+            stack.pop()
+        parent = stack[-1]
+        if is_dash:
+            rest = content[1:].lstrip()
+            item = _Node(parent, None, lineno)
+            item.is_item = True
+            item.open_col = col
+            item.key_col = col + len(content) - len(rest) if rest else col + 2
+            parent.items.append(item)
+            stack.append(item)
+            parent, content, col = item, rest, item.key_col
+            if not content:
+                continue
+        match = _KEY_LINE.match(content)
+        if match is None:
+            continue
+        key, value = match.group(1), (match.group(2) or "").strip()
+        parent.values[key] = (lineno, value, col)
+        if _BLOCK_SCALAR.match(value):
+            skip_above = col
+        elif not value:
+            node = _Node(parent, key, lineno)
+            node.open_col = col
+            parent.children[key] = node
+            stack.append(node)
+    return root
+
+
+def _unquote(value: str) -> str:
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in "\"'":
+        return value[1:-1]
+    return value
+
+
+def _inline(node: _Node, key: str) -> tuple[int, str, int] | None:
+    """Return (line, value, column) for a key with a plain inline value."""
+    found = node.values.get(key)
+    if found is None or not found[1] or _BLOCK_SCALAR.match(found[1]):
+        return None
+    return found
+
+
+def _walk(node: _Node):
+    yield node
+    for child in node.children.values():
+        yield from _walk(child)
+    for item in node.items:
+        yield from _walk(item)
+
+
+def parse_template_definitions(text: str) -> list[dict[str, Any]]:
+    """Return the template entity definitions found in one YAML document.
+
+    Each row holds domain, name, object_id, has_unique_id, style
+    ("template" or "legacy"), line, plus the ``anchor`` line after which a
+    ``unique_id`` can be inserted at ``indent`` (None when no safe spot).
+    """
+    found: list[dict[str, Any]] = []
+    for node in _walk(_outline(text)):
+        domain = node.parent.key if node.parent is not None else None
+        if (
+            node.is_item
+            and domain in TEMPLATE_DOMAINS
+            and "platform" not in node.values
+        ):
+            in_template = any(a.key == "template" for a in node.ancestors())
+            if not in_template and not _TEMPLATE_ITEM_KEYS & node.values.keys():
+                continue
+            name_row = _inline(node, "name")
+            name = _unquote(name_row[1]) if name_row else None
+            anchor = name_row or next(
+                (row for key in node.values if (row := _inline(node, key))), None
+            )
+            found.append(
+                {
+                    "domain": domain,
+                    "name": name,
+                    "object_id": slugify(name) if name else None,
+                    "has_unique_id": "unique_id" in node.values,
+                    "style": "template",
+                    "line": node.line,
+                    "anchor": anchor[0] if anchor else None,
+                    "indent": node.key_col,
+                }
+            )
+        elif (
+            node.is_item
+            and domain in TEMPLATE_DOMAINS
+            and _unquote(node.values.get("platform", (0, "", 0))[1]) == "template"
+        ):
+            for legacy_key in LEGACY_KEYS & node.children.keys():
+                for object_id, entity in node.children[legacy_key].children.items():
+                    friendly = _inline(entity, "friendly_name")
+                    indent = min(
+                        (col for _, _, col in entity.values.values()),
+                        default=entity.open_col + 2,
+                    )
+                    found.append(
+                        {
+                            "domain": domain,
+                            "name": _unquote(friendly[1]) if friendly else None,
+                            "object_id": object_id,
+                            "has_unique_id": "unique_id" in entity.values,
+                            "style": "legacy",
+                            "line": entity.line,
+                            "anchor": entity.line,
+                            "indent": indent,
+                        }
+                    )
+    return found
+
+
+def scan_file_templates(filepath: Path) -> dict[str, Any]:
+    """Return {"templates": [...]} for one file, or {"error": ...}."""
+    try:
+        text = filepath.read_bytes().decode("utf-8")
+    except Exception as exc:  # noqa: BLE001
+        return {"error": str(exc)}
+    if "template" not in text and "name:" not in text:
+        return {"templates": []}
+    return {"templates": parse_template_definitions(text)}
+
+
+class TemplateIndex(YamlFileCache):
+    """YAML template definitions per file, kept current like the reference index."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialise an empty index."""
+        super().__init__(hass, scan_file_templates)
+        self._lock = asyncio.Lock()
+
+    async def async_refresh(self) -> None:
+        """Re-parse only the YAML files that changed since the last refresh."""
+        async with self._lock:
+            rescanned = await self._async_refresh_files()
+            if rescanned:
+                _LOGGER.debug("Template index: parsed %d file(s)", rescanned)
+
+    @callback
+    def async_templates(self) -> list[dict[str, Any]]:
+        """Return every indexed definition with its file and entity_id."""
+        rows: list[dict[str, Any]] = []
+        for rel, data in self._files.items():
+            for template in data.get("templates", []):
+                object_id = template["object_id"]
+                rows.append(
+                    {
+                        **template,
+                        "file": rel,
+                        "entity_id": f"{template['domain']}.{object_id}"
+                        if object_id
+                        else None,
+                    }
+                )
+        return rows
+
+    @callback
+    def async_find(self, entity_id: str, name: str | None) -> dict[str, Any] | None:
+        """Return the definition without a unique_id that defines entity_id.
+
+        Legacy definitions match on object_id; new-style ones on the name
+        (or the object_id the name slugifies to).
+        """
+        domain, object_id = entity_id.split(".", 1)
+        fallback = None
+        for row in self.async_templates():
+            if row["domain"] != domain or row["has_unique_id"] or row["anchor"] is None:
+                continue
+            if row["object_id"] == object_id:
+                return row
+            if name and row["name"] == name and fallback is None:
+                fallback = row
+        return fallback
+
+    @callback
+    def async_stat(self, rel: str) -> tuple[int, int] | None:
+        """Return the (mtime_ns, size) the index last saw for a file."""
+        data = self._files.get(rel)
+        return (data["mtime_ns"], data["size"]) if data else None
+
+
+def insert_unique_ids(
+    filepath: Path,
+    stat: tuple[int, int],
+    inserts: list[tuple[int, int, str]],
+    backups: BackupStore | None = None,
+) -> bool:
+    """Insert ``unique_id`` lines after the given anchors in one write.
+
+    ``inserts`` holds (anchor line, indent, unique_id). Returns False
+    without writing when the file changed since it was indexed. The
+    pre-edit content goes to ``backups`` when given. Blocking.
+    """
+    st = filepath.stat()
+    if (st.st_mtime_ns, st.st_size) != stat:
+        return False
+    content = filepath.read_text(encoding="utf-8")
+    lines = content.split("\n")
+    # Bottom-up so earlier anchors keep their line numbers
+    for anchor, indent, unique_id in sorted(inserts, reverse=True):
+        lines.insert(anchor, f"{' ' * indent}unique_id: {unique_id}")
+    if backups is not None:
+        backups.add(filepath, content, "register_template")
+    filepath.write_text("\n".join(lines), encoding="utf-8")
+    return True
+
+
+@callback
+def async_get_template_index(hass: HomeAssistant) -> TemplateIndex:
+    """Return the template definition index, creating it on first use."""
+    data = hass.data.setdefault(DOMAIN, {})
+    index: TemplateIndex | None = data.get(DATA_TEMPLATE_INDEX)
+    if index is None or index.config_path != Path(hass.config.config_dir):
+        index = data[DATA_TEMPLATE_INDEX] = TemplateIndex(hass)
+    return index
@@ -1,23 +1,91 @@
 """WebSocket API for Entity Manager."""
 
+import asyncio
 import json
 import logging
 import re
 import uuid as uuid_module
-from datetime import datetime, timezone
+from collections import Counter
+from collections.abc import Callable
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any
+from urllib.parse import urlencode
 
 import voluptuous as vol
 from homeassistant.components import websocket_api
+from homeassistant.components.http.auth import async_sign_path
 from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import area_registry as ar
 from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers import label_registry as lr
 
-from .const import MAX_BULK_ENTITIES, VALID_ENTITY_ID
+from .activity import (
+    async_get_activity_tracker,
+    query_activity_summary,
+    query_last_activity,
+)
+from .backups import BackupStore, async_get_backup_store
+from .change_feed import async_get_change_feed, stat_paths
+from .const import (
+    BULK_WRITE_BATCH_SIZE,
+    DOMAIN,
+    MAX_ACTIVITY_BUCKETS,
+    MAX_ACTIVITY_HOURS,
+    MAX_BULK_ENTITIES,
+    MAX_BULK_TOGGLE_ENTITIES,
+    MAX_IMPORT_CHUNK_ROWS,
+    MAX_IMPORT_ROWS,
+    MAX_PAGE_SIZE,
+    VALID_ENTITY_ID,
+)
+from .dashboard_index import (
+    async_get_dashboard_index,
+    async_rewrite_dashboard_references,
+)
+from .export import EXPORT_FORMATS, EXPORT_URL, async_get_export_cache, export_row
+from .footprint import async_recorder_footprint
+from .importer import (
+    async_begin_session,
+    async_end_session,
+    async_get_session,
+    plan_import,
+    session_full,
+)
+from .jobs import FINISHED_STATES, Job, JobCancelled, async_get_job_manager
+from .journal import (
+    FIELD_DEVICE_ID,
+    FIELD_DISABLED_BY,
+    FIELD_ENTITY_ID,
+    FIELD_NAME,
+    JournalConflict,
+    async_get_journal,
+    async_record,
+    change,
+    summarize,
+)
+from .reference_graph import async_get_reference_graph
+from .registry_index import (
+    INDEX_KEYS,
+    NO_DEVICE,
+    RegistryIndex,
+    async_get_registry_index,
+    index_values,
+)
+from .template_index import (
+    TemplateIndex,
+    async_get_template_index,
+    insert_unique_ids,
+)
+from .yaml_index import async_get_yaml_index
+from .yaml_scan import (
+    iter_yaml_files,
+    map_files,
+    read_if_contains,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -63,12 +131,279 @@ def disable_entity(hass: HomeAssistant, entity_id: str) -> None:
     entity_reg.async_update_entity(entity_id, disabled_by=er.RegistryEntryDisabler.USER)
 
 
+def _disabled_by_change(
+    entry: er.RegistryEntry, disabled_by: er.RegistryEntryDisabler | None
+) -> dict[str, Any]:
+    """Return the journal change for setting disabled_by on an entry."""
+    return change(
+        entry.entity_id,
+        FIELD_DISABLED_BY,
+        entry.disabled_by.value if entry.disabled_by else None,
+        disabled_by.value if disabled_by else None,
+    )
+
+
+_SORT_KEYS = ("entity_id", "name", "platform", "entity_category", "disabled_by")
+
+
+def _entity_row(entity: er.RegistryEntry) -> dict[str, Any]:
+    """Return the wire representation of a registry entry for the entity tree."""
+    return {
+        "entity_id": entity.entity_id,
+        "platform": entity.platform or "unknown",
+        "device_id": entity.device_id,
+        "disabled_by": entity.disabled_by.value if entity.disabled_by else None,
+        "original_name": entity.original_name,
+        "entity_category": entity.entity_category.value
+        if entity.entity_category
+        else None,
+        "is_disabled": bool(entity.disabled),
+        "config_entry_id": entity.config_entry_id,
+    }
+
+
+def _entity_filters(msg: dict[str, Any]) -> dict[str, set[str]]:
+    """Collect the optional server-side filters from a WS message.
+
+    Each filter accepts one value or a list of values. ``device_id`` accepts
+    ``"no_device"`` and the other fields accept ``"none"`` to match entities
+    where the field is unset.
+    """
+    return {key: set(msg[key]) for key in INDEX_KEYS if msg.get(key)}
+
+
+def _search_matches(entity: er.RegistryEntry, search: str) -> bool:
+    """Return True if the casefolded search string occurs in the entity's ids/names."""
+    haystack = " ".join(
+        filter(None, (entity.entity_id, entity.name, entity.original_name))
+    )
+    return search in haystack.casefold()
+
+
+def _entity_sort_key(sort_by: str):
+    """Return a sort key function for registry entries."""
+    if sort_by == "name":
+        return lambda e: (e.name or e.original_name or e.entity_id).casefold()
+    if sort_by == "platform":
+        return lambda e: (e.platform or "unknown", e.entity_id)
+    if sort_by == "entity_category":
+        return lambda e: (
+            e.entity_category.value if e.entity_category else "",
+            e.entity_id,
+        )
+    if sort_by == "disabled_by":
+        return lambda e: (e.disabled_by.value if e.disabled_by else "", e.entity_id)
+    return lambda e: e.entity_id
+
+
+def _build_entity_tree(
+    index: RegistryIndex,
+    entities: list[er.RegistryEntry],
+    with_rows: bool = True,
+) -> dict[str, dict[str, Any]]:
+    """Group entries into the platform → device → entity tree, in list order.
+
+    Group totals come from the index, so they describe the whole registry
+    rather than just the entities passed in. ``with_rows=False`` only counts
+    the entities per group and leaves the ``entities`` lists out.
+    """
+    tree: dict[str, dict[str, Any]] = {}
+    for entity in entities:
+        platform = entity.platform or "unknown"
+        device_key = entity.device_id or NO_DEVICE
+        integration = tree.get(platform)
+        if integration is None:
+            integration = tree[platform] = {
+                "integration": platform,
+                "devices": {},
+                **index.async_group_totals(platform),
+                "matching_entities": 0,
+            }
+        devices = integration["devices"]
+        device = devices.get(device_key)
+        if device is None:
+            device = devices[device_key] = {
+                "device_id": entity.device_id,
+                "name": index.async_device_name(entity.device_id),
+                **index.async_group_totals(platform, device_key),
+                "matching_entities": 0,
+            }
+            if with_rows:
+                device["entities"] = []
+        integration["matching_entities"] += 1
+        device["matching_entities"] += 1
+        if with_rows:
+            device["entities"].append(_entity_row(entity))
+    return tree
+
+
+def _to_columnar(
+    index: RegistryIndex, entities: list[er.RegistryEntry]
+) -> dict[str, Any]:
+    """Encode registry entries as interned string tables plus parallel columns.
+
+    Repeated values (platforms, devices, config entries, categories and
+    disablers) are sent once in ``tables`` and referenced from ``columns`` by
+    position; ``None`` marks an unset field. Row order follows ``entities``.
+    """
+    tables: dict[str, list[Any]] = {
+        "platforms": [],
+        "devices": [],
+        "device_names": [],
+        "config_entries": [],
+        "entity_categories": [],
+        "disabled_by": [],
+    }
+    lookups: dict[str, dict[str, int]] = {name: {} for name in tables}
+
+    def _intern(table: str, value: str | None) -> int | None:
+        if value is None:
+            return None
+        lookup = lookups[table]
+        position = lookup.get(value)
+        if position is None:
+            position = lookup[value] = len(tables[table])
+            tables[table].append(value)
+            if table == "devices":
+                tables["device_names"].append(index.async_device_name(value))
+        return position
+
+    columns: dict[str, list[Any]] = {
+        "entity_id": [],
+        "original_name": [],
+        "platform": [],
+        "device": [],
+        "config_entry": [],
+        "entity_category": [],
+        "disabled_by": [],
+    }
+    for entity in entities:
+        columns["entity_id"].append(entity.entity_id)
+        columns["original_name"].append(entity.original_name)
+        columns["platform"].append(_intern("platforms", entity.platform or "unknown"))
+        columns["device"].append(_intern("devices", entity.device_id))
+        columns["config_entry"].append(
+            _intern("config_entries", entity.config_entry_id)
+        )
+        columns["entity_category"].append(
+            _intern(
+                "entity_categories",
+                entity.entity_category.value if entity.entity_category else None,
+            )
+        )
+        columns["disabled_by"].append(
+            _intern(
+                "disabled_by", entity.disabled_by.value if entity.disabled_by else None
+            )
+        )
+    return {
+        "format": "columnar",
+        "count": len(entities),
+        "tables": tables,
+        "columns": columns,
+    }
+
+
+async def _async_send_chunked(
+    connection: websocket_api.ActiveConnection,
+    msg_id: int,
+    items: list[Any],
+    chunk_size: int,
+    encode: Callable[[list[Any]], Any] | None = None,
+    summary: dict[str, Any] | None = None,
+) -> None:
+    """Stream ``items`` to the client in fixed-size batches.
+
+    The command is acknowledged like a subscription, then each batch is sent
+    as a ``{"type": "chunk", "seq", "items"}`` event and a final
+    ``{"type": "end", "total", "chunks", **summary}`` event terminates the
+    stream. ``encode`` turns a batch into its payload, so rows are only built
+    (and serialised) one batch at a time. The loop is yielded between batches
+    and unsubscribing stops the stream.
+
+    Once the ack is sent the command has its result, so a failure while
+    encoding ends the stream with a ``{"type": "error", "seq", "message"}``
+    event instead of an error result. The subscription is dropped when the
+    stream ends, however it ends.
+    """
+    cancelled = False
+
+    @callback
+    def _cancel() -> None:
+        nonlocal cancelled
+        cancelled = True
+
+    connection.subscriptions[msg_id] = _cancel
+    connection.send_result(msg_id)
+
+    chunks = 0
+    try:
+        for start in range(0, len(items), chunk_size):
+            batch = items[start : start + chunk_size]
+            connection.send_message(
+                websocket_api.event_message(
+                    msg_id,
+                    {
+                        "type": "chunk",
+                        "seq": chunks,
+                        "items": encode(batch) if encode else batch,
+                    },
+                )
+            )
+            chunks += 1
+            await asyncio.sleep(0)
+            if cancelled:
+                return
+
+        connection.send_message(
+            websocket_api.event_message(
+                msg_id,
+                {
+                    "type": "end",
+                    "total": len(items),
+                    "chunks": chunks,
+                    **(summary or {}),
+                },
+            )
+        )
+    except Exception as err:
+        _LOGGER.error(
+            "Error streaming chunk %d of message %d: %s",
+            chunks,
+            msg_id,
+            err,
+            exc_info=True,
+        )
+        connection.send_message(
+            websocket_api.event_message(
+                msg_id, {"type": "error", "seq": chunks, "message": str(err)}
+            )
+        )
+    finally:
+        connection.subscriptions.pop(msg_id, None)
+
+
 @websocket_api.websocket_command(
     {
         vol.Required("type"): "entity_manager/get_disabled_entities",
         vol.Optional("state", default="disabled"): vol.In(
             ["disabled", "enabled", "all"]
         ),
+        **{
+            vol.Optional(key): vol.All(cv.ensure_list, [cv.string])
+            for key in INDEX_KEYS
+        },
+        vol.Optional("search"): cv.string,
+        vol.Optional("sort_by"): vol.In(_SORT_KEYS),
+        vol.Optional("sort_desc", default=False): bool,
+        vol.Optional("offset", default=0): vol.All(vol.Coerce(int), vol.Range(min=0)),
+        vol.Optional("limit"): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=MAX_PAGE_SIZE)
+        ),
+        vol.Optional("format"): vol.In(["columnar"]),
+        vol.Optional("chunk_size"): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=MAX_PAGE_SIZE)
+        ),
     }
 )
 @websocket_api.require_admin
@@ -78,99 +413,221 @@ async def handle_get_disabled_entities(
     connection: websocket_api.ActiveConnection,
     msg: dict[str, Any],
 ) -> None:
-    """Handle get disabled entities request."""
-    try:
-        entity_reg = er.async_get(hass)
-        dev_reg = dr.async_get(hass)
-        state = msg.get("state", "disabled")
+    """Handle get disabled entities request.
 
-        grouped_data: dict[str, Any] = {}
+    Without ``limit`` the full platform → device → entity tree is returned as a
+    list, exactly as before. With ``limit`` the matching rows are sorted and
+    sliced server-side and the response is a page object carrying the page's
+    tree plus per-integration/per-device totals for every matching group.
 
-        for entity in entity_reg.entities.values():
-            is_disabled = bool(entity.disabled)
-            include_entity = (
-                state == "all"
-                or (state == "disabled" and is_disabled)
-                or (state == "enabled" and not is_disabled)
-            )
-
-            platform = entity.platform or "unknown"
-            device_id = entity.device_id or "no_device"
+    ``format: "columnar"`` replaces the tree with the interned-table encoding
+    from _to_columnar() and always includes the group totals.
 
-            if platform not in grouped_data:
-                grouped_data[platform] = {
-                    "integration": platform,
-                    "devices": {},
-                    "total_entities": 0,
-                    "disabled_entities": 0,
-                }
+    ``chunk_size`` streams the (optionally paged) rows via _async_send_chunked();
+    each chunk holds tree fragments (or a columnar block) for its batch, to be
+    merged by integration/device key, and the end event carries the totals.
+    """
+    try:
+        index = async_get_registry_index(hass)
+        search = (msg.get("search") or "").strip().casefold()
+        limit: int | None = msg.get("limit")
+
+        matched = index.async_query(_entity_filters(msg), msg.get("state", "disabled"))
+        if search:
+            matched = [e for e in matched if _search_matches(e, search)]
+        matched.sort(
+            key=_entity_sort_key(msg.get("sort_by") or "entity_id"),
+            reverse=msg.get("sort_desc", False),
+        )
 
-            integration_entry = grouped_data[platform]
-            integration_entry["total_entities"] += 1
-            if is_disabled:
-                integration_entry["disabled_entities"] += 1
-
-            devices = integration_entry["devices"]
-            if device_id not in devices:
-                device_name: str | None = None
-                if device_id != "no_device":
-                    dev = dev_reg.async_get(device_id)
-                    if dev:
-                        device_name = dev.name_by_user or dev.name
-                devices[device_id] = {
-                    "device_id": device_id if device_id != "no_device" else None,
-                    "name": device_name,
-                    "entities": [],
-                    "total_entities": 0,
-                    "disabled_entities": 0,
-                }
+        offset: int = msg.get("offset", 0)
+        page = matched if limit is None else matched[offset : offset + limit]
+        columnar = msg.get("format") == "columnar"
+        chunk_size: int | None = msg.get("chunk_size")
 
-            device_entry = devices[device_id]
-            device_entry["total_entities"] += 1
-            if is_disabled:
-                device_entry["disabled_entities"] += 1
+        if limit is None and not columnar and not chunk_size:
+            # Keep the registry's integration order for the unpaged tree
+            tree = _build_entity_tree(index, page)
+            connection.send_result(
+                msg["id"],
+                [tree[p] for p in index.async_platforms() if p in tree],
+            )
+            return
 
-            if include_entity:
-                device_entry["entities"].append(
-                    {
-                        "entity_id": entity.entity_id,
-                        "platform": platform,
-                        "device_id": entity.device_id,
-                        "disabled_by": entity.disabled_by.value
-                        if entity.disabled_by
-                        else None,
-                        "original_name": entity.original_name,
-                        "entity_category": entity.entity_category.value
-                        if entity.entity_category
-                        else None,
-                        "is_disabled": is_disabled,
-                        "config_entry_id": entity.config_entry_id,
-                    }
-                )
+        # Every other mode carries the totals of each matching group, so the
+        # panel can show counts without downloading every row.
+        summary: dict[str, Any] = {
+            "totals": list(
+                _build_entity_tree(index, matched, with_rows=False).values()
+            ),
+            "total": len(matched),
+        }
+        if limit is not None:
+            next_offset = offset + len(page)
+            summary.update(
+                offset=offset,
+                limit=limit,
+                next_offset=next_offset if next_offset < len(matched) else None,
+            )
 
-        # Prune devices and integrations with no matching entities
-        filtered_integrations = []
-        for integration in grouped_data.values():
-            filtered_devices = {
-                device_id: device
-                for device_id, device in integration["devices"].items()
-                if device["entities"]
-            }
-            if not filtered_devices:
-                continue
-            integration["devices"] = filtered_devices
-            filtered_integrations.append(integration)
+        def _encode(entities: list[er.RegistryEntry]) -> Any:
+            if columnar:
+                return _to_columnar(index, entities)
+            return list(_build_entity_tree(index, entities).values())
 
-        connection.send_result(msg["id"], filtered_integrations)
+        if chunk_size:
+            await _async_send_chunked(
+                connection, msg["id"], page, chunk_size, _encode, summary
+            )
+        elif columnar:
+            connection.send_result(msg["id"], {**_encode(page), **summary})
+        else:
+            connection.send_result(
+                msg["id"], {"integrations": _encode(page), **summary}
+            )
     except Exception as err:
         _LOGGER.error("Error getting disabled entities: %s", err, exc_info=True)
         connection.send_error(msg["id"], "get_failed", str(err))
 
 
+def _state_matches(entity: er.RegistryEntry, state: str) -> bool:
+    """Return True if an entry matches the all/enabled/disabled state selector."""
+    if state == "all":
+        return True
+    return bool(entity.disabled) == (state == "disabled")
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "entity_manager/subscribe_entities",
+        vol.Optional("state", default="all"): vol.In(["disabled", "enabled", "all"]),
+        **{
+            vol.Optional(key): vol.All(cv.ensure_list, [cv.string])
+            for key in INDEX_KEYS
+        },
+    }
+)
+@websocket_api.require_admin
+@callback
+def handle_subscribe_entities(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Send the entity tree once, then add/update/remove deltas as registries change.
+
+    Events are ``{"type": "snapshot", "integrations": [...]}`` followed by
+    ``{"type": "delta", "added": [...], "updated": [...], "removed": [...],
+    "devices": {...}, "totals": {...}}``. Changes fired in the same loop
+    iteration (e.g. one bulk disable) are coalesced into a single delta.
+    """
+    index = async_get_registry_index(hass)
+    owns_index = not index.is_live
+    if owns_index:
+        # Integration not set up — keep a private live index for this subscription
+        index.async_start()
+
+    state: str = msg["state"]
+    filters = _entity_filters(msg)
+    known: dict[str, str] = {}  # entity_id → platform of rows the client holds
+    pending_entities: set[str] = set()
+    pending_devices: set[str] = set()
+    flush_handle: asyncio.Handle | None = None
+
+    def _passes(entity: er.RegistryEntry) -> bool:
+        if not _state_matches(entity, state):
+            return False
+        values = index_values(entity)
+        return all(values[key] in accepted for key, accepted in filters.items())
+
+    @callback
+    def _flush() -> None:
+        nonlocal flush_handle
+        flush_handle = None
+        added: list[dict[str, Any]] = []
+        updated: list[dict[str, Any]] = []
+        removed: list[str] = []
+        platforms: set[str] = set()
+        device_ids = set(pending_devices)
+        for entity_id in sorted(pending_entities):
+            entity = index.async_get(entity_id)
+            if entity is not None and _passes(entity):
+                row = _entity_row(entity)
+                (updated if entity_id in known else added).append(row)
+                if entity_id in known:
+                    platforms.add(known[entity_id])
+                known[entity_id] = row["platform"]
+                platforms.add(row["platform"])
+                if entity.device_id:
+                    device_ids.add(entity.device_id)
+            elif entity_id in known:
+                platforms.add(known.pop(entity_id))
+                removed.append(entity_id)
+        pending_entities.clear()
+        pending_devices.clear()
+        if not (added or updated or removed or device_ids):
+            return
+        connection.send_message(
+            websocket_api.event_message(
+                msg["id"],
+                {
+                    "type": "delta",
+                    "added": added,
+                    "updated": updated,
+                    "removed": removed,
+                    "devices": {
+                        device_id: index.async_device_name(device_id)
+                        for device_id in device_ids
+                    },
+                    "totals": {
+                        platform: index.async_group_totals(platform)
+                        for platform in platforms
+                    },
+                },
+            )
+        )
+
+    @callback
+    def _on_change(entity_ids: set[str], device_ids: set[str]) -> None:
+        nonlocal flush_handle
+        pending_entities.update(entity_ids)
+        pending_devices.update(device_ids)
+        if flush_handle is None:
+            flush_handle = hass.loop.call_soon(_flush)
+
+    remove_listener = index.async_add_listener(_on_change)
+
+    @callback
+    def _unsubscribe() -> None:
+        remove_listener()
+        if flush_handle is not None:
+            flush_handle.cancel()
+        if owns_index:
+            index.async_stop()
+
+    connection.subscriptions[msg["id"]] = _unsubscribe
+    connection.send_result(msg["id"])
+
+    matched = index.async_query(filters, state)
+    matched.sort(key=_entity_sort_key("entity_id"))
+    known.update((e.entity_id, e.platform or "unknown") for e in matched)
+    tree = _build_entity_tree(index, matched)
+    connection.send_message(
+        websocket_api.event_message(
+            msg["id"],
+            {
+                "type": "snapshot",
+                "integrations": [tree[p] for p in index.async_platforms() if p in tree],
+            },
+        )
+    )
+
+
 @websocket_api.websocket_command(
     {
         vol.Required("type"): "entity_manager/enable_entity",
         vol.Required("entity_id"): cv.entity_id,
+        vol.Optional("journal", default=True): bool,
     }
 )
 @websocket_api.require_admin
@@ -182,9 +639,16 @@ async def handle_enable_entity(
 ) -> None:
     """Handle enable entity request."""
     entity_id = msg["entity_id"]
+    entry = er.async_get(hass).async_get(entity_id)
 
     try:
         enable_entity(hass, entity_id)
+        if (
+            msg.get("journal", True)
+            and entry is not None
+            and entry.disabled_by is not None
+        ):
+            async_record(hass, "enable", [_disabled_by_change(entry, None)])
         connection.send_result(msg["id"], {"success": True})
     except ValueError as err:
         _LOGGER.error("Error enabling entity %s: %s", entity_id, err)
@@ -198,6 +662,7 @@ async def handle_enable_entity(
     {
         vol.Required("type"): "entity_manager/disable_entity",
         vol.Required("entity_id"): cv.entity_id,
+        vol.Optional("journal", default=True): bool,
     }
 )
 @websocket_api.require_admin
@@ -209,9 +674,20 @@ async def handle_disable_entity(
 ) -> None:
     """Handle disable entity request."""
     entity_id = msg["entity_id"]
+    entry = er.async_get(hass).async_get(entity_id)
 
     try:
         disable_entity(hass, entity_id)
+        if (
+            msg.get("journal", True)
+            and entry is not None
+            and entry.disabled_by != er.RegistryEntryDisabler.USER
+        ):
+            async_record(
+                hass,
+                "disable",
+                [_disabled_by_change(entry, er.RegistryEntryDisabler.USER)],
+            )
         connection.send_result(msg["id"], {"success": True})
     except ValueError as err:
         _LOGGER.error("Error disabling entity %s: %s", entity_id, err)
@@ -221,21 +697,113 @@ async def handle_disable_entity(
         connection.send_error(msg["id"], "disable_failed", str(err))
 
 
-def _bulk_toggle(
+def _plan_bulk_toggle(
     hass: HomeAssistant,
     entity_ids: list[str],
     action: str,
-) -> dict[str, list]:
-    """Enable or disable a list of entities, returning success/failed lists."""
-    fn = enable_entity if action == "enable" else disable_entity
+) -> tuple[list[str], dict[str, list]]:
+    """Validate a bulk enable/disable up front.
+
+    Returns the entity_ids that actually need a registry write and the
+    success/failed result lists. Unknown ids fail here; duplicates and entities
+    already in the requested state count as success without a write (and so
+    without an entity_registry_updated event). Disabling only counts as done
+    when the user disabled the entity: one disabled by its integration, config
+    entry or device is still marked USER, so re-enabling those keeps it off.
+    """
+    entity_reg = er.async_get(hass)
+    disable = action == "disable"
+    to_write: list[str] = []
     results: dict[str, list] = {"success": [], "failed": []}
+    seen: set[str] = set()
+    for entity_id in entity_ids:
+        if entity_id in seen:
+            continue
+        seen.add(entity_id)
+        entry = entity_reg.async_get(entity_id)
+        if entry is None:
+            results["failed"].append(
+                {"entity_id": entity_id, "error": f"Entity {entity_id} not found"}
+            )
+            continue
+        if disable:
+            needs_write = entry.disabled_by != er.RegistryEntryDisabler.USER
+        else:
+            needs_write = entry.disabled_by is not None
+        if needs_write:
+            to_write.append(entity_id)
+        results["success"].append(entity_id)
+    return to_write, results
+
+
+def _apply_bulk_toggle(
+    hass: HomeAssistant,
+    entity_ids: list[str],
+    action: str,
+    results: dict[str, list],
+) -> list[dict[str, Any]]:
+    """Write pre-validated enable/disable changes, moving failures into results.
+
+    Returns the journal changes for the writes that succeeded.
+    """
+    entity_reg = er.async_get(hass)
+    disabled_by = er.RegistryEntryDisabler.USER if action == "disable" else None
+    changes: list[dict[str, Any]] = []
     for entity_id in entity_ids:
+        entry = entity_reg.async_get(entity_id)
         try:
-            fn(hass, entity_id)
-            results["success"].append(entity_id)
-        except Exception as err:
+            entity_reg.async_update_entity(entity_id, disabled_by=disabled_by)
+        except Exception as err:  # noqa: BLE001
             _LOGGER.error("Error %sing entity %s: %s", action, entity_id, err)
+            results["success"].remove(entity_id)
             results["failed"].append({"entity_id": entity_id, "error": str(err)})
+        else:
+            if entry is not None:
+                changes.append(_disabled_by_change(entry, disabled_by))
+    return changes
+
+
+def _bulk_toggle(
+    hass: HomeAssistant,
+    entity_ids: list[str],
+    action: str,
+) -> dict[str, list]:
+    """Enable or disable a list of entities, returning success/failed lists."""
+    to_write, results = _plan_bulk_toggle(hass, entity_ids, action)
+    async_record(
+        hass, f"bulk_{action}", _apply_bulk_toggle(hass, to_write, action, results)
+    )
+    return results
+
+
+async def _async_bulk_toggle(
+    hass: HomeAssistant,
+    entity_ids: list[str],
+    action: str,
+    job: Job | None = None,
+) -> dict[str, list]:
+    """Enable or disable entities in batches, yielding to the loop between them.
+
+    The registry already coalesces its storage save. Each write still fires
+    its own entity_registry_updated event (core reloads config entries and
+    the frontend refreshes its registry cache from them), so batching only
+    keeps a large background job from stalling the loop between slices.
+    """
+    to_write, results = _plan_bulk_toggle(hass, entity_ids, action)
+    changes: list[dict[str, Any]] = []
+    if job is not None:
+        job.set_total(len(to_write))
+    try:
+        for start in range(0, len(to_write), BULK_WRITE_BATCH_SIZE):
+            if start:
+                await asyncio.sleep(0)
+            batch = to_write[start : start + BULK_WRITE_BATCH_SIZE]
+            changes.extend(_apply_bulk_toggle(hass, batch, action, results))
+            if job is not None:
+                job.advance(len(batch))
+    finally:
+        # A cancelled job still journals the batches it applied
+        async_record(hass, f"bulk_{action}", changes)
     return results
 
 
@@ -255,7 +823,9 @@ async def handle_bulk_enable(
     msg: dict[str, Any],
 ) -> None:
     """Handle bulk enable request."""
-    connection.send_result(msg["id"], _bulk_toggle(hass, msg["entity_ids"], "enable"))
+    connection.send_result(
+        msg["id"], await _async_bulk_toggle(hass, msg["entity_ids"], "enable")
+    )
 
 
 @websocket_api.websocket_command(
@@ -274,7 +844,9 @@ async def handle_bulk_disable(
     msg: dict[str, Any],
 ) -> None:
     """Handle bulk disable request."""
-    connection.send_result(msg["id"], _bulk_toggle(hass, msg["entity_ids"], "disable"))
+    connection.send_result(
+        msg["id"], await _async_bulk_toggle(hass, msg["entity_ids"], "disable")
+    )
 
 
 @websocket_api.websocket_command(
@@ -282,6 +854,8 @@ async def handle_bulk_disable(
         vol.Required("type"): "entity_manager/rename_entity",
         vol.Required("old_entity_id"): cv.entity_id,
         vol.Required("new_entity_id"): cv.entity_id,
+        vol.Optional("update_dashboards", default=False): bool,
+        vol.Optional("journal", default=True): bool,
     }
 )
 @websocket_api.require_admin
@@ -291,7 +865,11 @@ async def handle_rename_entity(
     connection: websocket_api.ActiveConnection,
     msg: dict[str, Any],
 ) -> None:
-    """Handle rename entity request."""
+    """Handle rename entity request.
+
+    With update_dashboards the new ID is also written into every
+    storage-mode dashboard that mentions the old one.
+    """
     entity_reg = er.async_get(hass)
     old_entity_id = msg["old_entity_id"]
     new_entity_id = msg["new_entity_id"]
@@ -324,16 +902,25 @@ async def handle_rename_entity(
 
         # Update the entity ID in the entity registry
         entity_reg.async_update_entity(old_entity_id, new_entity_id=new_entity_id)
+        if msg.get("journal", True):
+            async_record(
+                hass,
+                "rename",
+                [change(new_entity_id, FIELD_ENTITY_ID, old_entity_id, new_entity_id)],
+            )
 
         _LOGGER.info("Renamed entity from %s to %s", old_entity_id, new_entity_id)
-        connection.send_result(
-            msg["id"],
-            {
-                "success": True,
-                "old_entity_id": old_entity_id,
-                "new_entity_id": new_entity_id,
-            },
-        )
+        result = {
+            "success": True,
+            "old_entity_id": old_entity_id,
+            "new_entity_id": new_entity_id,
+        }
+        if msg.get("update_dashboards"):
+            renames = {old_entity_id: new_entity_id}
+            result["dashboards"] = await async_rewrite_dashboard_references(
+                hass, _rename_pattern(renames), renames, False
+            )
+        connection.send_result(msg["id"], result)
     except Exception as err:
         _LOGGER.error(
             "Error renaming entity from %s to %s: %s", old_entity_id, new_entity_id, err
@@ -344,6 +931,12 @@ async def handle_rename_entity(
 @websocket_api.websocket_command(
     {
         vol.Required("type"): "entity_manager/export_states",
+        vol.Optional("format"): vol.In(["columnar", *EXPORT_FORMATS]),
+        vol.Optional("download", default=False): bool,
+        vol.Optional("names", default=False): bool,
+        vol.Optional("chunk_size"): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=MAX_PAGE_SIZE)
+        ),
     }
 )
 @websocket_api.require_admin
@@ -353,30 +946,58 @@ async def handle_export_states(
     connection: websocket_api.ActiveConnection,
     msg: dict[str, Any],
 ) -> None:
-    """Handle export entity states request."""
-    try:
-        entity_reg = er.async_get(hass)
+    """Handle export entity states request.
 
-        export_data = []
-        for entity in entity_reg.entities.values():
-            export_data.append(
-                {
-                    "entity_id": entity.entity_id,
-                    "platform": entity.platform or "unknown",
-                    "device_id": entity.device_id,
-                    "disabled_by": entity.disabled_by.value
-                    if entity.disabled_by
-                    else None,
-                    "is_disabled": bool(entity.disabled),
-                    "original_name": entity.original_name,
-                    "entity_category": entity.entity_category.value
-                    if entity.entity_category
-                    else None,
-                }
-            )
+    ``format: "columnar"`` sends the interned-table encoding instead of a list
+    of row dicts (is_disabled is implied by a non-null disabled_by), and
+    ``chunk_size`` streams either encoding batch by batch.
 
-        export_data.sort(key=lambda e: str(e["entity_id"]))
-        connection.send_result(msg["id"], export_data)
+    ``download: true`` writes (or reuses) a gzip json/ndjson file in the
+    executor and returns a short-lived signed URL for it instead of the rows.
+    """
+    try:
+        if msg.get("download"):
+            fmt = msg.get("format") or "json"
+            if fmt not in EXPORT_FORMATS:
+                connection.send_error(
+                    msg["id"], "invalid_format", f"Cannot download format {fmt}"
+                )
+                return
+            export = await async_get_export_cache(hass).async_get_file(
+                fmt, msg.get("names", False)
+            )
+            query = urlencode({"format": fmt, "names": int(msg.get("names", False))})
+            url = async_sign_path(
+                hass,
+                f"{EXPORT_URL}?{query}",
+                timedelta(minutes=5),
+                refresh_token_id=connection.refresh_token_id,
+            )
+            connection.send_result(
+                msg["id"],
+                {"url": url, "format": fmt, "bytes": export.size, "etag": export.etag},
+            )
+            return
+        if msg.get("format") in EXPORT_FORMATS:
+            connection.send_error(
+                msg["id"], "invalid_format", "json/ndjson require download: true"
+            )
+            return
+        index = async_get_registry_index(hass)
+        entities = index.async_query()
+        entities.sort(key=_entity_sort_key("entity_id"))
+
+        def _encode(batch: list[er.RegistryEntry]) -> Any:
+            if msg.get("format") == "columnar":
+                return _to_columnar(index, batch)
+            return [export_row(entity) for entity in batch]
+
+        if chunk_size := msg.get("chunk_size"):
+            await _async_send_chunked(
+                connection, msg["id"], entities, chunk_size, _encode
+            )
+            return
+        connection.send_result(msg["id"], _encode(entities))
     except Exception as err:
         _LOGGER.error("Error exporting entity states: %s", err, exc_info=True)
         connection.send_error(msg["id"], "export_failed", str(err))
@@ -404,52 +1025,231 @@ async def handle_import_entity_states(
     msg: dict[str, Any],
 ) -> None:
     """Apply enable/disable state from an exported config file."""
+    connection.send_result(
+        msg["id"], await _async_import_entity_states(hass, msg["entities"])
+    )
+
+
+async def _async_import_entity_states(
+    hass: HomeAssistant,
+    entities: list[dict[str, Any]],
+    job: Job | None = None,
+) -> dict[str, Any]:
+    """Apply imported enable/disable rows in batches, yielding between them."""
     entity_reg = er.async_get(hass)
     success_count = 0
     failed: list[dict[str, str]] = []
+    changes: list[dict[str, Any]] = []
 
-    for item in msg["entities"]:
-        entity_id = item["entity_id"]
-        is_disabled = item["is_disabled"]
-        entry = entity_reg.async_get(entity_id)
-        if entry is None:
-            failed.append({"entity_id": entity_id, "error": "not found"})
-            continue
-        try:
-            currently_disabled = bool(entry.disabled_by)
-            if is_disabled and not currently_disabled:
-                entity_reg.async_update_entity(
-                    entity_id, disabled_by=er.RegistryEntryDisabler.USER
-                )
-            elif not is_disabled and currently_disabled:
-                entity_reg.async_update_entity(entity_id, disabled_by=None)
-            success_count += 1
-        except Exception as err:  # noqa: BLE001
-            _LOGGER.warning("Failed to import state for %s: %s", entity_id, err)
-            failed.append({"entity_id": entity_id, "error": str(err)})
+    if job is not None:
+        job.set_total(len(entities))
+    try:
+        for start in range(0, len(entities), BULK_WRITE_BATCH_SIZE):
+            if start:
+                await asyncio.sleep(0)
+            batch = entities[start : start + BULK_WRITE_BATCH_SIZE]
+            for item in batch:
+                entity_id = item["entity_id"]
+                is_disabled = item["is_disabled"]
+                entry = entity_reg.async_get(entity_id)
+                if entry is None:
+                    failed.append({"entity_id": entity_id, "error": "not found"})
+                    continue
+                try:
+                    disabled_by = er.RegistryEntryDisabler.USER if is_disabled else None
+                    if is_disabled != bool(entry.disabled_by):
+                        entity_reg.async_update_entity(
+                            entity_id, disabled_by=disabled_by
+                        )
+                        changes.append(_disabled_by_change(entry, disabled_by))
+                    success_count += 1
+                except Exception as err:  # noqa: BLE001
+                    _LOGGER.warning("Failed to import state for %s: %s", entity_id, err)
+                    failed.append({"entity_id": entity_id, "error": str(err)})
+            if job is not None:
+                job.advance(len(batch))
+    finally:
+        # A cancelled job still journals the rows it applied
+        async_record(hass, "import", changes)
+
+    return {"success": success_count, "failed": len(failed), "failed_entities": failed}
+
+
+_IMPORT_ROW = {
+    vol.Required("entity_id"): cv.entity_id,
+    vol.Required("is_disabled"): bool,
+}
 
+
+@websocket_api.websocket_command({vol.Required("type"): "entity_manager/import/begin"})
+@websocket_api.require_admin
+@callback
+def handle_import_begin(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Open a chunked import session."""
+    session = async_begin_session(hass)
+    connection.send_result(msg["id"], {"session_id": session.id})
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "entity_manager/import/add_chunk",
+        vol.Required("session_id"): str,
+        vol.Required("entities"): vol.All(
+            [_IMPORT_ROW], vol.Length(min=1, max=MAX_IMPORT_CHUNK_ROWS)
+        ),
+    }
+)
+@websocket_api.require_admin
+@callback
+def handle_import_add_chunk(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Add a chunk of exported rows to an import session."""
+    session = async_get_session(hass, msg["session_id"])
+    if session is None:
+        connection.send_error(
+            msg["id"], "not_found", f"Import session {msg['session_id']} not found"
+        )
+        return
+    if session_full(session, msg["entities"]):
+        connection.send_error(
+            msg["id"],
+            "too_many_rows",
+            f"Import sessions are limited to {MAX_IMPORT_ROWS} entities",
+        )
+        return
+    session.add(msg["entities"])
     connection.send_result(
-        msg["id"],
-        {"success": success_count, "failed": len(failed), "failed_entities": failed},
+        msg["id"], {"session_id": session.id, "rows": len(session.rows)}
     )
 
 
 @websocket_api.websocket_command(
     {
-        vol.Required("type"): "entity_manager/list_hacs_items",
+        vol.Required("type"): "entity_manager/import/plan",
+        vol.Required("session_id"): str,
+    }
+)
+@websocket_api.require_admin
+@callback
+def handle_import_plan(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Diff an import session against the registry without writing anything."""
+    session = async_get_session(hass, msg["session_id"])
+    if session is None:
+        connection.send_error(
+            msg["id"], "not_found", f"Import session {msg['session_id']} not found"
+        )
+        return
+    connection.send_result(msg["id"], plan_import(hass, session.rows))
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "entity_manager/import/apply",
+        vol.Required("session_id"): str,
+        vol.Optional("background", default=False): bool,
     }
 )
 @websocket_api.require_admin
 @websocket_api.async_response
-async def handle_list_hacs_items(
+async def handle_import_apply(
     hass: HomeAssistant,
     connection: websocket_api.ActiveConnection,
     msg: dict[str, Any],
 ) -> None:
-    """Handle list HACS-installed items request."""
+    """Apply an import session's planned changes in batches and close it.
 
-    def _list_dirs(path: Path, category: str) -> list[dict[str, Any]]:
-        if not path.exists():
+    The plan is recomputed at apply time, so only rows that still differ are
+    written. With background=True the writes run as a job and the job status
+    is returned instead.
+    """
+    session = async_end_session(hass, msg["session_id"])
+    if session is None:
+        connection.send_error(
+            msg["id"], "not_found", f"Import session {msg['session_id']} not found"
+        )
+        return
+    plan = plan_import(hass, session.rows)
+
+    async def _run(
+        hass: HomeAssistant, job: Job | None, params: dict[str, Any]
+    ) -> dict[str, Any]:
+        result = await _async_import_entity_states(hass, plan["changes"], job)
+        return {**result, "counts": plan["counts"], "not_found": plan["not_found"]}
+
+    if msg["background"]:
+        job = async_get_job_manager(hass).async_start("import_session", {}, _run)
+        connection.send_result(msg["id"], job.as_dict())
+        return
+    try:
+        connection.send_result(msg["id"], await _run(hass, None, {}))
+    except Exception as err:
+        _LOGGER.error("Error applying import session: %s", err, exc_info=True)
+        connection.send_error(msg["id"], "import_failed", str(err))
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "entity_manager/import/cancel",
+        vol.Required("session_id"): str,
+    }
+)
+@websocket_api.require_admin
+@callback
+def handle_import_cancel(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Discard an import session."""
+    async_end_session(hass, msg["session_id"])
+    connection.send_result(msg["id"], {"success": True})
+
+
+DATA_HACS_SCAN = "hacs_scan"
+# Config-relative paths the HACS listing reads
+_HACS_WATCH = (
+    ".storage/hacs.data",
+    ".storage/hacs.repositories",
+    "custom_components",
+    "www/community",
+)
+_HACS_PATHS = (".storage/hacs", "custom_components", "www/community")
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "entity_manager/list_hacs_items",
+        vol.Optional("chunk_size"): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=MAX_PAGE_SIZE)
+        ),
+    }
+)
+@websocket_api.require_admin
+@websocket_api.async_response
+async def handle_list_hacs_items(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Handle list HACS-installed items request.
+
+    With ``chunk_size`` the (large) ``store`` list is streamed in chunks and
+    the remaining keys arrive on the end event.
+    """
+
+    def _list_dirs(path: Path, category: str) -> list[dict[str, Any]]:
+        if not path.exists():
             return []
         items: list[dict[str, Any]] = []
         for entry in sorted(path.iterdir(), key=lambda p: p.name.lower()):
@@ -530,24 +1330,53 @@ async def handle_list_hacs_items(
         def _scan() -> dict[str, Any]:
             integrations = _list_dirs(custom_components, "integration")
             frontend = _list_dirs(community, "frontend")
-            installed = integrations + frontend
-            new_downloads = [
-                item for item in installed if item.get("mtime", 0) >= new_cutoff_ts
+            watched = [
+                *_HACS_WATCH,
+                *(
+                    str(Path(item["path"]).relative_to(base_path))
+                    for item in integrations + frontend
+                ),
             ]
-            store = _load_hacs_storage(base_path)
-            # Build a set of installed names for the frontend to cross-reference
-            installed_names = {item["name"].lower() for item in installed}
             return {
                 "integrations": integrations,
                 "frontend": frontend,
-                "installed": installed,
-                "installed_names": list(installed_names),
-                "new_downloads": new_downloads,
-                "store": store,
-                "cutoff_days": 7,
+                "store": _load_hacs_storage(base_path),
+                "watch": stat_paths(base_path, watched),
             }
 
-        result = await hass.async_add_executor_job(_scan)
+        # Reuse the last scan until the change feed reports a HACS-relevant path
+        feed = async_get_change_feed(hass)
+        cached = hass.data.setdefault(DOMAIN, {}).get(DATA_HACS_SCAN)
+        token, changed = await feed.async_has_changes(
+            cached["token"] if cached else None,
+            lambda rel: rel.startswith(_HACS_PATHS),
+        )
+        if cached is None or changed:
+            scan = await hass.async_add_executor_job(_scan)
+            hass.data[DOMAIN][DATA_HACS_SCAN] = {"token": token, "scan": scan}
+            feed.async_watch(scan.pop("watch"))
+        else:
+            scan = cached["scan"]
+
+        installed = scan["integrations"] + scan["frontend"]
+        result = {
+            "integrations": scan["integrations"],
+            "frontend": scan["frontend"],
+            "installed": installed,
+            # Set of installed names for the frontend to cross-reference
+            "installed_names": list({item["name"].lower() for item in installed}),
+            "new_downloads": [
+                item for item in installed if item.get("mtime", 0) >= new_cutoff_ts
+            ],
+            "store": scan["store"],
+            "cutoff_days": 7,
+        }
+        if chunk_size := msg.get("chunk_size"):
+            store = result.pop("store")
+            await _async_send_chunked(
+                connection, msg["id"], store, chunk_size, summary=result
+            )
+            return
         connection.send_result(msg["id"], result)
     except Exception as err:
         _LOGGER.error("Error listing HACS items: %s", err, exc_info=True)
@@ -559,6 +1388,7 @@ async def handle_list_hacs_items(
         vol.Required("type"): "entity_manager/update_entity_display_name",
         vol.Required("entity_id"): cv.entity_id,
         vol.Optional("name"): vol.Any(str, None),
+        vol.Optional("journal", default=True): bool,
     }
 )
 @websocket_api.require_admin
@@ -572,10 +1402,15 @@ async def handle_update_entity_display_name(
     entity_id = msg["entity_id"]
     name: str | None = msg.get("name") or None
     entity_reg = er.async_get(hass)
-    if not entity_reg.async_get(entity_id):
+    entry = entity_reg.async_get(entity_id)
+    if not entry:
         connection.send_error(msg["id"], "not_found", f"Entity {entity_id} not found")
         return
     entity_reg.async_update_entity(entity_id, name=name)
+    if msg.get("journal", True) and entry.name != name:
+        async_record(
+            hass, "display_name", [change(entity_id, FIELD_NAME, entry.name, name)]
+        )
     connection.send_result(msg["id"], {"success": True})
 
 
@@ -639,6 +1474,7 @@ async def handle_remove_entity(
         vol.Required("type"): "entity_manager/assign_entity_device",
         vol.Required("entity_id"): cv.entity_id,
         vol.Required("device_id"): str,
+        vol.Optional("journal", default=True): bool,
     }
 )
 @websocket_api.require_admin
@@ -661,6 +1497,12 @@ async def handle_assign_entity_device(
         connection.send_error(msg["id"], "not_found", f"Device {device_id} not found")
         return
     entity_reg.async_update_entity(entity_id, device_id=device_id)
+    if msg.get("journal", True) and entry.device_id != device_id:
+        async_record(
+            hass,
+            "assign_device",
+            [change(entity_id, FIELD_DEVICE_ID, entry.device_id, device_id)],
+        )
     connection.send_result(msg["id"], {"success": True})
 
 
@@ -668,6 +1510,7 @@ async def handle_assign_entity_device(
     {
         vol.Required("type"): "entity_manager/unassign_entity_device",
         vol.Required("entity_id"): cv.entity_id,
+        vol.Optional("journal", default=True): bool,
     }
 )
 @websocket_api.require_admin
@@ -685,6 +1528,12 @@ async def handle_unassign_entity_device(
         connection.send_error(msg["id"], "not_found", f"Entity {entity_id} not found")
         return
     entity_reg.async_update_entity(entity_id, device_id=None)
+    if msg.get("journal", True) and entry.device_id is not None:
+        async_record(
+            hass,
+            "unassign_device",
+            [change(entity_id, FIELD_DEVICE_ID, entry.device_id, None)],
+        )
     connection.send_result(msg["id"], {"success": True})
 
 
@@ -735,6 +1584,9 @@ async def handle_get_automations(
 @websocket_api.websocket_command(
     {
         vol.Required("type"): "entity_manager/get_template_sensors",
+        vol.Optional("chunk_size"): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=MAX_PAGE_SIZE)
+        ),
     }
 )
 @websocket_api.require_admin
@@ -746,17 +1598,19 @@ async def handle_get_template_sensors(
 ) -> None:
     """Handle get template sensors request."""
     try:
-        entity_reg = er.async_get(hass)
+        index = async_get_registry_index(hass)
         seen: set[str] = set()
 
         # Collect partial result dicts and their associated states for parallel resolution
         partials: list[dict[str, Any]] = []
         trig_states: list[Any] = []
 
-        for entity in entity_reg.entities.values():
-            entity_id = entity.entity_id
-            if entity.platform != "template" and not entity_id.startswith("template."):
-                continue
+        template_entities = {
+            entity.entity_id: entity
+            for entity in index.async_query({"platform": {"template"}})
+            + index.async_query({"domain": {"template"}})
+        }
+        for entity_id, entity in template_entities.items():
             seen.add(entity_id)
             state = hass.states.get(entity_id)
             attrs: dict[str, Any] = dict(state.attributes) if state else {}
@@ -787,8 +1641,8 @@ async def handle_get_template_sensors(
             trig_states.append(state)
 
         # Pick up any template.* states not in the registry
-        for state in hass.states.async_all():
-            if state.entity_id.startswith("template.") and state.entity_id not in seen:
+        for state in hass.states.async_all("template"):
+            if state.entity_id not in seen:
                 seen.add(state.entity_id)
                 attrs = dict(state.attributes)
                 connected = attrs.get("entity_id", [])
@@ -831,12 +1685,150 @@ async def handle_get_template_sensors(
             )
 
         results.sort(key=lambda e: e["entity_id"])
+        if chunk_size := msg.get("chunk_size"):
+            await _async_send_chunked(connection, msg["id"], results, chunk_size)
+            return
         connection.send_result(msg["id"], results)
     except Exception as err:
         _LOGGER.error("Error getting template sensors: %s", err, exc_info=True)
         connection.send_error(msg["id"], "get_failed", str(err))
 
 
+def _rename_pattern(renames: dict[str, str]) -> re.Pattern[str]:
+    """Return one matcher for every old entity_id in renames."""
+    # Matches an old entity_id as a whole token — not part of a longer
+    # identifier. Lookbehind excludes alphanumeric, underscore, and dot
+    # (prevents matching e.g. "binary_sensor.x" when searching for "sensor.x").
+    alternation = "|".join(
+        re.escape(old_id) for old_id in sorted(renames, key=len, reverse=True)
+    )
+    return re.compile(r"(?<![a-zA-Z0-9_\.])(?:" + alternation + r")(?![a-zA-Z0-9_])")
+
+
+def _rewrite_yaml_references(
+    config_path: Path,
+    renames: dict[str, str],
+    dry_run: bool,
+    job: Job | None = None,
+    files: list[Path] | None = None,
+    backups: BackupStore | None = None,
+) -> dict[str, Any]:
+    """Apply every old → new entity_id rename to the YAML files in one pass.
+
+    Runs blocking file I/O; call it from the executor. All old IDs are
+    combined into a single alternation, so each file is read, matched and
+    written at most once however many renames there are. Files are read on
+    a bounded worker pool with a byte-level substring prefilter before the
+    regex. ``files`` narrows the scan to known candidates; pre-edit content
+    goes to ``backups`` when given. With a job, reports per-file progress
+    and stops between files once the job is cancelled.
+    """
+    pattern = _rename_pattern(renames)
+    needles = [old_id.encode() for old_id in renames]
+
+    def _replace_in(filepath: Path) -> dict[str, Any] | None:
+        rel = filepath.relative_to(config_path)
+        try:
+            content = read_if_contains(filepath, needles)
+            if content is None:
+                return None
+            new_content, count = pattern.subn(
+                lambda match: renames[match.group()], content
+            )
+            if not count:
+                return None
+            if not dry_run:
+                if backups is not None:
+                    backups.add(filepath, content, "update_yaml_references")
+                filepath.write_text(new_content, encoding="utf-8")
+            return {"file": str(rel), "replacements": count}
+        except JobCancelled:
+            raise
+        except Exception as exc:  # noqa: BLE001
+            return {"file": str(rel), "error": str(exc)}
+
+    if files is None:
+        files = iter_yaml_files(config_path)
+    outcomes = map_files(_replace_in, files, job)
+    results = [o for o in outcomes if o is not None and "error" not in o]
+    errors = [o for o in outcomes if o is not None and "error" in o]
+
+    return {
+        "success": True,
+        "dry_run": dry_run,
+        "files_updated": results,
+        "errors": errors,
+        "total_replacements": sum(r["replacements"] for r in results),
+    }
+
+
+def _replace_yaml_references(
+    config_path: Path,
+    old_id: str,
+    new_id: str,
+    dry_run: bool,
+    job: Job | None = None,
+    files: list[Path] | None = None,
+) -> dict[str, Any]:
+    """Replace old_id with new_id in every YAML file under config_path."""
+    return _rewrite_yaml_references(config_path, {old_id: new_id}, dry_run, job, files)
+
+
+async def _async_rewrite_yaml_references(
+    hass: HomeAssistant,
+    renames: dict[str, str],
+    dry_run: bool,
+    job: Job | None = None,
+) -> dict[str, Any]:
+    """Rewrite YAML references using the reference index to pick files.
+
+    Dry runs are answered from the index; only files that failed to index
+    are read. Real runs rewrite just the indexed candidate files.
+    """
+    config_path = Path(hass.config.config_dir)
+    index = async_get_yaml_index(hass)
+    await index.async_refresh()
+    counts: dict[str, int] = {}
+    for old_id in renames:
+        for rel, count in index.async_file_counts(old_id):
+            counts[rel] = counts.get(rel, 0) + count
+    if not dry_run:
+        candidates = set(counts).union(index.async_error_files())
+        files = [config_path / rel for rel in index.async_files() if rel in candidates]
+        return await hass.async_add_executor_job(
+            _rewrite_yaml_references,
+            config_path,
+            renames,
+            False,
+            job,
+            files,
+            async_get_backup_store(hass),
+        )
+
+    error_files = [config_path / rel for rel in index.async_error_files()]
+    result = await hass.async_add_executor_job(
+        _rewrite_yaml_references, config_path, renames, True, job, error_files
+    )
+    result["files_updated"] = [
+        {"file": rel, "replacements": counts[rel]}
+        for rel in index.async_files()
+        if rel in counts
+    ]
+    result["total_replacements"] = sum(counts.values())
+    return result
+
+
+async def _async_update_yaml_references(
+    hass: HomeAssistant,
+    old_id: str,
+    new_id: str,
+    dry_run: bool,
+    job: Job | None = None,
+) -> dict[str, Any]:
+    """Rename one entity_id's YAML references (see _async_rewrite_yaml_references)."""
+    return await _async_rewrite_yaml_references(hass, {old_id: new_id}, dry_run, job)
+
+
 @websocket_api.websocket_command(
     {
         vol.Required("type"): "entity_manager/update_yaml_references",
@@ -860,64 +1852,8 @@ async def handle_update_yaml_references(
     old_id = msg["old_entity_id"]
     new_id = msg["new_entity_id"]
     dry_run: bool = msg["dry_run"]
-    config_path = Path(hass.config.config_dir)
-
-    # Matches old_entity_id as a whole token — not part of a longer identifier.
-    # Lookbehind excludes alphanumeric, underscore, and dot (prevents matching
-    # e.g. "binary_sensor.x" when searching for "sensor.x").
-    pattern = re.compile(
-        r"(?<![a-zA-Z0-9_\.])" + re.escape(old_id) + r"(?![a-zA-Z0-9_])"
-    )
-
-    # Directories inside config_dir that should never be touched
-    _SKIP = {
-        "custom_components",
-        ".storage",
-        "deps",
-        "tts",
-        "__pycache__",
-        "backups",
-        "www",
-        ".git",
-    }
-
-    def _do_replace() -> dict[str, Any]:
-        results: list[dict[str, Any]] = []
-        errors: list[dict[str, Any]] = []
-
-        for filepath in sorted(config_path.rglob("*.yaml")):
-            # Skip any path whose parent parts include an excluded directory
-            rel = filepath.relative_to(config_path)
-            if any(p in _SKIP or p.startswith(".") for p in rel.parts[:-1]):
-                continue
-            # Never touch secrets files (any directory level)
-            if filepath.name == "secrets.yaml":
-                continue
-            try:
-                content = filepath.read_text(encoding="utf-8")
-                if old_id not in content:
-                    continue
-                new_content, count = pattern.subn(new_id, content)
-                if count:
-                    if not dry_run:
-                        # Keep a one-shot backup of the pre-edit content next to the file
-                        filepath.with_name(filepath.name + ".em-bak").write_text(
-                            content, encoding="utf-8"
-                        )
-                        filepath.write_text(new_content, encoding="utf-8")
-                    results.append({"file": str(rel), "replacements": count})
-            except Exception as exc:  # noqa: BLE001
-                errors.append({"file": str(rel), "error": str(exc)})
-
-        return {
-            "success": True,
-            "dry_run": dry_run,
-            "files_updated": results,
-            "errors": errors,
-            "total_replacements": sum(r["replacements"] for r in results),
-        }
 
-    result = _do_replace()
+    result = await _async_update_yaml_references(hass, old_id, new_id, dry_run)
     if not dry_run:
         _LOGGER.info(
             "YAML reference update %s → %s: %d replacement(s) in %d file(s)",
@@ -929,6 +1865,319 @@ async def handle_update_yaml_references(
     connection.send_result(msg["id"], result)
 
 
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "entity_manager/find_yaml_references",
+        vol.Required("entity_ids"): vol.All(
+            [cv.entity_id], vol.Length(min=1, max=MAX_PAGE_SIZE)
+        ),
+    }
+)
+@websocket_api.require_admin
+@websocket_api.async_response
+async def handle_find_yaml_references(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Return where each entity_id is referenced in the YAML config.
+
+    Answers from the persistent reference index; only files whose mtime or
+    size changed since the last call are read again.
+    """
+    try:
+        index = async_get_yaml_index(hass)
+        await index.async_refresh()
+        connection.send_result(
+            msg["id"],
+            {
+                "references": {
+                    entity_id: index.async_find(entity_id)
+                    for entity_id in msg["entity_ids"]
+                },
+                "files_indexed": len(index.async_files()),
+                "errors": index.async_error_files(),
+            },
+        )
+    except Exception as err:
+        _LOGGER.error("Error finding YAML references: %s", err, exc_info=True)
+        connection.send_error(msg["id"], "find_failed", str(err))
+
+
+def _renames_from_rule(
+    entity_reg: er.EntityRegistry,
+    find: str,
+    replace: str,
+    entity_ids: list[str] | None,
+) -> dict[str, str]:
+    """Expand a regex rule into an old → new mapping.
+
+    The rule is applied to ``entity_ids`` when given, otherwise to every
+    registered entity; IDs it leaves unchanged are skipped.
+    """
+    try:
+        rule = re.compile(find)
+    except re.error as err:
+        raise ValueError(f"Invalid pattern {find!r}: {err}") from err
+    renames: dict[str, str] = {}
+    for entity_id in entity_ids if entity_ids is not None else entity_reg.entities:
+        if not rule.search(entity_id):
+            continue
+        new_id = rule.sub(replace, entity_id)
+        if new_id != entity_id:
+            renames[entity_id] = new_id
+    return renames
+
+
+def _plan_bulk_rename(
+    entity_reg: er.EntityRegistry, renames: dict[str, str]
+) -> tuple[dict[str, str], list[dict[str, str]]]:
+    """Split renames into valid ones and {entity_id, error} rows.
+
+    Collisions with existing entities are found with one set intersection
+    against the registry. Targets must be free, so chains and swaps
+    (a → b while b → c) are rejected rather than ordered.
+    """
+    planned: dict[str, str] = {}
+    errors: list[dict[str, str]] = []
+    targets: set[str] = set()
+    for old_id, new_id in renames.items():
+        if old_id == new_id:
+            continue
+        if not VALID_ENTITY_ID.match(new_id):
+            error = f"Invalid entity ID format: {new_id}"
+        elif old_id not in entity_reg.entities:
+            error = f"Entity {old_id} not found"
+        elif old_id.split(".")[0] != new_id.split(".")[0]:
+            error = f"Domain mismatch: {old_id} → {new_id}"
+        elif new_id in targets:
+            error = f"Duplicate target {new_id}"
+        else:
+            planned[old_id] = new_id
+            targets.add(new_id)
+            continue
+        errors.append({"entity_id": old_id, "error": error})
+
+    for new_id in targets & entity_reg.entities.keys():
+        old_id = next(old for old, new in planned.items() if new == new_id)
+        del planned[old_id]
+        errors.append({"entity_id": old_id, "error": f"Entity {new_id} already exists"})
+    return planned, errors
+
+
+async def _async_bulk_rename(
+    hass: HomeAssistant, params: dict[str, Any], job: Job | None = None
+) -> dict[str, Any]:
+    """Validate, apply and propagate a batch of renames.
+
+    The registry is updated in one loop pass and journaled as a single
+    "bulk_rename" entry; YAML is rewritten with one combined matcher over
+    the indexed candidate files, and storage dashboards (update_dashboards)
+    with the same matcher, one save per dashboard. Nothing is written when any rename is
+    invalid (dry runs report the errors instead).
+    """
+    entity_reg = er.async_get(hass)
+    if "rule" in params:
+        rule = params["rule"]
+        renames = _renames_from_rule(
+            entity_reg, rule["find"], rule["replace"], rule.get("entity_ids")
+        )
+    elif "renames" in params:
+        renames = params["renames"]
+    else:
+        raise ValueError("Either renames or rule is required")
+    if len(renames) > MAX_BULK_ENTITIES:
+        raise ValueError(
+            f"{len(renames)} renames exceed the limit of {MAX_BULK_ENTITIES}"
+        )
+
+    planned, errors = _plan_bulk_rename(entity_reg, renames)
+    dry_run = params.get("dry_run", False)
+    if errors and not dry_run:
+        raise ValueError(
+            f"{len(errors)} rename(s) rejected, first: {errors[0]['error']}"
+        )
+
+    if not dry_run:
+        changes: list[dict[str, Any]] = []
+        for old_id, new_id in planned.items():
+            try:
+                entity_reg.async_update_entity(old_id, new_entity_id=new_id)
+            except Exception as err:
+                # Keep what was applied undoable and tell the caller about it;
+                # references are only rewritten after a complete pass.
+                async_record(hass, "bulk_rename", changes)
+                applied = ", ".join(f"{c['old']} → {c['new']}" for c in changes)
+                raise HomeAssistantError(
+                    f"Renamed {len(changes)} of {len(planned)} entities before"
+                    f" {old_id} failed: {err}. Applied (journaled, references"
+                    f" not updated): {applied or 'none'}"
+                ) from err
+            changes.append(change(new_id, FIELD_ENTITY_ID, old_id, new_id))
+        async_record(hass, "bulk_rename", changes)
+        _LOGGER.info("Bulk renamed %d entities", len(changes))
+
+    yaml_result = None
+    if planned and params.get("update_yaml", True):
+        yaml_result = await _async_rewrite_yaml_references(hass, planned, dry_run, job)
+    dashboard_result = None
+    if planned and params.get("update_dashboards", False):
+        dashboard_result = await async_rewrite_dashboard_references(
+            hass, _rename_pattern(planned), planned, dry_run
+        )
+    return {
+        "success": True,
+        "dry_run": dry_run,
+        "renames": [{"old": old, "new": new} for old, new in planned.items()],
+        "errors": errors,
+        "yaml": yaml_result,
+        "dashboards": dashboard_result,
+    }
+
+
+_BULK_RENAME_PARAMS = {
+    vol.Exclusive("renames", "source"): vol.All(
+        {cv.entity_id: cv.string}, vol.Length(min=1, max=MAX_BULK_ENTITIES)
+    ),
+    vol.Exclusive("rule", "source"): {
+        vol.Required("find"): cv.string,
+        vol.Required("replace"): str,
+        vol.Optional("entity_ids"): [cv.entity_id],
+    },
+    vol.Optional("update_yaml", default=True): bool,
+    vol.Optional("update_dashboards", default=False): bool,
+    vol.Optional("dry_run", default=False): bool,
+}
+
+
+@websocket_api.websocket_command(
+    {vol.Required("type"): "entity_manager/bulk_rename", **_BULK_RENAME_PARAMS}
+)
+@websocket_api.require_admin
+@websocket_api.async_response
+async def handle_bulk_rename(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Rename many entities and their YAML references in one pass.
+
+    Takes an explicit ``renames`` mapping or a regex ``rule``
+    ({find, replace}). With dry_run the plan, per-rename errors and the
+    YAML preview are returned without writing anything.
+    """
+    try:
+        connection.send_result(msg["id"], await _async_bulk_rename(hass, msg))
+    except Exception as err:
+        _LOGGER.error("Error in bulk rename: %s", err, exc_info=True)
+        connection.send_error(msg["id"], "rename_failed", str(err))
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "entity_manager/get_references",
+        vol.Required("entity_ids"): vol.All(
+            [cv.entity_id], vol.Length(min=1, max=MAX_PAGE_SIZE)
+        ),
+        vol.Optional("include_yaml", default=True): bool,
+    }
+)
+@websocket_api.require_admin
+@websocket_api.async_response
+async def handle_get_references(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Return what references each entity_id.
+
+    Answers from the cached reverse graph (automations, scripts, templates,
+    dashboards) plus the YAML reference index; sources are only
+    rebuilt after a reload invalidated them.
+    """
+    try:
+        graph = async_get_reference_graph(hass)
+        references = await graph.async_get(
+            msg["entity_ids"], msg.get("include_yaml", True)
+        )
+        connection.send_result(msg["id"], {"references": references})
+    except Exception as err:
+        _LOGGER.error("Error getting references: %s", err, exc_info=True)
+        connection.send_error(msg["id"], "get_failed", str(err))
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "entity_manager/get_dashboard_usage",
+    }
+)
+@websocket_api.require_admin
+@websocket_api.async_response
+async def handle_get_dashboard_usage(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Return which entities appear on any dashboard, with per-dashboard counts.
+
+    Reads every storage and YAML dashboard through the dashboard index (one
+    parse per changed file) instead of a lovelace/config call per dashboard.
+    ``card_type_counts`` and ``locations`` ("dashboard › view" per used
+    entity) carry everything the panel's Lovelace dialog shows.
+    """
+    try:
+        dashboards = await async_get_dashboard_index(hass).async_dashboards()
+        known = set(hass.states.async_entity_ids())
+        known.update(er.async_get(hass).entities)
+        used: set[str] = set()
+        card_types: set[str] = set()
+        card_type_counts: Counter[str] = Counter()
+        locations: dict[str, list[str]] = {}
+        rows = []
+        for dashboard in dashboards:
+            views = dashboard.get("views", [])
+            entities: set[str] = set()
+            for view in views:
+                view_entities = known.intersection(view["entities"])
+                entities.update(view_entities)
+                card_type_counts.update(view.get("card_types", {}))
+                label = view["view_title"] or view["view"]
+                if isinstance(label, int):
+                    label = f"View {label + 1}"
+                where = f"{dashboard['title']} › {label}"
+                for entity_id in view_entities:
+                    locations.setdefault(entity_id, []).append(where)
+            used |= entities
+            card_types.update(dashboard.get("card_types", []))
+            row = {
+                "url_path": dashboard["url_path"],
+                "title": dashboard["title"],
+                "mode": dashboard["mode"],
+                "views": len(views),
+                "cards": sum(view["cards"] for view in views),
+                "entities": len(entities),
+            }
+            if "error" in dashboard:
+                row["error"] = dashboard["error"]
+            rows.append(row)
+        connection.send_result(
+            msg["id"],
+            {
+                "dashboards": rows,
+                "used": sorted(used),
+                "unused": sorted(known - used),
+                "card_types": sorted(card_types),
+                "card_type_counts": dict(card_type_counts.most_common()),
+                "locations": {
+                    entity_id: locations[entity_id] for entity_id in sorted(locations)
+                },
+            },
+        )
+    except Exception as err:
+        _LOGGER.error("Error getting dashboard usage: %s", err, exc_info=True)
+        connection.send_error(msg["id"], "get_failed", str(err))
+
+
 @websocket_api.websocket_command(
     {
         vol.Required("type"): "entity_manager/get_entity_details",
@@ -1158,16 +2407,62 @@ async def handle_get_areas_and_floors(
         connection.send_error(msg["id"], "get_failed", str(err))
 
 
-_YAML_SKIP = {
-    "custom_components",
-    ".storage",
-    "deps",
-    "tts",
-    "__pycache__",
-    "backups",
-    "www",
-    ".git",
-}
+async def _async_reload_templates(hass: HomeAssistant) -> None:
+    """Reload the template integration so HA picks up new unique_ids."""
+    try:
+        await hass.services.async_call("template", "reload", {}, blocking=True)
+    except Exception:  # noqa: BLE001
+        try:
+            await hass.services.async_call(
+                "homeassistant", "reload_config_entry", {}, blocking=True
+            )
+        except Exception:  # noqa: BLE001
+            pass
+
+
+async def _async_inject_unique_ids(
+    hass: HomeAssistant, index: TemplateIndex, rows: list[dict[str, Any]]
+) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+    """Write a new unique_id into each definition, one write per file.
+
+    Returns (registered, errors); files that changed since they were
+    indexed are reported as errors and left untouched.
+    """
+    config_path = Path(hass.config.config_dir)
+    by_file: dict[str, list[dict[str, Any]]] = {}
+    for row in rows:
+        by_file.setdefault(row["file"], []).append(
+            {**row, "unique_id": str(uuid_module.uuid4())}
+        )
+    registered: list[dict[str, Any]] = []
+    errors: list[dict[str, Any]] = []
+    for rel, file_rows in by_file.items():
+        inserts = [(r["anchor"], r["indent"], r["unique_id"]) for r in file_rows]
+        try:
+            written = await hass.async_add_executor_job(
+                insert_unique_ids,
+                config_path / rel,
+                index.async_stat(rel),
+                inserts,
+                async_get_backup_store(hass),
+            )
+        except Exception as err:  # noqa: BLE001
+            errors.append({"file": rel, "error": str(err)})
+            continue
+        if not written:
+            errors.append({"file": rel, "error": "File changed since it was indexed"})
+            continue
+        registered.extend(
+            {
+                "entity_id": r["entity_id"],
+                "name": r["name"],
+                "file": rel,
+                "line": r["line"],
+                "unique_id": r["unique_id"],
+            }
+            for r in file_rows
+        )
+    return registered, errors
 
 
 @websocket_api.websocket_command(
@@ -1187,12 +2482,13 @@ async def handle_register_template(
     entity_id: str = msg["entity_id"]
     entity_reg = er.async_get(hass)
     entity = entity_reg.async_get(entity_id)
+    state = hass.states.get(entity_id)
 
-    if not entity:
+    if not entity and not state:
         connection.send_error(msg["id"], "not_found", f"Entity {entity_id} not found")
         return
 
-    if entity.unique_id:
+    if entity and entity.unique_id:
         connection.send_error(
             msg["id"],
             "already_registered",
@@ -1200,107 +2496,149 @@ async def handle_register_template(
         )
         return
 
-    new_uuid = str(uuid_module.uuid4())
-    entity_name: str = entity.original_name or ""
-    object_id: str = entity_id.split(".", 1)[1]
-    config_path = Path(hass.config.config_dir)
+    entity_name: str | None = (entity.original_name if entity else None) or (
+        state.attributes.get("friendly_name") if state else None
+    )
+    index = async_get_template_index(hass)
+    await index.async_refresh()
+    row = index.async_find(entity_id, entity_name)
+    registered: list[dict[str, Any]] = []
+    if row is not None:
+        registered, _ = await _async_inject_unique_ids(hass, index, [row])
+
+    if not registered:
+        new_uuid = str(uuid_module.uuid4())
+        connection.send_result(
+            msg["id"],
+            {
+                "success": False,
+                "unique_id": new_uuid,
+                "error": (
+                    "Could not find the template definition in your YAML files. "
+                    "Add the following line manually inside the template block:\n"
+                    f"  unique_id: {new_uuid}"
+                ),
+            },
+        )
+        return
 
-    def _find_and_inject() -> dict[str, Any]:
-        for filepath in sorted(config_path.rglob("*.yaml")):
-            rel = filepath.relative_to(config_path)
-            if any(p in _YAML_SKIP or p.startswith(".") for p in rel.parts[:-1]):
-                continue
-            # Never touch secrets files (any directory level)
-            if filepath.name == "secrets.yaml":
-                continue
-            try:
-                content = filepath.read_text(encoding="utf-8")
-
-                # Strategy 1 — new-style template block: find `name: <entity_name>`
-                if entity_name:
-                    name_pat = re.compile(
-                        r'^(\s*)(name\s*:\s*["\']?)'
-                        + re.escape(entity_name)
-                        + r'(["\']?\s*)$',
-                        re.MULTILINE,
-                    )
-                    m = name_pat.search(content)
-                    if m:
-                        indent = m.group(1)
-                        new_content = (
-                            content[: m.end()]
-                            + f"\n{indent}unique_id: {new_uuid}"
-                            + content[m.end() :]
-                        )
-                        # Keep a one-shot backup of the pre-edit content
-                        filepath.with_name(filepath.name + ".em-bak").write_text(
-                            content, encoding="utf-8"
-                        )
-                        filepath.write_text(new_content, encoding="utf-8")
-                        return {
-                            "success": True,
-                            "file": str(rel),
-                            "unique_id": new_uuid,
-                        }
+    await _async_reload_templates(hass)
+    _LOGGER.info(
+        "Registered template %s with unique_id %s in %s",
+        entity_id,
+        registered[0]["unique_id"],
+        registered[0]["file"],
+    )
+    connection.send_result(
+        msg["id"],
+        {
+            "success": True,
+            "file": registered[0]["file"],
+            "unique_id": registered[0]["unique_id"],
+        },
+    )
 
-                # Strategy 2 — old-style platform template: `<object_id>:` as a YAML key
-                old_pat = re.compile(
-                    r"^(\s+)(" + re.escape(object_id) + r")\s*:\s*$",
-                    re.MULTILINE,
-                )
-                m = old_pat.search(content)
-                if m:
-                    indent = m.group(1)
-                    new_content = (
-                        content[: m.end()]
-                        + f"\n{indent}  unique_id: {new_uuid}"
-                        + content[m.end() :]
-                    )
-                    # Keep a one-shot backup of the pre-edit content
-                    filepath.with_name(filepath.name + ".em-bak").write_text(
-                        content, encoding="utf-8"
-                    )
-                    filepath.write_text(new_content, encoding="utf-8")
-                    return {
-                        "success": True,
-                        "file": str(rel),
-                        "unique_id": new_uuid,
-                    }
 
-            except Exception:  # noqa: BLE001
-                continue
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "entity_manager/list_yaml_templates",
+        vol.Optional("missing_unique_id", default=True): bool,
+    }
+)
+@websocket_api.require_admin
+@websocket_api.async_response
+async def handle_list_yaml_templates(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """List YAML template definitions, by default those without a unique_id."""
+    try:
+        index = async_get_template_index(hass)
+        await index.async_refresh()
+        templates = [
+            row
+            for row in index.async_templates()
+            if not (msg.get("missing_unique_id", True) and row["has_unique_id"])
+        ]
+        connection.send_result(
+            msg["id"],
+            {
+                "templates": [
+                    {
+                        key: row[key]
+                        for key in (
+                            "entity_id",
+                            "domain",
+                            "name",
+                            "style",
+                            "file",
+                            "line",
+                            "has_unique_id",
+                        )
+                    }
+                    for row in templates
+                ],
+                "count": len(templates),
+            },
+        )
+    except Exception as err:
+        _LOGGER.error("Error listing YAML templates: %s", err, exc_info=True)
+        connection.send_error(msg["id"], "get_failed", str(err))
 
-        return {
-            "success": False,
-            "unique_id": new_uuid,
-            "error": (
-                "Could not find the template definition in your YAML files. "
-                "Add the following line manually inside the template block:\n"
-                f"  unique_id: {new_uuid}"
-            ),
-        }
 
-    result = await hass.async_add_executor_job(_find_and_inject)
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "entity_manager/register_all_templates",
+        vol.Optional("dry_run", default=False): bool,
+    }
+)
+@websocket_api.require_admin
+@websocket_api.async_response
+async def handle_register_all_templates(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Give every YAML template without a unique_id one, then reload once.
 
-    if result["success"]:
-        # Reload template integration so HA picks up the new unique_id
-        try:
-            await hass.services.async_call("template", "reload", {}, blocking=True)
-        except Exception:  # noqa: BLE001
-            try:
-                await hass.services.async_call(
-                    "homeassistant", "reload_config_entry", {}, blocking=True
-                )
-            except Exception:  # noqa: BLE001
-                pass
-        _LOGGER.info(
-            "Registered template %s with unique_id %s in %s",
-            entity_id,
-            new_uuid,
-            result.get("file"),
+    Each affected file is written once with all of its insertions.
+    """
+    try:
+        index = async_get_template_index(hass)
+        await index.async_refresh()
+        rows = [
+            row
+            for row in index.async_templates()
+            if not row["has_unique_id"] and row["anchor"] is not None
+        ]
+        if msg.get("dry_run"):
+            connection.send_result(
+                msg["id"],
+                {
+                    "dry_run": True,
+                    "registered": [
+                        {k: row[k] for k in ("entity_id", "name", "file", "line")}
+                        for row in rows
+                    ],
+                    "errors": [],
+                },
+            )
+            return
+        registered, errors = await _async_inject_unique_ids(hass, index, rows)
+        if registered:
+            await _async_reload_templates(hass)
+            _LOGGER.info(
+                "Registered %d YAML template(s) in %d file(s)",
+                len(registered),
+                len({r["file"] for r in registered}),
+            )
+        connection.send_result(
+            msg["id"], {"dry_run": False, "registered": registered, "errors": errors}
         )
-
-    connection.send_result(msg["id"], result)
+    except Exception as err:
+        _LOGGER.error("Error registering templates: %s", err, exc_info=True)
+        connection.send_error(msg["id"], "register_failed", str(err))
 
 
 @websocket_api.websocket_command(
@@ -1316,77 +2654,547 @@ async def handle_get_last_activity(
     connection: websocket_api.ActiveConnection,
     msg: dict[str, Any],
 ) -> None:
-    """Return last non-unavailable/unknown state timestamp per entity from the recorder DB.
+    """Return last non-unavailable/unknown state timestamp per entity.
 
-    Returns a dict mapping entity_id → timestamp_ms (Unix milliseconds).
+    Returns a dict mapping entity_id → timestamp_ms (Unix milliseconds),
+    answered from the in-memory activity tracker (recorder query fallback).
     """
     entity_ids: list[str] | None = msg.get("entity_ids") or None
 
-    def _run_query() -> dict[str, float]:
-        try:
-            from homeassistant.components.recorder import get_instance  # noqa: PLC0415
-            from sqlalchemy import text as sa_text  # noqa: PLC0415
-        except ImportError:
-            return {}
+    try:
+        if (tracker := async_get_activity_tracker(hass)) is not None:
+            result = await tracker.async_get(entity_ids)
+        else:
+            result = await hass.async_add_executor_job(
+                query_last_activity, hass, entity_ids
+            )
+        connection.send_result(msg["id"], result)
+    except Exception as err:
+        _LOGGER.error("Error in get_last_activity: %s", err, exc_info=True)
+        connection.send_error(msg["id"], "query_failed", str(err))
 
-        try:
-            recorder = get_instance(hass)
-        except Exception:  # noqa: BLE001
-            return {}
 
-        result: dict[str, float] = {}
-        CHUNK = 500
-        try:
-            with recorder.get_session() as session:
-                if entity_ids:
-                    for i in range(0, len(entity_ids), CHUNK):
-                        chunk = entity_ids[i : i + CHUNK]
-                        params = {f"e{j}": eid for j, eid in enumerate(chunk)}
-                        in_clause = ", ".join(f":e{j}" for j in range(len(chunk)))
-                        # in_clause contains only :eN parameter placeholders — not user input
-                        _q = (
-                            "SELECT sm.entity_id, MAX(s.last_changed_ts)"  # nosec B608
-                            " FROM states s"
-                            " JOIN states_meta sm ON sm.metadata_id = s.metadata_id"
-                            " WHERE sm.entity_id IN (" + in_clause + ")"
-                            " AND s.state NOT IN ('unavailable', 'unknown')"
-                            " GROUP BY sm.entity_id"
-                        )
-                        rows = session.execute(sa_text(_q), params).fetchall()
-                        for row in rows:
-                            if row[1] is not None:
-                                result[row[0]] = float(row[1]) * 1000  # s → ms
-                else:
-                    rows = session.execute(
-                        sa_text(
-                            """
-                            SELECT sm.entity_id, MAX(s.last_changed_ts)
-                            FROM states s
-                            JOIN states_meta sm ON sm.metadata_id = s.metadata_id
-                            WHERE s.state NOT IN ('unavailable', 'unknown')
-                            GROUP BY sm.entity_id
-                            """
-                        )
-                    ).fetchall()
-                    for row in rows:
-                        if row[1] is not None:
-                            result[row[0]] = float(row[1]) * 1000
-        except Exception as exc:  # noqa: BLE001
-            _LOGGER.warning("Last activity recorder query failed: %s", exc)
-        return result
+_ACTIVITY_SORT_KEYS = ("changes", "last_changed", "first_changed", "entity_id")
+
+
+def _fold_activity(rows: list[dict[str, Any]], buckets: int) -> dict[str, Any]:
+    """Return the summed changes, first/last change and histogram of rows."""
+    histogram = [0] * buckets
+    for row in rows:
+        for bucket, count in enumerate(row["histogram"]):
+            histogram[bucket] += count
+    return {
+        "changes": sum(row["changes"] for row in rows),
+        "entities": len(rows),
+        "first_changed": min((row["first_changed"] for row in rows), default=None),
+        "last_changed": max((row["last_changed"] for row in rows), default=None),
+        "histogram": histogram,
+    }
+
 
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "entity_manager/get_activity_summary",
+        vol.Optional("hours", default=24): vol.All(
+            vol.Coerce(float), vol.Range(min=0.25, max=MAX_ACTIVITY_HOURS)
+        ),
+        vol.Optional("buckets", default=24): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=MAX_ACTIVITY_BUCKETS)
+        ),
+        vol.Optional("entity_ids"): [cv.entity_id],
+        vol.Optional("area_ids"): vol.All(cv.ensure_list, [vol.Any(None, cv.string)]),
+        vol.Optional("sort_by", default="changes"): vol.In(_ACTIVITY_SORT_KEYS),
+        vol.Optional("sort_desc", default=True): bool,
+        vol.Optional("offset", default=0): vol.All(vol.Coerce(int), vol.Range(min=0)),
+        vol.Optional("limit", default=100): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=MAX_PAGE_SIZE)
+        ),
+    }
+)
+@websocket_api.require_admin
+@websocket_api.async_response
+async def handle_get_activity_summary(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Return state-change counts for the last ``hours`` from grouped recorder SQL.
+
+    Per entity (sorted and paged server-side) and per area (entity area, else
+    device area; all matching entities): changes, first/last change (Unix
+    ms) and a histogram of ``buckets`` equal time buckets, oldest first.
+    Only entities that changed in the window are listed.
+    """
+    end = datetime.now(timezone.utc).timestamp()
+    start = end - msg["hours"] * 3600
+    buckets: int = msg["buckets"]
     try:
-        result = await hass.async_add_executor_job(_run_query)
-        connection.send_result(msg["id"], result)
+        summary = await hass.async_add_executor_job(
+            query_activity_summary, hass, start, end, buckets, msg.get("entity_ids")
+        )
     except Exception as err:
-        _LOGGER.error("Error in get_last_activity: %s", err, exc_info=True)
+        _LOGGER.error("Error in get_activity_summary: %s", err, exc_info=True)
         connection.send_error(msg["id"], "query_failed", str(err))
+        return
+
+    entity_reg = er.async_get(hass)
+    device_reg = dr.async_get(hass)
+    wanted = set(msg["entity_ids"]) if "entity_ids" in msg else None
+    area_ids = set(msg["area_ids"]) if "area_ids" in msg else None
+    rows: list[dict[str, Any]] = []
+    for entity_id, row in summary.items():
+        if wanted is not None and entity_id not in wanted:
+            continue
+        entry = entity_reg.async_get(entity_id)
+        device_id = entry.device_id if entry else None
+        area_id = entry.area_id if entry else None
+        if (
+            area_id is None
+            and device_id
+            and (device := device_reg.async_get(device_id))
+        ):
+            area_id = device.area_id
+        if area_ids is not None and area_id not in area_ids:
+            continue
+        rows.append(
+            {"entity_id": entity_id, "area_id": area_id, "device_id": device_id, **row}
+        )
+
+    area_names = {area.id: area.name for area in ar.async_get(hass).async_list_areas()}
+    by_area: dict[str | None, list[dict[str, Any]]] = {}
+    for row in rows:
+        by_area.setdefault(row["area_id"], []).append(row)
+    areas = [
+        {
+            "area_id": area_id,
+            "name": area_names.get(area_id),
+            **_fold_activity(group, buckets),
+        }
+        for area_id, group in by_area.items()
+    ]
+    areas.sort(key=lambda area: area["changes"], reverse=True)
+
+    sort_by: str = msg["sort_by"]
+    rows.sort(
+        key=lambda row: (row[sort_by], row["entity_id"]), reverse=msg["sort_desc"]
+    )
+    offset: int = msg["offset"]
+    page = rows[offset : offset + msg["limit"]]
+    next_offset = offset + len(page)
+    totals = _fold_activity(rows, buckets)
+    connection.send_result(
+        msg["id"],
+        {
+            "start": start * 1000,
+            "end": end * 1000,
+            "bucket_seconds": (end - start) / buckets,
+            "total_changes": totals["changes"],
+            "histogram": totals["histogram"],
+            "areas": areas,
+            "entities": page,
+            "total": len(rows),
+            "offset": offset,
+            "limit": msg["limit"],
+            "next_offset": next_offset if next_offset < len(rows) else None,
+        },
+    )
+
+
+async def _job_bulk_enable(
+    hass: HomeAssistant, job: Job, params: dict[str, Any]
+) -> dict[str, list]:
+    return await _async_bulk_toggle(hass, params["entity_ids"], "enable", job)
+
+
+async def _job_bulk_disable(
+    hass: HomeAssistant, job: Job, params: dict[str, Any]
+) -> dict[str, list]:
+    return await _async_bulk_toggle(hass, params["entity_ids"], "disable", job)
+
+
+async def _job_import_entity_states(
+    hass: HomeAssistant, job: Job, params: dict[str, Any]
+) -> dict[str, Any]:
+    return await _async_import_entity_states(hass, params["entities"], job)
+
+
+async def _job_update_yaml_references(
+    hass: HomeAssistant, job: Job, params: dict[str, Any]
+) -> dict[str, Any]:
+    return await _async_update_yaml_references(
+        hass, params["old_entity_id"], params["new_entity_id"], params["dry_run"], job
+    )
+
+
+async def _job_bulk_rename(
+    hass: HomeAssistant, job: Job, params: dict[str, Any]
+) -> dict[str, Any]:
+    return await _async_bulk_rename(hass, params, job)
+
+
+async def _job_get_last_activity(
+    hass: HomeAssistant, job: Job, params: dict[str, Any]
+) -> dict[str, float]:
+    entity_ids = params.get("entity_ids") or None
+    if (tracker := async_get_activity_tracker(hass)) is not None:
+        return await tracker.async_get(entity_ids)
+    return await hass.async_add_executor_job(query_last_activity, hass, entity_ids, job)
+
+
+async def _job_recorder_footprint(
+    hass: HomeAssistant, job: Job, params: dict[str, Any]
+) -> dict[str, Any]:
+    return await async_recorder_footprint(hass, job, params["top"], params["min_share"])
+
+
+# Job kind → (params schema, runner). Bulk kinds accept MAX_BULK_TOGGLE_ENTITIES:
+# they run in the background in slices, unlike the direct commands capped at
+# MAX_BULK_ENTITIES.
+_JOB_KINDS: dict[str, tuple[vol.Schema, Callable]] = {
+    "bulk_enable": (
+        vol.Schema(
+            {
+                vol.Required("entity_ids"): vol.All(
+                    [cv.entity_id], vol.Length(min=1, max=MAX_BULK_TOGGLE_ENTITIES)
+                )
+            }
+        ),
+        _job_bulk_enable,
+    ),
+    "bulk_disable": (
+        vol.Schema(
+            {
+                vol.Required("entity_ids"): vol.All(
+                    [cv.entity_id], vol.Length(min=1, max=MAX_BULK_TOGGLE_ENTITIES)
+                )
+            }
+        ),
+        _job_bulk_disable,
+    ),
+    "import_entity_states": (
+        vol.Schema(
+            {
+                vol.Required("entities"): vol.All(
+                    [
+                        {
+                            vol.Required("entity_id"): cv.entity_id,
+                            vol.Required("is_disabled"): bool,
+                        }
+                    ],
+                    vol.Length(min=1, max=MAX_BULK_TOGGLE_ENTITIES),
+                )
+            }
+        ),
+        _job_import_entity_states,
+    ),
+    "update_yaml_references": (
+        vol.Schema(
+            {
+                vol.Required("old_entity_id"): cv.entity_id,
+                vol.Required("new_entity_id"): cv.entity_id,
+                vol.Optional("dry_run", default=False): bool,
+            }
+        ),
+        _job_update_yaml_references,
+    ),
+    "bulk_rename": (vol.Schema(_BULK_RENAME_PARAMS), _job_bulk_rename),
+    "get_last_activity": (
+        vol.Schema({vol.Optional("entity_ids"): [cv.entity_id]}),
+        _job_get_last_activity,
+    ),
+    "recorder_footprint": (
+        vol.Schema(
+            {
+                vol.Optional("top", default=50): vol.All(
+                    vol.Coerce(int), vol.Range(min=1, max=MAX_PAGE_SIZE)
+                ),
+                vol.Optional("min_share", default=0.01): vol.All(
+                    vol.Coerce(float), vol.Range(min=0, max=1)
+                ),
+            }
+        ),
+        _job_recorder_footprint,
+    ),
+}
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "entity_manager/jobs/start",
+        vol.Required("kind"): vol.In(list(_JOB_KINDS)),
+        vol.Optional("params", default=dict): dict,
+    }
+)
+@websocket_api.require_admin
+@callback
+def handle_jobs_start(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Queue a long-running operation as a background job.
+
+    Returns the job status straight away; follow it with jobs/subscribe or
+    poll jobs/status.
+    """
+    schema, runner = _JOB_KINDS[msg["kind"]]
+    try:
+        params = schema(msg["params"])
+    except vol.Invalid as err:
+        connection.send_error(msg["id"], "invalid_params", str(err))
+        return
+    job = async_get_job_manager(hass).async_start(msg["kind"], params, runner)
+    connection.send_result(msg["id"], job.as_dict())
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "entity_manager/jobs/status",
+        vol.Optional("job_id"): str,
+    }
+)
+@websocket_api.require_admin
+@callback
+def handle_jobs_status(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Return one job with its result, or every known job without results."""
+    manager = async_get_job_manager(hass)
+    if "job_id" not in msg:
+        connection.send_result(
+            msg["id"], {"jobs": [job.as_dict() for job in manager.async_jobs()]}
+        )
+        return
+    job = manager.async_get(msg["job_id"])
+    if job is None:
+        connection.send_error(msg["id"], "not_found", f"Job {msg['job_id']} not found")
+        return
+    connection.send_result(msg["id"], job.as_dict(with_result=True))
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "entity_manager/jobs/cancel",
+        vol.Required("job_id"): str,
+    }
+)
+@websocket_api.require_admin
+@callback
+def handle_jobs_cancel(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Cancel a queued or running job.
+
+    Registry writes already applied stay applied; executor work stops at the
+    next file or query chunk.
+    """
+    job = async_get_job_manager(hass).async_cancel(msg["job_id"])
+    if job is None:
+        connection.send_error(msg["id"], "not_found", f"Job {msg['job_id']} not found")
+        return
+    connection.send_result(msg["id"], job.as_dict())
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "entity_manager/jobs/subscribe",
+        vol.Optional("job_id"): str,
+    }
+)
+@websocket_api.require_admin
+@callback
+def handle_jobs_subscribe(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Stream job status events (one job, or all jobs without job_id).
+
+    Sends the current status of matching jobs first, then an event on every
+    state change and throttled progress update. Finished-job events carry
+    the result.
+    """
+    manager = async_get_job_manager(hass)
+    msg_id = msg["id"]
+    job_id = msg.get("job_id")
+    if job_id is not None and manager.async_get(job_id) is None:
+        connection.send_error(msg_id, "not_found", f"Job {job_id} not found")
+        return
+
+    @callback
+    def _forward(job: Job) -> None:
+        if job_id is not None and job.id != job_id:
+            return
+        connection.send_message(
+            websocket_api.event_message(
+                msg_id, job.as_dict(with_result=job.status in FINISHED_STATES)
+            )
+        )
+
+    connection.subscriptions[msg_id] = manager.async_add_listener(_forward)
+    connection.send_result(msg_id)
+    for job in manager.async_jobs():
+        _forward(job)
+
+
+@websocket_api.websocket_command({vol.Required("type"): "entity_manager/journal/list"})
+@websocket_api.require_admin
+@callback
+def handle_journal_list(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Return the server-side undo and redo stacks, newest first."""
+    journal = async_get_journal(hass)
+    if journal is None:
+        connection.send_result(msg["id"], {"undo": [], "redo": []})
+        return
+    connection.send_result(msg["id"], journal.async_list())
+
+
+def _handle_journal_step(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+    action: str,
+) -> None:
+    """Apply one undo or redo step and send the affected entry."""
+    journal = async_get_journal(hass)
+    try:
+        entry = None
+        if journal is not None:
+            entry = journal.async_undo() if action == "undo" else journal.async_redo()
+    except JournalConflict as err:
+        connection.send_error(msg["id"], "conflict", str(err))
+        return
+    except Exception as err:
+        _LOGGER.error("Error applying journal %s: %s", action, err, exc_info=True)
+        connection.send_error(msg["id"], f"{action}_failed", str(err))
+        return
+    if entry is None:
+        connection.send_error(msg["id"], "empty", f"Nothing to {action}")
+        return
+    connection.send_result(msg["id"], {"success": True, "entry": summarize(entry)})
+
+
+@websocket_api.websocket_command({vol.Required("type"): "entity_manager/journal/undo"})
+@websocket_api.require_admin
+@callback
+def handle_journal_undo(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Revert the newest journaled command (a whole batch at once)."""
+    _handle_journal_step(hass, connection, msg, "undo")
+
+
+@websocket_api.websocket_command({vol.Required("type"): "entity_manager/journal/redo"})
+@websocket_api.require_admin
+@callback
+def handle_journal_redo(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Re-apply the newest undone command."""
+    _handle_journal_step(hass, connection, msg, "redo")
+
+
+@websocket_api.websocket_command({vol.Required("type"): "entity_manager/journal/clear"})
+@websocket_api.require_admin
+@callback
+def handle_journal_clear(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Drop the undo and redo stacks."""
+    if (journal := async_get_journal(hass)) is not None:
+        journal.async_clear()
+    connection.send_result(msg["id"], {"success": True})
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "entity_manager/backups/list",
+        vol.Optional("file"): cv.string,
+    }
+)
+@websocket_api.require_admin
+@websocket_api.async_response
+async def handle_backups_list(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """List the stored pre-edit backups, newest first."""
+    try:
+        store = async_get_backup_store(hass)
+        backups = await hass.async_add_executor_job(store.entries, msg.get("file"))
+        stored = await hass.async_add_executor_job(store.stored_bytes)
+        connection.send_result(
+            msg["id"],
+            {
+                "backups": backups,
+                "stored_bytes": stored,
+                "max_bytes": store.max_bytes,
+            },
+        )
+    except Exception as err:
+        _LOGGER.error("Error listing backups: %s", err, exc_info=True)
+        connection.send_error(msg["id"], "get_failed", str(err))
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "entity_manager/backups/restore",
+        vol.Required("backup_id"): cv.string,
+        vol.Optional("dry_run", default=False): bool,
+    }
+)
+@websocket_api.require_admin
+@websocket_api.async_response
+async def handle_backups_restore(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Write a backup's content back to its file.
+
+    With dry_run the stored content is returned instead. The current file
+    is backed up before it is overwritten, so restores can be undone.
+    """
+    store = async_get_backup_store(hass)
+    try:
+        if msg["dry_run"]:
+            entry, content = await hass.async_add_executor_job(
+                store.read, msg["backup_id"]
+            )
+            result = {"file": entry["file"], "ts": entry["ts"], "content": content}
+        else:
+            result = await hass.async_add_executor_job(store.restore, msg["backup_id"])
+            _LOGGER.info("Restored %s from backup %s", result["file"], msg["backup_id"])
+        connection.send_result(msg["id"], {"success": True, **result})
+    except KeyError:
+        connection.send_error(
+            msg["id"], "not_found", f"Backup {msg['backup_id']} not found"
+        )
+    except Exception as err:
+        _LOGGER.error("Error restoring backup: %s", err, exc_info=True)
+        connection.send_error(msg["id"], "restore_failed", str(err))
 
 
 @callback
 def async_setup_ws_api(hass: HomeAssistant) -> None:
     """Set up the WebSocket API."""
     websocket_api.async_register_command(hass, handle_get_disabled_entities)
+    websocket_api.async_register_command(hass, handle_subscribe_entities)
     websocket_api.async_register_command(hass, handle_enable_entity)
     websocket_api.async_register_command(hass, handle_disable_entity)
     websocket_api.async_register_command(hass, handle_bulk_enable)
@@ -1394,6 +3202,11 @@ def async_setup_ws_api(hass: HomeAssistant) -> None:
     websocket_api.async_register_command(hass, handle_rename_entity)
     websocket_api.async_register_command(hass, handle_export_states)
     websocket_api.async_register_command(hass, handle_import_entity_states)
+    websocket_api.async_register_command(hass, handle_import_begin)
+    websocket_api.async_register_command(hass, handle_import_add_chunk)
+    websocket_api.async_register_command(hass, handle_import_plan)
+    websocket_api.async_register_command(hass, handle_import_apply)
+    websocket_api.async_register_command(hass, handle_import_cancel)
     websocket_api.async_register_command(hass, handle_list_hacs_items)
     websocket_api.async_register_command(hass, handle_get_automations)
     websocket_api.async_register_command(hass, handle_get_template_sensors)
@@ -1402,9 +3215,26 @@ def async_setup_ws_api(hass: HomeAssistant) -> None:
     websocket_api.async_register_command(hass, handle_assign_entity_device)
     websocket_api.async_register_command(hass, handle_unassign_entity_device)
     websocket_api.async_register_command(hass, handle_update_yaml_references)
+    websocket_api.async_register_command(hass, handle_find_yaml_references)
+    websocket_api.async_register_command(hass, handle_bulk_rename)
+    websocket_api.async_register_command(hass, handle_get_references)
+    websocket_api.async_register_command(hass, handle_get_dashboard_usage)
     websocket_api.async_register_command(hass, handle_get_entity_details)
     websocket_api.async_register_command(hass, handle_get_config_entry_health)
     websocket_api.async_register_command(hass, handle_get_areas_and_floors)
     websocket_api.async_register_command(hass, handle_register_template)
+    websocket_api.async_register_command(hass, handle_list_yaml_templates)
+    websocket_api.async_register_command(hass, handle_register_all_templates)
     websocket_api.async_register_command(hass, handle_get_last_activity)
+    websocket_api.async_register_command(hass, handle_get_activity_summary)
+    websocket_api.async_register_command(hass, handle_jobs_start)
+    websocket_api.async_register_command(hass, handle_jobs_status)
+    websocket_api.async_register_command(hass, handle_jobs_cancel)
+    websocket_api.async_register_command(hass, handle_jobs_subscribe)
+    websocket_api.async_register_command(hass, handle_journal_list)
+    websocket_api.async_register_command(hass, handle_journal_undo)
+    websocket_api.async_register_command(hass, handle_journal_redo)
+    websocket_api.async_register_command(hass, handle_journal_clear)
+    websocket_api.async_register_command(hass, handle_backups_list)
+    websocket_api.async_register_command(hass, handle_backups_restore)
     _LOGGER.debug("Entity Manager WebSocket API commands registered")
@@ -0,0 +1,231 @@
+"""Persistent inverted index of entity_id references in YAML config files."""
+
+import asyncio
+import logging
+import re
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .change_feed import async_get_change_feed, stat_paths
+from .const import DOMAIN
+from .yaml_scan import ScanOptions, async_get_scan_options, iter_yaml_files, map_files
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_YAML_INDEX = "yaml_index"
+STORAGE_KEY = f"{DOMAIN}.yaml_refs"
+STORAGE_VERSION = 1
+SAVE_DELAY = 10
+
+# An entity_id-shaped token bounded the same way as the rename pattern in
+# update_yaml_references, so per-file counts match what a rewrite replaces.
+ENTITY_REF = re.compile(
+    r"(?<![a-zA-Z0-9_\.])[a-z][a-z0-9_]*\.[a-z0-9_]+(?![a-zA-Z0-9_])"
+)
+
+
+def scan_file_refs(filepath: Path) -> dict[str, Any]:
+    """Return {"refs": {entity_id: [[line, count], ...]}} for one file.
+
+    Files that can't be read or decoded return {"error": ...} instead.
+    """
+    try:
+        text = filepath.read_bytes().decode("utf-8")
+    except Exception as exc:  # noqa: BLE001
+        return {"error": str(exc)}
+    refs: dict[str, list[list[int]]] = {}
+    for lineno, line in enumerate(text.split("\n"), 1):
+        if "." not in line:
+            continue
+        counts: dict[str, int] = {}
+        for match in ENTITY_REF.finditer(line):
+            counts[match.group()] = counts.get(match.group(), 0) + 1
+        for entity_id, count in counts.items():
+            refs.setdefault(entity_id, []).append([lineno, count])
+    return {"refs": refs}
+
+
+def refresh_files(
+    config_path: Path,
+    files: dict[str, dict[str, Any]],
+    options: ScanOptions | None = None,
+    scan: Callable[[Path], dict[str, Any]] = scan_file_refs,
+) -> tuple[dict[str, dict[str, Any]], int]:
+    """Revalidate per-file entries by mtime/size and rescan only changed files.
+
+    ``scan`` produces the per-file payload. Returns the new file map (in scan
+    order) and the number of files rescanned. Blocking; run in the executor.
+    """
+    stale: list[tuple[str, Path, int, int]] = []
+    fresh: dict[str, dict[str, Any]] = {}
+    for filepath in iter_yaml_files(config_path, options):
+        rel = str(filepath.relative_to(config_path))
+        try:
+            st = filepath.stat()
+        except OSError:
+            continue
+        cached = files.get(rel)
+        if (
+            cached is not None
+            and cached["mtime_ns"] == st.st_mtime_ns
+            and cached["size"] == st.st_size
+        ):
+            fresh[rel] = cached
+        else:
+            # Placeholder keeps the file in scan order until it is rescanned
+            fresh[rel] = {}
+            stale.append((rel, filepath, st.st_mtime_ns, st.st_size))
+
+    scanned = map_files(scan, [item[1] for item in stale])
+    for (rel, _, mtime_ns, size), data in zip(stale, scanned, strict=True):
+        fresh[rel] = {"mtime_ns": mtime_ns, "size": size, **data}
+    return fresh, len(stale)
+
+
+class YamlFileCache:
+    """Per-file YAML scan results kept current through the change feed.
+
+    A refresh first asks the change feed whether any YAML file (or a
+    directory holding one) changed since the last refresh; if nothing did
+    and the scan options are the same, no disk I/O happens at all.
+    Otherwise refresh_files() revalidates by mtime/size and rescans only
+    the changed files.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, scan: Callable[[Path], dict[str, Any]]
+    ) -> None:
+        """Initialise an empty cache."""
+        self.hass = hass
+        self.config_path = Path(hass.config.config_dir)
+        self._scan = scan
+        self._files: dict[str, dict[str, Any]] = {}
+        self._dirs: set[str] = set()
+        self._feed_token: str | None = None
+        self._options_key: tuple | None = None
+
+    def _is_input(self, rel: str) -> bool:
+        return rel.endswith(".yaml") or rel in self._dirs
+
+    async def _async_refresh_files(self) -> int | None:
+        """Refresh the per-file results; None when skipped as unchanged."""
+        feed = async_get_change_feed(self.hass)
+        options = async_get_scan_options(self.hass)
+        token, changed = await feed.async_has_changes(self._feed_token, self._is_input)
+        if not changed and options.key == self._options_key:
+            return None
+        files, rescanned, dir_stats = await self.hass.async_add_executor_job(
+            self._refresh, options
+        )
+        self._files = files
+        self._feed_token = token
+        self._options_key = options.key
+        self._dirs = set(dir_stats)
+        feed.async_watch(
+            {
+                **{
+                    rel: (data["mtime_ns"], data["size"]) for rel, data in files.items()
+                },
+                **dir_stats,
+            }
+        )
+        return rescanned
+
+    def _refresh(self, options: ScanOptions) -> tuple[dict[str, Any], int, dict]:
+        files, rescanned = refresh_files(
+            self.config_path, self._files, options, self._scan
+        )
+        dirs = {Path(rel).parent.as_posix() for rel in files}
+        return files, rescanned, stat_paths(self.config_path, dirs)
+
+
+class YamlReferenceIndex(YamlFileCache):
+    """entity_id → [(file, line, count)] across the YAML config.
+
+    Per-file results are persisted in .storage and revalidated on refresh,
+    so only files that changed are read again.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialise an empty, unloaded index."""
+        super().__init__(hass, scan_file_refs)
+        self._store: Store = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self._refs: dict[str, dict[str, list[list[int]]]] = {}
+        self._loaded = False
+        self._lock = asyncio.Lock()
+
+    async def _async_load(self) -> None:
+        data = await self._store.async_load()
+        if data and data.get("config_dir") == str(self.config_path):
+            self._files = data.get("files", {})
+        self._loaded = True
+
+    def _data_to_save(self) -> dict[str, Any]:
+        return {"config_dir": str(self.config_path), "files": self._files}
+
+    def _rebuild(self) -> None:
+        refs: dict[str, dict[str, list[list[int]]]] = {}
+        for rel, data in self._files.items():
+            for entity_id, lines in data.get("refs", {}).items():
+                refs.setdefault(entity_id, {})[rel] = lines
+        self._refs = refs
+
+    async def async_refresh(self) -> None:
+        """Bring the index up to date with the files on disk."""
+        async with self._lock:
+            if not self._loaded:
+                await self._async_load()
+                await self.hass.async_add_executor_job(self._rebuild)
+            previous = self._files.keys()
+            rescanned = await self._async_refresh_files()
+            if rescanned is None:
+                return
+            if rescanned or self._files.keys() != previous:
+                await self.hass.async_add_executor_job(self._rebuild)
+                self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+                _LOGGER.debug("YAML reference index: rescanned %d file(s)", rescanned)
+
+    @callback
+    def async_find(self, entity_id: str) -> list[dict[str, Any]]:
+        """Return {file, line, count} rows for an entity_id, in file order."""
+        found = self._refs.get(entity_id, {})
+        return [
+            {"file": rel, "line": line, "count": count}
+            for rel in self._files
+            if rel in found
+            for line, count in found[rel]
+        ]
+
+    @callback
+    def async_file_counts(self, entity_id: str) -> list[tuple[str, int]]:
+        """Return (file, total references) per file for an entity_id, in file order."""
+        found = self._refs.get(entity_id, {})
+        return [
+            (rel, sum(count for _, count in found[rel]))
+            for rel in self._files
+            if rel in found
+        ]
+
+    @callback
+    def async_files(self) -> list[str]:
+        """Return the indexed files (relative paths) in scan order."""
+        return list(self._files)
+
+    @callback
+    def async_error_files(self) -> list[str]:
+        """Return files that could not be read on the last scan."""
+        return [rel for rel, data in self._files.items() if "error" in data]
+
+
+@callback
+def async_get_yaml_index(hass: HomeAssistant) -> YamlReferenceIndex:
+    """Return the YAML reference index, creating it on first use."""
+    data = hass.data.setdefault(DOMAIN, {})
+    index: YamlReferenceIndex | None = data.get(DATA_YAML_INDEX)
+    if index is None or index.config_path != Path(hass.config.config_dir):
+        index = data[DATA_YAML_INDEX] = YamlReferenceIndex(hass)
+    return index
@@ -0,0 +1,279 @@
+"""Shared YAML config file scanning for Entity Manager."""
+
+import logging
+import os
+import re
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import TypeVar
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import (
+    CONF_YAML_EXCLUDE,
+    CONF_YAML_MAX_FILE_KB,
+    CONF_YAML_SCAN_MODE,
+    DEFAULT_YAML_MAX_FILE_KB,
+    DOMAIN,
+    YAML_SCAN_ALL,
+    YAML_SCAN_INCLUDE_GRAPH,
+)
+from .jobs import Job
+
+_LOGGER = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+
+# Directories inside config_dir that should never be touched
+YAML_SKIP_DIRS = {
+    "custom_components",
+    ".storage",
+    "deps",
+    "tts",
+    "__pycache__",
+    "backups",
+    "www",
+    ".git",
+}
+
+# Upper bound on concurrent file readers; scanning is mostly I/O and the
+# executor is shared with the rest of Home Assistant.
+YAML_SCAN_WORKERS = min(4, os.cpu_count() or 1)
+
+
+class ScanOptions:
+    """Which YAML files a scan visits (see the integration options)."""
+
+    def __init__(
+        self,
+        mode: str = YAML_SCAN_ALL,
+        exclude: Iterable[str] = (),
+        max_bytes: int = DEFAULT_YAML_MAX_FILE_KB * 1024,
+    ) -> None:
+        """Initialise the options; exclude holds globs relative to config_dir."""
+        self.mode = mode
+        self.exclude = tuple(p.strip().strip("/") for p in exclude if p.strip())
+        self.max_bytes = max_bytes
+
+    @property
+    def key(self) -> tuple[str, tuple[str, ...], int]:
+        """Return a comparable snapshot of the options."""
+        return (self.mode, self.exclude, self.max_bytes)
+
+    def excluded(self, rel: str) -> bool:
+        """Return True when a config-relative posix path is user-excluded."""
+        return any(
+            fnmatch(rel, pattern) or rel.startswith(pattern + "/")
+            for pattern in self.exclude
+        )
+
+
+@callback
+def async_get_scan_options(hass: HomeAssistant) -> ScanOptions:
+    """Return the scan options from the config entry, or the defaults."""
+    entries = hass.config_entries.async_entries(DOMAIN)
+    if not entries:
+        return ScanOptions()
+    options = entries[0].options
+    return ScanOptions(
+        options.get(CONF_YAML_SCAN_MODE, YAML_SCAN_ALL),
+        re.split(r"[,\n]", options.get(CONF_YAML_EXCLUDE, "")),
+        options.get(CONF_YAML_MAX_FILE_KB, DEFAULT_YAML_MAX_FILE_KB) * 1024,
+    )
+
+
+# !include, !include_dir_list, !include_dir_named, !include_dir_merge_list and
+# !include_dir_merge_named, with an optionally quoted path argument.
+_INCLUDE = re.compile(
+    r"!(include(?:_dir_(?:merge_)?(?:list|named))?)\s+[\"']?([^\s\"']+)"
+)
+# YAML-mode dashboards: `filename: dashboards/x.yaml` under lovelace:
+_DASHBOARD_FILE = re.compile(
+    r"^\s*filename\s*:\s*(?:\"([^\"]+\.yaml)\"|'([^']+\.yaml)'|([^\s\"']+\.yaml))"
+)
+
+
+def strip_yaml_comment(line: str) -> str:
+    """Return line without its trailing ``# comment``, respecting quotes.
+
+    A ``#`` starts a comment only at the start of the line or after
+    whitespace, and never inside a '...' or "..." scalar. A quote opens a
+    scalar only where one can start (after whitespace or a flow indicator),
+    so apostrophes inside plain scalars are ignored.
+    """
+    quote = ""
+    skip = False
+    for i, char in enumerate(line):
+        if skip:
+            skip = False
+        elif quote:
+            if char == "\\" and quote == '"':
+                skip = True
+            elif char == quote:
+                # '' is an escaped quote inside a single-quoted scalar
+                skip = quote == "'" and line[i + 1 : i + 2] == "'"
+                quote = quote if skip else ""
+        elif char in "'\"" and (i == 0 or line[i - 1] in " \t[{,"):
+            quote = char
+        elif char == "#" and (i == 0 or line[i - 1] in " \t"):
+            return line[:i]
+    return line
+
+
+def _dir_yaml_files(directory: Path) -> list[Path]:
+    """Return *.yaml under directory the way !include_dir_* finds them."""
+    found: list[Path] = []
+    for root, dirs, names in os.walk(directory):
+        dirs[:] = [d for d in dirs if not d.startswith(".")]
+        found.extend(
+            Path(root) / name
+            for name in names
+            if name.endswith(".yaml") and not name.startswith(".")
+        )
+    return found
+
+
+def _include_graph(config_path: Path) -> set[Path] | None:
+    """Return the files reachable from configuration.yaml through includes.
+
+    Follows !include and !include_dir_* tags (packages included either way
+    are covered), plus ui-lovelace.yaml, YAML dashboard ``filename``s and
+    every blueprint (Home Assistant loads blueprints/ without an include).
+    Targets outside config_path (after resolving symlinks) are ignored.
+    Returns None when there is no configuration.yaml to start from.
+    """
+    root = config_path / "configuration.yaml"
+    if not root.is_file():
+        return None
+    config_root = config_path.resolve()
+
+    def _inside(path: Path) -> bool:
+        return path.is_relative_to(config_path) and path.resolve().is_relative_to(
+            config_root
+        )
+
+    pending = [root, config_path / "ui-lovelace.yaml"]
+    if (blueprints := config_path / "blueprints").is_dir():
+        pending.extend(_dir_yaml_files(blueprints))
+    seen: set[Path] = set()
+    while pending:
+        filepath = pending.pop()
+        if filepath in seen or not filepath.is_file():
+            continue
+        seen.add(filepath)
+        try:
+            text = filepath.read_text(encoding="utf-8", errors="replace")
+        except OSError:
+            continue
+        for line in text.splitlines():
+            line = strip_yaml_comment(line)
+            if match := _DASHBOARD_FILE.match(line):
+                filename = next(group for group in match.groups() if group)
+                path = Path(os.path.normpath(config_path / filename))
+                if _inside(path):
+                    pending.append(path)
+            for tag, target in _INCLUDE.findall(line):
+                path = Path(os.path.normpath(filepath.parent / target))
+                if not _inside(path):
+                    continue
+                if tag == "include":
+                    pending.append(path)
+                elif path.is_dir():
+                    pending.extend(_dir_yaml_files(path))
+    return seen
+
+
+def _walk_yaml_files(config_path: Path, options: ScanOptions) -> list[Path]:
+    """Return every *.yaml under config_path, pruning skipped directories."""
+    found: list[Path] = []
+    for root, dirs, names in os.walk(config_path):
+        rel_root = Path(root).relative_to(config_path).as_posix()
+        dirs[:] = [
+            d
+            for d in dirs
+            if d not in YAML_SKIP_DIRS
+            and not d.startswith(".")
+            and not options.excluded(d if rel_root == "." else f"{rel_root}/{d}")
+        ]
+        found.extend(Path(root) / name for name in names if name.endswith(".yaml"))
+    return found
+
+
+def iter_yaml_files(
+    config_path: Path, options: ScanOptions | None = None
+) -> list[Path]:
+    """Return the editable YAML files under config_path in sorted order.
+
+    In ``all`` mode (the default) every *.yaml is walked. The opt-in
+    include_graph mode returns only files Home Assistant loads (see
+    _include_graph), falling back to the walk without a configuration.yaml. Either way YAML_SKIP_DIRS, hidden
+    directories, secrets.yaml, user excludes and files over the size cap
+    are skipped.
+    """
+    options = options or ScanOptions()
+    candidates = None
+    if options.mode == YAML_SCAN_INCLUDE_GRAPH:
+        candidates = _include_graph(config_path)
+    if candidates is None:
+        candidates = _walk_yaml_files(config_path, options)
+
+    files: list[Path] = []
+    for filepath in sorted(candidates):
+        rel = filepath.relative_to(config_path)
+        if any(p in YAML_SKIP_DIRS or p.startswith(".") for p in rel.parts[:-1]):
+            continue
+        if filepath.name == "secrets.yaml" or options.excluded(rel.as_posix()):
+            continue
+        try:
+            if filepath.stat().st_size > options.max_bytes:
+                _LOGGER.debug("Skipping %s: larger than the YAML size cap", rel)
+                continue
+        except OSError:
+            continue
+        files.append(filepath)
+    return files
+
+
+def read_if_contains(filepath: Path, needles: list[bytes]) -> str | None:
+    """Return the file's text if its raw bytes contain any needle, else None.
+
+    The byte-level substring check skips decoding and regex work for the
+    large majority of files that can't match.
+    """
+    data = filepath.read_bytes()
+    if not any(needle in data for needle in needles):
+        return None
+    return data.decode("utf-8")
+
+
+def map_files(
+    func: Callable[[Path], _T],
+    files: list[Path],
+    job: Job | None = None,
+    workers: int = YAML_SCAN_WORKERS,
+) -> list[_T]:
+    """Run ``func`` over files on a bounded thread pool, keeping input order.
+
+    Blocking; call from the executor. With a job, reports one unit per file
+    and stops handing out files once the job is cancelled.
+    """
+    if job is not None:
+        job.set_total_threadsafe(len(files))
+
+    def _run(filepath: Path) -> _T:
+        if job is not None:
+            job.raise_if_cancelled()
+        try:
+            return func(filepath)
+        finally:
+            if job is not None:
+                job.advance_threadsafe()
+
+    if workers <= 1 or len(files) <= 1:
+        return [_run(filepath) for filepath in files]
+    with ThreadPoolExecutor(
+        max_workers=workers, thread_name_prefix="entity_manager_yaml"
+    ) as pool:
+        return list(pool.map(_run, files))
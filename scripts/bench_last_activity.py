@@ -0,0 +1,181 @@
+"""Benchmark the last-activity recorder query against a generated database.
+
+Builds a SQLite file with the recorder's states / states_meta layout and
+indexes, then times the previous GROUP BY query against the index-seek query
+in custom_components.entity_manager.activity and checks both agree.
+
+    python scripts/bench_last_activity.py --rows 10000000 --entities 5000
+
+Run from the repository root with Home Assistant installed. The database is
+kept (see --db) so later runs skip generation.
+"""
+
+import argparse
+import random
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from custom_components.entity_manager.activity import (
+    select_last_activity,
+)
+
+SCHEMA = """
+CREATE TABLE states_meta (
+    metadata_id INTEGER PRIMARY KEY,
+    entity_id VARCHAR(255)
+);
+CREATE UNIQUE INDEX ix_states_meta_entity_id ON states_meta (entity_id);
+CREATE TABLE states (
+    state_id INTEGER PRIMARY KEY,
+    state VARCHAR(255),
+    last_changed_ts FLOAT,
+    last_updated_ts FLOAT,
+    metadata_id INTEGER
+);
+-- Left empty: every entity still has states, so the statistics fallback
+-- only costs its statistics_meta lookup
+CREATE TABLE statistics_meta (id INTEGER PRIMARY KEY, statistic_id VARCHAR(255));
+CREATE TABLE statistics (
+    metadata_id INTEGER, start_ts FLOAT,
+    min FLOAT, max FLOAT, mean FLOAT, state FLOAT, sum FLOAT
+);
+CREATE TABLE statistics_short_term (
+    metadata_id INTEGER, start_ts FLOAT,
+    min FLOAT, max FLOAT, mean FLOAT, state FLOAT, sum FLOAT
+);
+"""
+INDEXES = """
+CREATE INDEX ix_states_metadata_id_last_updated_ts
+    ON states (metadata_id, last_updated_ts);
+CREATE INDEX ix_states_last_updated_ts ON states (last_updated_ts);
+"""
+
+# The query get_last_activity ran before, for both code paths
+LEGACY_ALL = """
+SELECT sm.entity_id, MAX(s.last_changed_ts)
+FROM states s
+JOIN states_meta sm ON sm.metadata_id = s.metadata_id
+WHERE s.state NOT IN ('unavailable', 'unknown')
+GROUP BY sm.entity_id
+"""
+LEGACY_CHUNK = 500
+
+
+def generate(path: Path, rows: int, entities: int, seed: int) -> None:
+    """Write `rows` state rows over `entities` entities, oldest first."""
+    rng = random.Random(seed)
+    con = sqlite3.connect(path)
+    con.executescript(SCHEMA)
+    con.executemany(
+        "INSERT INTO states_meta (metadata_id, entity_id) VALUES (?, ?)",
+        ((n, f"sensor.bench_{n}") for n in range(1, entities + 1)),
+    )
+    # A tenth of the entities end in a run of unavailable/unknown rows
+    flaky = set(rng.sample(range(1, entities + 1), entities // 10))
+    start = time.time() - 10 * 86400
+    step = 10 * 86400 / rows
+    last_changed: dict[int, float] = {}
+
+    def _rows():
+        for n in range(rows):
+            metadata_id = rng.randint(1, entities)
+            ts = start + n * step
+            tail = n > rows * 0.95 and metadata_id in flaky
+            if tail or rng.random() < 0.03:
+                state = rng.choice(("unavailable", "unknown"))
+            else:
+                state = str(rng.randint(0, 20))
+            # Attribute-only updates keep the previous last_changed
+            if rng.random() < 0.3 and metadata_id in last_changed:
+                changed = last_changed[metadata_id]
+            else:
+                changed = last_changed[metadata_id] = ts
+            yield (state, changed, ts, metadata_id)
+
+    con.executemany(
+        "INSERT INTO states (state, last_changed_ts, last_updated_ts, metadata_id)"
+        " VALUES (?, ?, ?, ?)",
+        _rows(),
+    )
+    con.executescript(INDEXES)
+    con.execute("ANALYZE")
+    con.commit()
+    con.close()
+
+
+def legacy(session: Session, entity_ids: list[str] | None) -> dict[str, float]:
+    """Previous implementation: GROUP BY after the state filter."""
+    if not entity_ids:
+        rows = session.execute(text(LEGACY_ALL)).fetchall()
+        return {row[0]: float(row[1]) * 1000 for row in rows if row[1] is not None}
+    result: dict[str, float] = {}
+    for i in range(0, len(entity_ids), LEGACY_CHUNK):
+        chunk = entity_ids[i : i + LEGACY_CHUNK]
+        params = {f"e{j}": eid for j, eid in enumerate(chunk)}
+        in_clause = ", ".join(f":e{j}" for j in range(len(chunk)))
+        rows = session.execute(
+            text(
+                "SELECT sm.entity_id, MAX(s.last_changed_ts) FROM states s"
+                " JOIN states_meta sm ON sm.metadata_id = s.metadata_id"
+                " WHERE sm.entity_id IN (" + in_clause + ")"
+                " AND s.state NOT IN ('unavailable', 'unknown')"
+                " GROUP BY sm.entity_id"
+            ),
+            params,
+        ).fetchall()
+        result.update({row[0]: float(row[1]) * 1000 for row in rows})
+    return result
+
+
+def timed(label: str, func, *args) -> dict[str, float]:
+    began = time.perf_counter()
+    result = func(*args)
+    print(
+        f"  {label:<28} {time.perf_counter() - began:8.3f} s  ({len(result)} entities)"
+    )
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--entities", type=int, default=5000)
+    parser.add_argument("--db", type=Path, default=Path("bench_recorder.db"))
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    if not args.db.exists():
+        print(f"Generating {args.rows:,} rows for {args.entities:,} entities…")
+        began = time.perf_counter()
+        generate(args.db, args.rows, args.entities, args.seed)
+        print(f"  done in {time.perf_counter() - began:.1f} s")
+
+    engine = create_engine(f"sqlite:///{args.db}")
+    with Session(engine) as session:
+        count = session.execute(text("SELECT COUNT(*) FROM states")).scalar()
+        print(f"{count:,} state rows in {args.db}")
+        some = [f"sensor.bench_{n}" for n in range(1, args.entities + 1, 3)]
+        day_ago = time.time() - 86400
+        for label, entity_ids in (("all entities", None), ("a third", some)):
+            print(f"{label}:")
+            old = timed("GROUP BY (previous)", legacy, session, entity_ids)
+            new = timed("index seek", select_last_activity, session, entity_ids)
+            timed(
+                "index seek, last 24 h",
+                select_last_activity,
+                session,
+                entity_ids,
+                day_ago,
+            )
+            assert old == new, "results differ"
+
+
+if __name__ == "__main__":
+    main()
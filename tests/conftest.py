@@ -1,3 +1,40 @@
 """pytest configuration for entity_manager tests."""
 
+import json
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+
 pytest_plugins = ["pytest_homeassistant_custom_component"]
+
+
+@pytest.fixture
+def register_entity(hass: HomeAssistant) -> Callable[[str], er.RegistryEntry]:
+    """Return a helper that registers a test entity on the "test" platform."""
+    entity_reg = er.async_get(hass)
+
+    def _register(entity_id: str) -> er.RegistryEntry:
+        domain, obj = entity_id.split(".", 1)
+        return entity_reg.async_get_or_create(
+            domain=domain,
+            platform="test",
+            unique_id=f"uid_{obj}",
+            suggested_object_id=obj,
+        )
+
+    return _register
+
+
+@pytest.fixture
+def write_storage(tmp_path: Path) -> Callable[[str, dict], None]:
+    """Return a helper that writes a .storage file under tmp_path."""
+    storage = tmp_path / ".storage"
+
+    def _write(name: str, data: dict) -> None:
+        storage.mkdir(exist_ok=True)
+        (storage / name).write_text(json.dumps({"data": data}), encoding="utf-8")
+
+    return _write
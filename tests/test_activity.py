@@ -0,0 +1,376 @@
+"""Unit tests for the last-activity tracker and the activity summary."""
+
+import random
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import area_registry as ar
+from homeassistant.helpers import entity_registry as er
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from custom_components.entity_manager.activity import (
+    STORAGE_KEY,
+    async_setup_activity_tracker,
+    async_unload_activity_tracker,
+    select_activity_summary,
+    select_last_activity,
+)
+from custom_components.entity_manager.websocket_api import (
+    handle_get_activity_summary,
+    handle_get_last_activity,
+)
+
+QUERY = "custom_components.entity_manager.activity.query_last_activity"
+STATISTICS_COLUMNS = (
+    "metadata_id INTEGER, start_ts FLOAT, min FLOAT, max FLOAT, mean FLOAT,"
+    " state FLOAT, sum FLOAT"
+)
+
+
+def _create_statistics(session: Session) -> None:
+    session.execute(
+        text("CREATE TABLE statistics_meta (id INTEGER, statistic_id TEXT)")
+    )
+    for table in ("statistics", "statistics_short_term"):
+        session.execute(text(f"CREATE TABLE {table} ({STATISTICS_COLUMNS})"))
+
+
+def test_select_last_activity_seeks_latest_valid_row_then_statistics() -> None:
+    engine = create_engine("sqlite://")
+    with Session(engine) as session:
+        session.execute(
+            text("CREATE TABLE states_meta (metadata_id INTEGER, entity_id TEXT)")
+        )
+        session.execute(
+            text(
+                "CREATE TABLE states (state TEXT, last_changed_ts FLOAT,"
+                " last_updated_ts FLOAT, metadata_id INTEGER)"
+            )
+        )
+        _create_statistics(session)
+        session.execute(
+            text(
+                "INSERT INTO states_meta VALUES"
+                " (1, 'light.a'), (2, 'sensor.b'), (3, 'sensor.gone')"
+            )
+        )
+        session.execute(
+            text(
+                "INSERT INTO states VALUES"
+                # last_changed_ts is NULL when equal to last_updated_ts
+                " ('on', NULL, 10, 1), ('on', 10, 20, 1), ('unavailable', NULL, 30, 1),"
+                " ('5', NULL, 40, 2), ('unknown', NULL, 5, 3)"
+            )
+        )
+
+        # sensor.gone's valid rows were purged; statistics still know it
+        session.execute(
+            text(
+                "INSERT INTO statistics_meta VALUES"
+                " (1, 'sensor.gone'), (2, 'sensor.b'), (3, 'energy:import')"
+            )
+        )
+        session.execute(
+            text(
+                "INSERT INTO statistics VALUES (1, 3600, 1, 2, 1.5, NULL, NULL),"
+                " (1, 0, 1, 1, 1, NULL, NULL), (2, 7200, 5, 5, 5, NULL, NULL),"
+                " (3, 9, 1, 2, 1.5, NULL, NULL)"
+            )
+        )
+        session.execute(
+            text(
+                "INSERT INTO statistics_short_term VALUES"
+                " (1, 3900, 2, 3, 2.5, NULL, NULL)"
+            )
+        )
+
+        assert select_last_activity(session, None) == {
+            "light.a": 10000.0,
+            "sensor.b": 40000.0,
+            "sensor.gone": 3900000.0,
+        }
+        assert select_last_activity(session, ["sensor.b", "x.y"]) == {
+            "sensor.b": 40000.0
+        }
+        assert select_last_activity(session, None, since=3800) == {
+            "sensor.b": 7200000.0,
+            "sensor.gone": 3900000.0,
+        }
+        # Timestamps the caller already knows are never taken from statistics
+        assert select_last_activity(session, None, known={"sensor.gone"}) == {
+            "light.a": 10000.0,
+            "sensor.b": 40000.0,
+        }
+
+
+def test_select_last_activity_matches_group_by_query() -> None:
+    # Small-DB parity with the query the index seek replaced (see
+    # scripts/bench_last_activity.py); last_changed_ts is always set there
+    rng = random.Random(7)
+    engine = create_engine("sqlite://")
+    with Session(engine) as session:
+        session.execute(
+            text("CREATE TABLE states_meta (metadata_id INTEGER, entity_id TEXT)")
+        )
+        session.execute(
+            text(
+                "CREATE TABLE states (state TEXT, last_changed_ts FLOAT,"
+                " last_updated_ts FLOAT, metadata_id INTEGER)"
+            )
+        )
+        _create_statistics(session)
+        session.execute(
+            text("INSERT INTO states_meta VALUES (:m, :e)"),
+            [{"m": m, "e": f"sensor.s{m}"} for m in range(1, 41)],
+        )
+        last_changed: dict[int, float] = {}
+        rows = []
+        for n in range(2000):
+            metadata_id = rng.randint(1, 40)
+            if rng.random() < 0.1:
+                state = rng.choice(("unavailable", "unknown"))
+            else:
+                state = str(rng.randint(0, 5))
+            if rng.random() < 0.3 and metadata_id in last_changed:
+                changed = last_changed[metadata_id]
+            else:
+                changed = last_changed[metadata_id] = float(n)
+            rows.append({"s": state, "c": changed, "u": float(n), "m": metadata_id})
+        session.execute(text("INSERT INTO states VALUES (:s, :c, :u, :m)"), rows)
+
+        legacy = {
+            entity_id: float(ts) * 1000
+            for entity_id, ts in session.execute(
+                text(
+                    "SELECT sm.entity_id, MAX(s.last_changed_ts) FROM states s"
+                    " JOIN states_meta sm ON sm.metadata_id = s.metadata_id"
+                    " WHERE s.state NOT IN ('unavailable', 'unknown')"
+                    " GROUP BY sm.entity_id"
+                )
+            )
+        }
+        assert select_last_activity(session, None) == legacy
+        some = ["sensor.s3", "sensor.s17", "sensor.s40"]
+        assert select_last_activity(session, some) == {
+            entity_id: legacy[entity_id] for entity_id in some
+        }
+
+
+def test_statistics_fallback_skips_periods_where_nothing_moved() -> None:
+    engine = create_engine("sqlite://")
+    with Session(engine) as session:
+        session.execute(
+            text("CREATE TABLE states_meta (metadata_id INTEGER, entity_id TEXT)")
+        )
+        _create_statistics(session)
+        session.execute(
+            text(
+                "INSERT INTO statistics_meta VALUES"
+                " (1, 'sensor.temp'), (2, 'sensor.energy'), (3, 'sensor.flat')"
+            )
+        )
+        session.execute(
+            text(
+                "INSERT INTO statistics_short_term VALUES"
+                # Measurement: moves within 300, settles at 600, then constant
+                " (1, 300, 2, 3, 2.5, NULL, NULL), (1, 600, 3, 3, 3, NULL, NULL),"
+                " (1, 900, 3, 3, 3, NULL, NULL), (1, 1200, 3, 3, 3, NULL, NULL),"
+                # Total: grows in 300, then the same state and sum every period
+                " (2, 0, NULL, NULL, NULL, 10, 0), (2, 300, NULL, NULL, NULL, 12, 2),"
+                " (2, 600, NULL, NULL, NULL, 12, 2), (2, 900, NULL, NULL, NULL, 12, 2),"
+                # Never moved: only its first period counts
+                " (3, 0, 7, 7, 7, NULL, NULL), (3, 300, 7, 7, 7, NULL, NULL)"
+            )
+        )
+
+        assert select_last_activity(session, None) == {
+            "sensor.temp": 600000.0,
+            "sensor.energy": 300000.0,
+            "sensor.flat": 0.0,
+        }
+
+
+async def test_state_changes_update_the_map(hass: HomeAssistant) -> None:
+    with patch(QUERY, return_value={"sensor.old": 1000.0, "light.a": 1.0}):
+        tracker = await async_setup_activity_tracker(hass)
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+    hass.states.async_set("light.a", "on")
+    await hass.async_block_till_done()
+    changed = hass.states.get("light.a").last_changed_timestamp * 1000
+    hass.states.async_set("light.a", "unavailable")
+    hass.states.async_set("sensor.b", "unknown")
+    await hass.async_block_till_done()
+
+    assert await tracker.async_get(["light.a", "sensor.b", "sensor.old"]) == {
+        "light.a": changed,
+        "sensor.old": 1000.0,
+    }
+    await async_unload_activity_tracker(hass)
+
+
+async def test_renames_move_the_timestamp(hass: HomeAssistant) -> None:
+    entity_reg = er.async_get(hass)
+    entry = entity_reg.async_get_or_create(
+        "sensor", "test", "u1", suggested_object_id="old"
+    )
+    with patch(QUERY, return_value={"sensor.old": 1000.0}):
+        tracker = await async_setup_activity_tracker(hass)
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+    entity_reg.async_update_entity(entry.entity_id, new_entity_id="sensor.new")
+    await hass.async_block_till_done()
+    assert await tracker.async_get(None) == {"sensor.new": 1000.0}
+
+    entity_reg.async_remove("sensor.new")
+    await hass.async_block_till_done()
+    assert await tracker.async_get(None) == {}
+    await async_unload_activity_tracker(hass)
+
+
+async def test_map_is_saved_and_served(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    hass_storage[STORAGE_KEY] = {
+        "version": 1,
+        "data": {"last": {"sensor.purged": 5.0, "light.a": 9000.0}},
+    }
+    with patch(QUERY, return_value={"light.a": 2000.0}) as query:
+        await async_setup_activity_tracker(hass)
+        connection = MagicMock()
+        handle_get_last_activity(
+            hass,
+            connection,
+            {
+                "id": 1,
+                "type": "entity_manager/get_last_activity",
+                "entity_ids": ["light.a", "sensor.purged"],
+            },
+        )
+        await hass.async_block_till_done(wait_background_tasks=True)
+    # Only the startup seed touches the recorder; statistics can't override
+    # the saved timestamps
+    query.assert_called_once()
+    assert query.call_args[0][-1] == {"light.a", "sensor.purged"}
+    assert connection.send_result.call_args[0][1] == {
+        "light.a": 9000.0,
+        "sensor.purged": 5.0,
+    }
+
+    await async_unload_activity_tracker(hass)
+    assert hass_storage[STORAGE_KEY]["data"]["last"] == {
+        "sensor.purged": 5.0,
+        "light.a": 9000.0,
+    }
+
+
+async def test_seed_waits_for_the_recorder(hass: HomeAssistant) -> None:
+    ready = hass.loop.create_future()
+    recorder = MagicMock(async_db_ready=ready)
+    with (
+        patch("homeassistant.components.recorder.get_instance", return_value=recorder),
+        patch(QUERY, return_value={"light.a": 2000.0}) as query,
+    ):
+        tracker = await async_setup_activity_tracker(hass)
+        await hass.async_block_till_done()
+        query.assert_not_called()
+        # Lookups don't block while the recorder is still starting
+        assert await tracker.async_get(None) == {}
+
+        ready.set_result(True)
+        await hass.async_block_till_done(wait_background_tasks=True)
+    query.assert_called_once()
+    assert await tracker.async_get(None) == {"light.a": 2000.0}
+    await async_unload_activity_tracker(hass)
+
+
+def test_select_activity_summary_buckets_state_changes() -> None:
+    engine = create_engine("sqlite://")
+    with Session(engine) as session:
+        session.execute(
+            text("CREATE TABLE states_meta (metadata_id INTEGER, entity_id TEXT)")
+        )
+        session.execute(
+            text(
+                "CREATE TABLE states (state TEXT, last_changed_ts FLOAT,"
+                " last_updated_ts FLOAT, metadata_id INTEGER)"
+            )
+        )
+        session.execute(
+            text("INSERT INTO states_meta VALUES (1, 'light.a'), (2, 'sensor.b')")
+        )
+        session.execute(
+            text(
+                "INSERT INTO states VALUES"
+                " ('on', NULL, 5, 1), ('off', NULL, 15, 1), ('off', 15, 16, 1),"
+                " ('on', 35, 35, 1), ('1', NULL, 99, 2), ('2', NULL, 140, 2)"
+            )
+        )
+
+        # [10, 50) in 4 buckets; attribute-only updates (15 → 16) don't count
+        assert select_activity_summary(session, 10, 50, 4) == {
+            "light.a": {
+                "changes": 2,
+                "first_changed": 15000,
+                "last_changed": 35000,
+                "histogram": [1, 0, 1, 0],
+            }
+        }
+        # Rows land in the right bucket up to the end edge; entity_ids limits
+        # the entities resolved
+        assert select_activity_summary(session, 0, 140.0000001, 7, ["sensor.b"]) == {
+            "sensor.b": {
+                "changes": 2,
+                "first_changed": 99000,
+                "last_changed": 140000,
+                "histogram": [0, 0, 0, 0, 1, 0, 1],
+            }
+        }
+
+
+async def test_handle_get_activity_summary(hass: HomeAssistant) -> None:
+    kitchen = ar.async_get(hass).async_create("Kitchen")
+    entity_reg = er.async_get(hass)
+    entity_reg.async_get_or_create("light", "test", "a", suggested_object_id="a")
+    entity_reg.async_update_entity("light.a", area_id=kitchen.id)
+
+    def _row(changes: int, last: float) -> dict[str, Any]:
+        return {
+            "changes": changes,
+            "first_changed": 1000.0,
+            "last_changed": last,
+            "histogram": [changes, 0],
+        }
+
+    summary = {"light.a": _row(3, 2000.0), "sensor.b": _row(5, 1500.0)}
+    target = "custom_components.entity_manager.websocket_api.query_activity_summary"
+    connection = MagicMock()
+    with patch(target, return_value=summary):
+        handle_get_activity_summary(
+            hass,
+            connection,
+            {
+                "id": 1,
+                "type": "entity_manager/get_activity_summary",
+                "hours": 2,
+                "buckets": 2,
+                "sort_by": "changes",
+                "sort_desc": True,
+                "offset": 0,
+                "limit": 1,
+            },
+        )
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+    result = connection.send_result.call_args[0][1]
+    assert [row["entity_id"] for row in result["entities"]] == ["sensor.b"]
+    assert (result["total"], result["next_offset"]) == (2, 1)
+    assert result["total_changes"] == 8
+    assert result["histogram"] == [8, 0]
+    assert [(a["area_id"], a["name"], a["changes"]) for a in result["areas"]] == [
+        (None, None, 5),
+        (kitchen.id, "Kitchen", 3),
+    ]
+    assert result["end"] - result["start"] == 2 * 3600 * 1000
@@ -0,0 +1,106 @@
+"""Unit tests for the content-addressed backup store."""
+
+from pathlib import Path
+from unittest.mock import MagicMock
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.entity_manager.backups import BackupStore
+from custom_components.entity_manager.websocket_api import (
+    handle_backups_list,
+    handle_backups_restore,
+    handle_update_yaml_references,
+)
+
+
+def test_same_content_is_stored_once(tmp_path: Path) -> None:
+    store = BackupStore(tmp_path)
+    a, b = tmp_path / "a.yaml", tmp_path / "b.yaml"
+
+    first = store.add(a, "x: sensor.one\n", "test")
+    assert store.add(a, "x: sensor.one\n", "test") is None
+    store.add(b, "x: sensor.one\n", "test")
+    store.add(a, "x: sensor.two\n", "test")
+
+    assert [e["file"] for e in store.entries()] == ["a.yaml", "b.yaml", "a.yaml"]
+    assert len(list(store.directory.glob("*.gz"))) == 2
+    # A fresh store reads the same manifest back
+    reloaded = BackupStore(tmp_path)
+    assert reloaded.read(first["id"]) == (first, "x: sensor.one\n")
+
+
+def test_oldest_backups_are_evicted_over_the_cap(tmp_path: Path) -> None:
+    store = BackupStore(tmp_path, max_bytes=200)
+    target = tmp_path / "a.yaml"
+    ids = [
+        store.add(target, f"{n}: {'z' * 40}{n}\n" * 20, "test")["id"] for n in range(10)
+    ]
+
+    kept = [entry["id"] for entry in store.entries()]
+    assert kept[0] == ids[-1]
+    assert len(kept) < len(ids)
+    assert store.stored_bytes() <= 200 or len(kept) == 1
+    assert len(list(store.directory.glob("*.gz"))) == len(kept)
+
+
+async def test_rewrite_backs_up_then_restore(
+    hass: HomeAssistant, tmp_path: Path
+) -> None:
+    hass.config.config_dir = str(tmp_path)
+    config = tmp_path / "configuration.yaml"
+    config.write_text("x: sensor.old\n", encoding="utf-8")
+    conn = MagicMock()
+
+    handle_update_yaml_references(
+        hass,
+        conn,
+        {
+            "id": 1,
+            "type": "entity_manager/update_yaml_references",
+            "old_entity_id": "sensor.old",
+            "new_entity_id": "sensor.new",
+            "dry_run": False,
+        },
+    )
+    await hass.async_block_till_done(wait_background_tasks=True)
+    assert config.read_text(encoding="utf-8") == "x: sensor.new\n"
+    assert not list(tmp_path.glob("*.em-bak"))
+
+    handle_backups_list(hass, conn, {"id": 2, "type": "entity_manager/backups/list"})
+    await hass.async_block_till_done(wait_background_tasks=True)
+    listing = conn.send_result.call_args[0][1]
+    assert [b["file"] for b in listing["backups"]] == ["configuration.yaml"]
+    backup_id = listing["backups"][0]["id"]
+
+    handle_backups_restore(
+        hass,
+        conn,
+        {
+            "id": 3,
+            "type": "entity_manager/backups/restore",
+            "backup_id": backup_id,
+            "dry_run": False,
+        },
+    )
+    await hass.async_block_till_done(wait_background_tasks=True)
+    assert conn.send_result.call_args[0][1]["success"] is True
+    assert config.read_text(encoding="utf-8") == "x: sensor.old\n"
+
+    # The overwritten content was backed up first
+    handle_backups_list(hass, conn, {"id": 4, "type": "entity_manager/backups/list"})
+    await hass.async_block_till_done(wait_background_tasks=True)
+    reasons = [b["reason"] for b in conn.send_result.call_args[0][1]["backups"]]
+    assert reasons == ["restore", "update_yaml_references"]
+
+    handle_backups_restore(
+        hass,
+        conn,
+        {
+            "id": 5,
+            "type": "entity_manager/backups/restore",
+            "backup_id": "missing",
+            "dry_run": True,
+        },
+    )
+    await hass.async_block_till_done(wait_background_tasks=True)
+    assert conn.send_error.call_args[0][1] == "not_found"
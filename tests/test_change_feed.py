@@ -0,0 +1,91 @@
+"""Unit tests for the config directory change feed."""
+
+import os
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.entity_manager.change_feed import (
+    async_get_change_feed,
+    is_relevant,
+)
+from custom_components.entity_manager.websocket_api import handle_list_hacs_items
+from custom_components.entity_manager.yaml_index import YamlReferenceIndex
+
+
+def test_is_relevant_filters_churn() -> None:
+    assert is_relevant("automations.yaml")
+    assert is_relevant(".storage/hacs.data")
+    assert not is_relevant(".storage/core.entity_registry")
+    assert not is_relevant("home-assistant_v2.db-wal")
+    assert not is_relevant("home-assistant.log")
+    assert not is_relevant("deps/lib/x.py")
+
+
+async def test_polling_reports_changes_since_token(
+    hass: HomeAssistant, tmp_path: Path
+) -> None:
+    hass.config.config_dir = str(tmp_path)
+    target = tmp_path / "a.yaml"
+    target.write_text("a: 1\n", encoding="utf-8")
+    feed = async_get_change_feed(hass)
+
+    token, changed = await feed.async_changes_since(None)
+    assert changed is None
+    feed.async_watch({"a.yaml": (target.stat().st_mtime_ns, 5)})
+    token, changed = await feed.async_changes_since(token)
+    assert changed == set()
+
+    target.write_text("a: 22\n", encoding="utf-8")
+    token, changed = await feed.async_changes_since(token)
+    assert changed == {"a.yaml"}
+    assert (await feed.async_changes_since(token))[1] == set()
+
+    # Tokens from another feed instance are unknown
+    assert (await feed.async_changes_since("other:3"))[1] is None
+
+
+async def test_index_skips_disk_when_nothing_changed(
+    hass: HomeAssistant, tmp_path: Path
+) -> None:
+    hass.config.config_dir = str(tmp_path)
+    path = tmp_path / "a.yaml"
+    path.write_text("x: sensor.one\n", encoding="utf-8")
+    index = YamlReferenceIndex(hass)
+    await index.async_refresh()
+
+    with patch("custom_components.entity_manager.yaml_index.refresh_files") as refresh:
+        await index.async_refresh()
+    refresh.assert_not_called()
+
+    path.write_text("x: sensor.two\n", encoding="utf-8")
+    os.utime(path, ns=(1, 1))
+    await index.async_refresh()
+    assert index.async_file_counts("sensor.two") == [("a.yaml", 1)]
+
+
+async def test_hacs_listing_reuses_scan_until_change(
+    hass: HomeAssistant, tmp_path: Path
+) -> None:
+    hass.config.config_dir = str(tmp_path)
+    (tmp_path / "custom_components" / "alpha").mkdir(parents=True)
+
+    async def _list() -> dict:
+        conn = MagicMock()
+        handle_list_hacs_items(
+            hass, conn, {"id": 1, "type": "entity_manager/list_hacs_items"}
+        )
+        await hass.async_block_till_done(wait_background_tasks=True)
+        return conn.send_result.call_args[0][1]
+
+    assert [i["name"] for i in (await _list())["integrations"]] == ["alpha"]
+    with patch.object(Path, "iterdir", side_effect=AssertionError):
+        # Nothing changed: served from the cached scan without listing dirs
+        assert [i["name"] for i in (await _list())["integrations"]] == ["alpha"]
+
+    (tmp_path / "custom_components" / "beta").mkdir()
+    assert [i["name"] for i in (await _list())["integrations"]] == [
+        "alpha",
+        "beta",
+    ]
@@ -0,0 +1,173 @@
+"""Unit tests for the dashboard usage index."""
+
+import re
+from collections.abc import Callable
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.entity_manager.dashboard_index import (
+    DashboardIndex,
+    rewrite_config,
+    scan_dashboard_config,
+    scan_dashboard_file,
+)
+from custom_components.entity_manager.websocket_api import handle_get_dashboard_usage
+
+
+def test_scan_dashboard_config_walks_nested_cards() -> None:
+    config = {
+        "views": [
+            {
+                "path": "home",
+                "cards": [
+                    {
+                        "type": "vertical-stack",
+                        "cards": [{"type": "tile", "entity": "light.kitchen"}],
+                    },
+                    {
+                        "type": "conditional",
+                        "card": {"type": "picture-elements", "elements": [{}]},
+                    },
+                ],
+            },
+            {
+                "type": "sections",
+                "sections": [
+                    {"cards": [{"type": "markdown", "content": "{{ sensor.x }}"}]}
+                ],
+            },
+        ]
+    }
+    result = scan_dashboard_config(config)
+    assert result["card_types"] == [
+        "conditional",
+        "markdown",
+        "picture-elements",
+        "tile",
+        "vertical-stack",
+    ]
+    assert [(v["view"], v["cards"], v["entities"]) for v in result["views"]] == [
+        ("home", 5, ["light.kitchen"]),
+        (1, 1, ["sensor.x"]),
+    ]
+    assert result["views"][0]["card_types"] == {
+        "vertical-stack": 1,
+        "tile": 1,
+        "conditional": 1,
+        "picture-elements": 1,
+    }
+
+
+def test_rewrite_config_copies_only_changed_branches() -> None:
+    config = {
+        "views": [
+            {"cards": [{"entity": "light.old"}], "title": "A"},
+            {"cards": [{"entity": "light.keep"}]},
+        ],
+        "light.old": {"content": "{{ states('light.old') }} light.older"},
+    }
+    pattern = re.compile(r"(?<![a-zA-Z0-9_\.])(?:light\.old)(?![a-zA-Z0-9_])")
+
+    new, count = rewrite_config(config, pattern, {"light.old": "light.new"})
+
+    assert count == 3
+    assert new["views"][0]["cards"][0]["entity"] == "light.new"
+    assert new["light.new"] == {"content": "{{ states('light.new') }} light.older"}
+    assert new["views"][1] is config["views"][1]
+    assert config["views"][0]["cards"][0]["entity"] == "light.old"
+
+
+async def test_handle_get_dashboard_usage(
+    hass: HomeAssistant, tmp_path: Path, write_storage: Callable[[str, dict], None]
+) -> None:
+    hass.config.config_dir = str(tmp_path)
+    write_storage(
+        "lovelace",
+        {"config": {"views": [{"cards": [{"type": "tile", "entity": "light.a"}]}]}},
+    )
+    write_storage(
+        "lovelace.energy_x",
+        {"config": {"views": [{"cards": [{"type": "tile", "entity": "gone.b"}]}]}},
+    )
+    write_storage(
+        "lovelace_dashboards",
+        {"items": [{"id": "energy_x", "url_path": "energy-x", "title": "Energy"}]},
+    )
+    (tmp_path / "wall.yaml").write_text(
+        "views:\n  - cards:\n      - type: entities\n        entities:\n"
+        "          - sensor.c\n          - light.a\n",
+        encoding="utf-8",
+    )
+    hass.data["lovelace"] = {
+        "dashboards": {
+            "wall-yaml": SimpleNamespace(
+                path=str(tmp_path / "wall.yaml"), config={"title": "Wall"}
+            ),
+            "energy-x": SimpleNamespace(config={"title": "Energy"}),
+        }
+    }
+    for entity_id in ("light.a", "sensor.c", "switch.d"):
+        hass.states.async_set(entity_id, "on")
+    connection = MagicMock()
+
+    handle_get_dashboard_usage(
+        hass, connection, {"id": 1, "type": "entity_manager/get_dashboard_usage"}
+    )
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    result = connection.send_result.call_args[0][1]
+    assert result["used"] == ["light.a", "sensor.c"]
+    assert result["unused"] == ["switch.d"]
+    assert result["card_types"] == ["entities", "tile"]
+    assert result["card_type_counts"] == {"tile": 2, "entities": 1}
+    assert result["locations"] == {
+        "light.a": ["Wall › View 1", "Overview › View 1"],
+        "sensor.c": ["Wall › View 1"],
+    }
+    assert {row["url_path"]: row for row in result["dashboards"]} == {
+        "wall-yaml": {
+            "url_path": "wall-yaml",
+            "title": "Wall",
+            "mode": "yaml",
+            "views": 1,
+            "cards": 1,
+            "entities": 2,
+        },
+        None: {
+            "url_path": None,
+            "title": "Overview",
+            "mode": "storage",
+            "views": 1,
+            "cards": 1,
+            "entities": 1,
+        },
+        "energy-x": {
+            "url_path": "energy-x",
+            "title": "Energy",
+            "mode": "storage",
+            "views": 1,
+            "cards": 1,
+            "entities": 0,
+        },
+    }
+
+
+async def test_unchanged_files_are_not_parsed_again(
+    hass: HomeAssistant, tmp_path: Path, write_storage: Callable[[str, dict], None]
+) -> None:
+    hass.config.config_dir = str(tmp_path)
+    write_storage("lovelace", {"config": {"views": [{"cards": []}]}})
+    index = DashboardIndex(hass)
+    await index.async_dashboards()
+
+    target = "custom_components.entity_manager.dashboard_index.scan_dashboard_file"
+    with patch(target, wraps=scan_dashboard_file) as scan:
+        await index.async_dashboards()
+        scan.assert_not_called()
+        write_storage("lovelace", {"config": {"views": [{"cards": [], "title": "T"}]}})
+        dashboards = await index.async_dashboards()
+    scan.assert_called_once()
+    assert dashboards[0]["views"][0]["view_title"] == "T"
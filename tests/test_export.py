@@ -0,0 +1,150 @@
+"""Unit tests for the file-backed gzip export."""
+
+import gzip
+import hashlib
+import json
+from collections.abc import Callable
+from http import HTTPStatus
+from unittest.mock import AsyncMock, MagicMock
+
+from aiohttp import web
+from aiohttp.test_utils import make_mocked_request
+from homeassistant.components.http import KEY_HASS, KEY_HASS_USER
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+from homeassistant.setup import async_setup_component
+
+from custom_components.entity_manager.export import (
+    EXPORT_URL,
+    EntityExportView,
+    async_get_export_cache,
+)
+from custom_components.entity_manager.registry_index import (
+    async_setup_registry_index,
+)
+from custom_components.entity_manager.websocket_api import handle_export_states
+
+
+async def test_export_file_reused_until_registry_changes(
+    hass: HomeAssistant, register_entity: Callable[[str], er.RegistryEntry]
+) -> None:
+    register_entity("sensor.exp_b")
+    register_entity("sensor.exp_a")
+    async_setup_registry_index(hass)
+    cache = async_get_export_cache(hass)
+
+    path = (await cache.async_get_file("ndjson", False)).path
+    rows = [
+        json.loads(line) for line in gzip.decompress(path.read_bytes()).splitlines()
+    ]
+    assert [r["entity_id"] for r in rows] == ["sensor.exp_a", "sensor.exp_b"]
+    mtime = path.stat().st_mtime_ns
+
+    await cache.async_get_file("ndjson", False)
+    assert path.stat().st_mtime_ns == mtime
+
+    register_entity("sensor.exp_c")
+    await hass.async_block_till_done()
+    path = (await cache.async_get_file("ndjson", False)).path
+    assert len(gzip.decompress(path.read_bytes()).splitlines()) == 3
+
+
+async def test_export_json_with_names(
+    hass: HomeAssistant, register_entity: Callable[[str], er.RegistryEntry]
+) -> None:
+    register_entity("sensor.exp_named")
+
+    path = (await async_get_export_cache(hass).async_get_file("json", True)).path
+    rows = json.loads(gzip.decompress(path.read_bytes()))
+    assert rows[0]["entity_id"] == "sensor.exp_named"
+    assert {"device_name", "area_name", "labels"} <= rows[0].keys()
+
+
+def _request(hass: HomeAssistant, query: str, headers: dict | None = None):
+    """Return a mocked admin request for the export view and its body writer."""
+    app = web.Application()
+    app[KEY_HASS] = hass
+    writer = MagicMock(
+        write=AsyncMock(), write_headers=AsyncMock(), write_eof=AsyncMock()
+    )
+    request = make_mocked_request(
+        "GET",
+        f"{EXPORT_URL}?{query}",
+        headers=headers,
+        app=app,
+        writer=writer,
+    )
+    request[KEY_HASS_USER] = MagicMock(is_admin=True)
+    return request, writer
+
+
+async def test_export_view_streams_gzip_with_etag(
+    hass: HomeAssistant, register_entity: Callable[[str], er.RegistryEntry]
+) -> None:
+    register_entity("sensor.exp_http")
+    async_setup_registry_index(hass)
+    view = EntityExportView()
+
+    request, writer = _request(hass, "format=ndjson")
+    resp = await view.get(request)
+    assert resp.status == HTTPStatus.OK
+    assert "entity_manager_export.ndjson.gz" in resp.headers["Content-Disposition"]
+    body = b"".join(call.args[0] for call in writer.write.call_args_list)
+    assert resp.content_length == len(body)
+    row = json.loads(gzip.decompress(body).splitlines()[0])
+    assert row["entity_id"] == "sensor.exp_http"
+
+    etag = resp.headers["ETag"]
+    request, _ = _request(hass, "format=ndjson", {"If-None-Match": etag})
+    resp = await view.get(request)
+    assert resp.status == HTTPStatus.NOT_MODIFIED
+
+    request, _ = _request(hass, "format=xml")
+    resp = await view.get(request)
+    assert resp.status == HTTPStatus.BAD_REQUEST
+
+
+async def test_open_handle_survives_regeneration(
+    hass: HomeAssistant, register_entity: Callable[[str], er.RegistryEntry]
+) -> None:
+    register_entity("sensor.exp_old")
+    async_setup_registry_index(hass)
+    cache = async_get_export_cache(hass)
+
+    export, handle = await cache.async_open("ndjson", False)
+    register_entity("sensor.exp_new")
+    await hass.async_block_till_done()
+    regenerated = await cache.async_get_file("ndjson", False)
+    assert regenerated.etag != export.etag
+
+    with handle:
+        body = handle.read()
+    assert len(body) == export.size
+    assert f'"{hashlib.sha1(body, usedforsecurity=False).hexdigest()}"' == export.etag
+
+
+async def test_ws_export_download_returns_signed_url(
+    hass: HomeAssistant, register_entity: Callable[[str], er.RegistryEntry]
+) -> None:
+    register_entity("sensor.exp_ws")
+    assert await async_setup_component(hass, "http", {})
+    conn = MagicMock()
+    conn.refresh_token_id = None
+
+    handle_export_states(
+        hass,
+        conn,
+        {
+            "id": 1,
+            "type": "entity_manager/export_states",
+            "format": "ndjson",
+            "download": True,
+            "names": False,
+        },
+    )
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    result = conn.send_result.call_args[0][1]
+    assert result["url"].startswith(f"{EXPORT_URL}?format=ndjson")
+    assert "authSig=" in result["url"]
+    assert result["bytes"] > 0
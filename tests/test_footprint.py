@@ -0,0 +1,139 @@
+"""Unit tests for the recorder footprint analyzer."""
+
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from custom_components.entity_manager.footprint import (
+    STATES_ROW_BYTES,
+    STATISTICS_ROW_BYTES,
+    select_footprint,
+)
+from custom_components.entity_manager.websocket_api import (
+    handle_jobs_start,
+    handle_jobs_status,
+)
+
+_SCHEMA = (
+    "CREATE TABLE states_meta (metadata_id INTEGER, entity_id TEXT)",
+    (
+        "CREATE TABLE states (state TEXT, last_updated_ts FLOAT,"
+        " metadata_id INTEGER, attributes_id INTEGER)"
+    ),
+    "CREATE TABLE state_attributes (attributes_id INTEGER, shared_attrs TEXT)",
+    "CREATE TABLE statistics_meta (id INTEGER, statistic_id TEXT)",
+    "CREATE TABLE statistics (metadata_id INTEGER)",
+    "CREATE TABLE statistics_short_term (metadata_id INTEGER)",
+)
+
+
+def _make_db(path: Path) -> str:
+    url = f"sqlite:///{path / 'recorder.db'}"
+    with Session(create_engine(url)) as session:
+        for statement in _SCHEMA:
+            session.execute(text(statement))
+        session.execute(
+            text(
+                "INSERT INTO states_meta VALUES"
+                " (1, 'sensor.noisy'), (2, 'sensor.power'), (3, 'light.a')"
+            )
+        )
+        # sensor.noisy: 100 rows over one day, two distinct attribute sets
+        session.execute(
+            text("INSERT INTO states VALUES (:s, :ts, 1, :a)"),
+            [{"s": "12.5", "ts": n * 864, "a": 1 + n % 2} for n in range(100)],
+        )
+        session.execute(
+            text("INSERT INTO states VALUES ('100', 0, 2, 3), ('on', 0, 3, 3)")
+        )
+        session.execute(
+            text(
+                "INSERT INTO state_attributes VALUES"
+                " (1, '{\"a\": 1}'), (2, '{\"a\": 2}'), (3, '{}')"
+            )
+        )
+        session.execute(
+            text(
+                "INSERT INTO statistics_meta VALUES"
+                " (1, 'sensor.power'), (2, 'energy:external')"
+            )
+        )
+        session.execute(text("INSERT INTO statistics VALUES (1), (1), (2)"))
+        session.execute(text("INSERT INTO statistics_short_term VALUES (1)"))
+        session.commit()
+    return url
+
+
+def test_select_footprint_counts_rows_and_bytes(tmp_path: Path) -> None:
+    with Session(create_engine(_make_db(tmp_path))) as session:
+        footprint = select_footprint(session)
+
+    assert footprint["sensor.noisy"] == {
+        "states": 100,
+        "state_bytes": 100 * (STATES_ROW_BYTES + 4),
+        "attributes": 2,
+        "attribute_bytes": 16,
+        "statistics": 0,
+        "statistics_bytes": 0,
+        "oldest": 0,
+    }
+    assert footprint["sensor.power"]["statistics"] == 3
+    assert footprint["sensor.power"]["statistics_bytes"] == 3 * STATISTICS_ROW_BYTES
+    assert "energy:external" not in footprint
+
+
+async def test_recorder_footprint_job_ranks_and_suggests(
+    hass: HomeAssistant, tmp_path: Path
+) -> None:
+    entity_reg = er.async_get(hass)
+    entity_reg.async_get_or_create(
+        "sensor", "noisy_platform", "n1", suggested_object_id="noisy"
+    )
+    url = _make_db(tmp_path)
+
+    def _query(hass: HomeAssistant, job):
+        with Session(create_engine(url)) as session:
+            return select_footprint(session, job)
+
+    conn = MagicMock()
+    target = "custom_components.entity_manager.footprint.query_recorder_footprint"
+    with patch(target, side_effect=_query):
+        handle_jobs_start(
+            hass,
+            conn,
+            {
+                "id": 1,
+                "type": "entity_manager/jobs/start",
+                "kind": "recorder_footprint",
+                "params": {"top": 2, "min_share": 0.02},
+            },
+        )
+        job_id = conn.send_result.call_args[0][1]["job_id"]
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+    handle_jobs_status(
+        hass, conn, {"id": 2, "type": "entity_manager/jobs/status", "job_id": job_id}
+    )
+    status = conn.send_result.call_args[0][1]
+    assert status["status"] == "done"
+    assert status["processed"] == status["total"] == 4
+    report = status["result"]
+    assert [row["entity_id"] for row in report["entities"]] == [
+        "sensor.noisy",
+        "sensor.power",
+    ]
+    assert report["totals"]["entities"] == 3
+    assert report["integrations"][0]["platform"] == "noisy_platform"
+    assert [s["entity_id"] for s in report["suggestions"]["entities"]] == [
+        "sensor.noisy",
+        "sensor.power",
+    ]
+    # sensor.power has long-term statistics, so it is not in the exclude list
+    assert report["suggestions"]["exclude"] == {"entities": ["sensor.noisy"]}
+    assert report["suggestions"]["yaml"] == (
+        "recorder:\n  exclude:\n    entities:\n      - sensor.noisy\n"
+    )
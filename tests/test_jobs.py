@@ -0,0 +1,118 @@
+"""Unit tests for the background job engine and the jobs/* commands."""
+
+import asyncio
+from collections.abc import Callable
+from unittest.mock import MagicMock
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+
+from custom_components.entity_manager.jobs import JobManager, async_get_job_manager
+from custom_components.entity_manager.websocket_api import (
+    handle_jobs_cancel,
+    handle_jobs_start,
+    handle_jobs_status,
+    handle_jobs_subscribe,
+)
+
+
+async def test_job_runs_in_background_and_reports_result(
+    hass: HomeAssistant, register_entity: Callable[[str], er.RegistryEntry]
+) -> None:
+    entity_reg = er.async_get(hass)
+    register_entity("sensor.job_a")
+    register_entity("sensor.job_b")
+    conn = MagicMock()
+
+    handle_jobs_start(
+        hass,
+        conn,
+        {
+            "id": 1,
+            "type": "entity_manager/jobs/start",
+            "kind": "bulk_disable",
+            "params": {"entity_ids": ["sensor.job_a", "sensor.job_b"]},
+        },
+    )
+    job_id = conn.send_result.call_args[0][1]["job_id"]
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    conn = MagicMock()
+    handle_jobs_status(
+        hass, conn, {"id": 2, "type": "entity_manager/jobs/status", "job_id": job_id}
+    )
+    status = conn.send_result.call_args[0][1]
+    assert status["status"] == "done"
+    assert status["processed"] == status["total"] == 2
+    assert status["result"]["success"] == ["sensor.job_a", "sensor.job_b"]
+    assert entity_reg.async_get("sensor.job_a").disabled_by is not None
+
+
+async def test_job_start_rejects_invalid_params(hass: HomeAssistant) -> None:
+    conn = MagicMock()
+    handle_jobs_start(
+        hass,
+        conn,
+        {
+            "id": 1,
+            "type": "entity_manager/jobs/start",
+            "kind": "bulk_enable",
+            "params": {},
+        },
+    )
+    assert conn.send_error.call_args[0][1] == "invalid_params"
+    assert not async_get_job_manager(hass).async_jobs()
+
+
+async def test_job_concurrency_is_bounded(hass: HomeAssistant) -> None:
+    manager = JobManager(hass, max_concurrent=1)
+    release = asyncio.Event()
+
+    async def _runner(hass, job, params):
+        await release.wait()
+        return params["n"]
+
+    first = manager.async_start("test", {"n": 1}, _runner)
+    second = manager.async_start("test", {"n": 2}, _runner)
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    assert (first.status, second.status) == ("running", "queued")
+
+    release.set()
+    await hass.async_block_till_done(wait_background_tasks=True)
+    assert (first.result, second.result) == (1, 2)
+    assert second.status == "done"
+
+
+async def test_job_cancel_and_subscribe(hass: HomeAssistant) -> None:
+    manager = async_get_job_manager(hass)
+
+    async def _runner(hass, job, params):
+        job.set_total(10)
+        await asyncio.Event().wait()
+
+    job = manager.async_start("test", {}, _runner)
+    sub = MagicMock()
+    handle_jobs_subscribe(
+        hass, sub, {"id": 5, "type": "entity_manager/jobs/subscribe", "job_id": job.id}
+    )
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+
+    conn = MagicMock()
+    handle_jobs_cancel(
+        hass, conn, {"id": 6, "type": "entity_manager/jobs/cancel", "job_id": job.id}
+    )
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    events = [call[0][0]["event"] for call in sub.send_message.call_args_list]
+    assert events[0]["status"] == "running"
+    assert events[-1]["status"] == "cancelled"
+    assert "result" in events[-1]
+    assert any(e["total"] == 10 for e in events)
+
+    conn = MagicMock()
+    handle_jobs_cancel(
+        hass, conn, {"id": 7, "type": "entity_manager/jobs/cancel", "job_id": "nope"}
+    )
+    assert conn.send_error.call_args[0][1] == "not_found"
@@ -0,0 +1,199 @@
+"""Unit tests for the server-side undo/redo journal."""
+
+from collections.abc import Callable
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+
+from custom_components.entity_manager.journal import (
+    STORAGE_KEY,
+    async_setup_journal,
+)
+from custom_components.entity_manager.websocket_api import (
+    _bulk_toggle,
+    handle_disable_entity,
+    handle_enable_entity,
+    handle_journal_list,
+    handle_journal_redo,
+    handle_journal_undo,
+    handle_rename_entity,
+)
+
+
+def _call(handler, hass: HomeAssistant, msg_type: str) -> MagicMock:
+    conn = MagicMock()
+    handler(hass, conn, {"id": 1, "type": msg_type})
+    return conn
+
+
+async def test_undo_redo_batches(
+    hass: HomeAssistant, register_entity: Callable[[str], er.RegistryEntry]
+) -> None:
+    entity_reg = er.async_get(hass)
+    register_entity("sensor.jr_a")
+    register_entity("sensor.jr_b")
+    await async_setup_journal(hass)
+
+    _bulk_toggle(hass, ["sensor.jr_a", "sensor.jr_b"], "disable")
+    handle_rename_entity(
+        hass,
+        MagicMock(),
+        {
+            "id": 2,
+            "type": "entity_manager/rename_entity",
+            "old_entity_id": "sensor.jr_a",
+            "new_entity_id": "sensor.jr_renamed",
+        },
+    )
+    await hass.async_block_till_done()
+
+    listed = _call(handle_journal_list, hass, "entity_manager/journal/list")
+    undo = listed.send_result.call_args[0][1]["undo"]
+    assert [(e["kind"], e["count"]) for e in undo] == [
+        ("rename", 1),
+        ("bulk_disable", 2),
+    ]
+
+    # Undo the rename, then the whole bulk disable in one step
+    _call(handle_journal_undo, hass, "entity_manager/journal/undo")
+    assert entity_reg.async_get("sensor.jr_a") is not None
+    conn = _call(handle_journal_undo, hass, "entity_manager/journal/undo")
+    assert conn.send_result.call_args[0][1]["entry"]["kind"] == "bulk_disable"
+    assert not entity_reg.async_get("sensor.jr_a").disabled_by
+    assert not entity_reg.async_get("sensor.jr_b").disabled_by
+
+    conn = _call(handle_journal_undo, hass, "entity_manager/journal/undo")
+    assert conn.send_error.call_args[0][1] == "empty"
+
+    _call(handle_journal_redo, hass, "entity_manager/journal/redo")
+    assert entity_reg.async_get("sensor.jr_b").disabled_by is not None
+
+
+async def test_undo_conflict_leaves_registry_untouched(
+    hass: HomeAssistant, register_entity: Callable[[str], er.RegistryEntry]
+) -> None:
+    entity_reg = er.async_get(hass)
+    register_entity("sensor.jr_c")
+    register_entity("sensor.jr_d")
+    await async_setup_journal(hass)
+
+    _bulk_toggle(hass, ["sensor.jr_c", "sensor.jr_d"], "disable")
+    entity_reg.async_remove("sensor.jr_d")
+
+    conn = _call(handle_journal_undo, hass, "entity_manager/journal/undo")
+    assert conn.send_error.call_args[0][1] == "conflict"
+    assert entity_reg.async_get("sensor.jr_c").disabled_by is not None
+
+
+async def test_undo_conflicts_with_later_manual_edits(
+    hass: HomeAssistant, register_entity: Callable[[str], er.RegistryEntry]
+) -> None:
+    entity_reg = er.async_get(hass)
+    register_entity("sensor.jr_e")
+    register_entity("sensor.jr_f")
+    await async_setup_journal(hass)
+
+    _bulk_toggle(hass, ["sensor.jr_e", "sensor.jr_f"], "disable")
+    # Re-disabled by an integration after the entry was recorded
+    entity_reg.async_update_entity(
+        "sensor.jr_f", disabled_by=er.RegistryEntryDisabler.INTEGRATION
+    )
+
+    conn = _call(handle_journal_undo, hass, "entity_manager/journal/undo")
+    assert conn.send_error.call_args[0][1] == "conflict"
+    assert "sensor.jr_f disabled_by" in conn.send_error.call_args[0][2]
+    assert entity_reg.async_get("sensor.jr_e").disabled_by is not None
+    assert entity_reg.async_get("sensor.jr_f").disabled_by == "integration"
+
+
+async def test_failed_write_rolls_back_the_entry(
+    hass: HomeAssistant, register_entity: Callable[[str], er.RegistryEntry]
+) -> None:
+    entity_reg = er.async_get(hass)
+    register_entity("sensor.jr_g")
+    register_entity("sensor.jr_h")
+    journal = await async_setup_journal(hass)
+    _bulk_toggle(hass, ["sensor.jr_g", "sensor.jr_h"], "disable")
+
+    update = entity_reg.async_update_entity
+    calls = 0
+
+    def _flaky_update(entity_id: str, **kwargs: Any) -> er.RegistryEntry:
+        nonlocal calls
+        calls += 1
+        if calls == 2:
+            raise ValueError("registry write failed")
+        return update(entity_id, **kwargs)
+
+    with patch.object(entity_reg, "async_update_entity", _flaky_update):
+        conn = _call(handle_journal_undo, hass, "entity_manager/journal/undo")
+    assert conn.send_error.call_args[0][1] == "undo_failed"
+    # The first undone entity was put back; the entry is still undoable
+    assert entity_reg.async_get("sensor.jr_g").disabled_by is not None
+    assert entity_reg.async_get("sensor.jr_h").disabled_by is not None
+    assert [entry["kind"] for entry in journal.async_list()["undo"]] == ["bulk_disable"]
+
+
+async def test_panel_undo_is_not_journaled(
+    hass: HomeAssistant, register_entity: Callable[[str], er.RegistryEntry]
+) -> None:
+    register_entity("sensor.jr_p")
+    journal = await async_setup_journal(hass)
+    _bulk_toggle(hass, ["sensor.jr_p"], "disable")
+    handle_journal_undo(hass, MagicMock(), {"id": 1})
+    await hass.async_block_till_done()
+
+    # The panel replaying its own undo with journal: false keeps the server
+    # redo stack and adds no entry
+    handle_disable_entity(
+        hass,
+        MagicMock(),
+        {
+            "id": 2,
+            "type": "entity_manager/disable_entity",
+            "entity_id": "sensor.jr_p",
+            "journal": False,
+        },
+    )
+    handle_enable_entity(
+        hass,
+        MagicMock(),
+        {
+            "id": 3,
+            "type": "entity_manager/enable_entity",
+            "entity_id": "sensor.jr_p",
+            "journal": False,
+        },
+    )
+    await hass.async_block_till_done()
+
+    listed = journal.async_list()
+    assert listed["undo"] == []
+    assert [entry["kind"] for entry in listed["redo"]] == ["bulk_disable"]
+
+
+async def test_journal_is_bounded_and_persisted(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    hass_storage[STORAGE_KEY] = {
+        "version": 1,
+        "key": STORAGE_KEY,
+        "data": {
+            "undo": [{"id": 1, "ts": 0, "kind": "enable", "changes": []}],
+            "redo": [],
+            "next_id": 2,
+        },
+    }
+    journal = await async_setup_journal(hass)
+    assert journal.async_list()["undo"][0]["id"] == 1
+
+    with patch("custom_components.entity_manager.journal.MAX_JOURNAL_ENTRIES", 3):
+        for n in range(5):
+            journal.async_record(
+                "display_name",
+                [{"entity_id": "a.b", "field": "name", "old": n, "new": n}],
+            )
+    ids = [entry["id"] for entry in journal.async_list()["undo"]]
+    assert ids == [6, 5, 4]
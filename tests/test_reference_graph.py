@@ -0,0 +1,187 @@
+"""Unit tests for the reverse entity reference graph."""
+
+import logging
+from collections.abc import Callable
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+from homeassistant.config import async_hass_config_yaml
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+from homeassistant.setup import async_setup_component
+
+from custom_components.entity_manager.dashboard_index import config_entity_ids
+from custom_components.entity_manager.reference_graph import ReferenceGraph
+from custom_components.entity_manager.websocket_api import handle_get_references
+
+
+def test_config_entity_ids_finds_keys_values_and_templates() -> None:
+    config = {
+        "type": "entities",
+        "entities": ["light.kitchen", {"entity": "sensor.temp"}],
+        "content": "{{ states('sensor.humidity') }}",
+        "card_mod": {"style": "ha-card { color: red; }"},
+    }
+    assert config_entity_ids(config) == {
+        "light.kitchen",
+        "sensor.temp",
+        "sensor.humidity",
+    }
+
+
+async def test_dashboards(
+    hass: HomeAssistant, tmp_path: Path, write_storage: Callable[[str, dict], None]
+) -> None:
+    hass.config.config_dir = str(tmp_path)
+    write_storage(
+        "lovelace",
+        {"config": {"views": [{"title": "Home", "cards": ["light.kitchen"]}]}},
+    )
+    write_storage(
+        "lovelace.energy_x",
+        {"config": {"views": [{"path": "p", "badges": ["light.kitchen"]}]}},
+    )
+    write_storage(
+        "lovelace_dashboards",
+        {"items": [{"id": "energy_x", "url_path": "energy-x", "title": "Energy"}]},
+    )
+    hass.states.async_set("light.kitchen", "on")
+
+    graph = ReferenceGraph(hass)
+    refs = (await graph.async_get(["light.kitchen"], include_yaml=False))[
+        "light.kitchen"
+    ]
+    assert sorted(refs["dashboards"], key=lambda row: row["title"]) == [
+        {"dashboard": "energy-x", "title": "Energy", "view": "p", "view_title": None},
+        {"dashboard": None, "title": "Overview", "view": 0, "view_title": "Home"},
+    ]
+    assert refs["automations"] == refs["scripts"] == refs["templates"] == []
+    assert "yaml" not in refs
+
+
+TEMPLATE_YAML = """
+template:
+  - sensor:
+      - name: Kitchen on
+        state: "{{ is_state('light.kitchen', 'on') }}"
+      - name: Hall
+        state: "{{ is_state('light.kitchen', 'on') }}"
+        attributes:
+          connected_entities: light.hall
+  - unique_id: outside
+    trigger:
+      - platform: state
+        entity_id: binary_sensor.door
+    sensor:
+      - name: Outside
+        unique_id: temp
+        state: "{{ states('sensor.outside') }}"
+sensor:
+  - platform: template
+    sensors:
+      porch:
+        value_template: "{{ states('light.hall') }}"
+"""
+
+
+async def test_templates_from_template_entities(
+    hass: HomeAssistant, tmp_path: Path
+) -> None:
+    hass.config.config_dir = str(tmp_path)
+    (tmp_path / "configuration.yaml").write_text(TEMPLATE_YAML, encoding="utf-8")
+    for entity_id in ("light.kitchen", "light.hall", "binary_sensor.door"):
+        hass.states.async_set(entity_id, "on")
+    hass.states.async_set("sensor.outside", "12")
+    config = await async_hass_config_yaml(hass)
+    assert await async_setup_component(hass, "template", config)
+    assert await async_setup_component(hass, "sensor", config)
+    await hass.async_block_till_done()
+
+    refs = await ReferenceGraph(hass).async_get(
+        ["light.kitchen", "light.hall", "sensor.outside", "binary_sensor.door"],
+        include_yaml=False,
+    )
+    # A connected_entities attribute wins over the definition's templates
+    assert refs["light.kitchen"]["templates"] == [
+        {"entity_id": "sensor.kitchen_on", "name": "Kitchen on"}
+    ]
+    assert sorted(row["entity_id"] for row in refs["light.hall"]["templates"]) == [
+        "sensor.hall",
+        "sensor.porch",
+    ]
+    # Trigger-based entities match on their composed unique_id, and the
+    # block's trigger counts as a reference
+    outside = [{"entity_id": "sensor.outside_2", "name": "Outside"}]
+    assert refs["sensor.outside"]["templates"] == outside
+    assert refs["binary_sensor.door"]["templates"] == outside
+
+
+async def test_templates_without_a_definition_are_logged(
+    hass: HomeAssistant, tmp_path: Path, caplog: pytest.LogCaptureFixture
+) -> None:
+    hass.config.config_dir = str(tmp_path)
+    hass.states.async_set("light.kitchen", "on")
+    assert await async_setup_component(
+        hass,
+        "template",
+        {"template": {"sensor": {"name": "Ghost", "state": "{{ 1 }}"}}},
+    )
+    await hass.async_block_till_done()
+
+    with caplog.at_level(logging.DEBUG, "custom_components.entity_manager"):
+        refs = await ReferenceGraph(hass).async_get(
+            ["light.kitchen"], include_yaml=False
+        )
+    assert refs["light.kitchen"]["templates"] == []
+    assert "no template definition for sensor.ghost" in caplog.text
+
+
+async def test_rebuilds_only_after_invalidation(
+    hass: HomeAssistant, tmp_path: Path, write_storage: Callable[[str, dict], None]
+) -> None:
+    hass.config.config_dir = str(tmp_path)
+    write_storage("lovelace", {"config": {"views": [{"cards": []}]}})
+    hass.states.async_set("light.kitchen", "on")
+    graph = ReferenceGraph(hass)
+    graph.async_start()
+    try:
+        await graph.async_get(["light.kitchen"], include_yaml=False)
+        write_storage("lovelace", {"config": {"views": [{"cards": ["light.kitchen"]}]}})
+        refs = await graph.async_get(["light.kitchen"], include_yaml=False)
+        assert refs["light.kitchen"]["dashboards"] == []
+
+        hass.bus.async_fire("lovelace_updated", {"url_path": None})
+        await hass.async_block_till_done()
+        refs = await graph.async_get(["light.kitchen"], include_yaml=False)
+        assert len(refs["light.kitchen"]["dashboards"]) == 1
+    finally:
+        graph.async_stop()
+
+
+async def test_handle_get_references_includes_yaml(
+    hass: HomeAssistant, tmp_path: Path
+) -> None:
+    hass.config.config_dir = str(tmp_path)
+    (tmp_path / "automations.yaml").write_text(
+        "- trigger:\n    entity_id: sensor.temp\n", encoding="utf-8"
+    )
+    er.async_get(hass).async_get_or_create("sensor", "test", "temp")
+    connection = MagicMock()
+
+    handle_get_references(
+        hass,
+        connection,
+        {
+            "id": 1,
+            "type": "entity_manager/get_references",
+            "entity_ids": ["sensor.temp"],
+            "include_yaml": True,
+        },
+    )
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    connection.send_result.assert_called_once()
+    refs = connection.send_result.call_args[0][1]["references"]["sensor.temp"]
+    assert refs["yaml"] == [{"file": "automations.yaml", "line": 2, "count": 1}]
+    assert refs["dashboards"] == []
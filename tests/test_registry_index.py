@@ -0,0 +1,76 @@
+"""Unit tests for the in-memory registry index."""
+
+from collections.abc import Callable
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+
+from custom_components.entity_manager.registry_index import (
+    RegistryIndex,
+    async_get_registry_index,
+)
+
+
+async def test_index_built_from_registry(
+    hass: HomeAssistant, register_entity: Callable[[str], er.RegistryEntry]
+) -> None:
+    register_entity("sensor.idx_a")
+    register_entity("light.idx_b")
+
+    index = async_get_registry_index(hass)
+
+    ids = {e.entity_id for e in index.async_query({"domain": {"light"}})}
+    assert ids == {"light.idx_b"}
+    assert index.async_group_totals("test")["total_entities"] == 2
+
+
+async def test_index_follows_registry_events(
+    hass: HomeAssistant, register_entity: Callable[[str], er.RegistryEntry]
+) -> None:
+    """Disable, rename and remove events keep the index current."""
+    entity_reg = er.async_get(hass)
+    register_entity("sensor.idx_live")
+    index = RegistryIndex(hass)
+    index.async_start()
+    try:
+        entity_reg.async_update_entity(
+            "sensor.idx_live", disabled_by=er.RegistryEntryDisabler.USER
+        )
+        await hass.async_block_till_done()
+        disabled = index.async_query(state="disabled")
+        assert [e.entity_id for e in disabled] == ["sensor.idx_live"]
+        assert index.async_group_totals("test")["disabled_entities"] == 1
+
+        entity_reg.async_update_entity(
+            "sensor.idx_live", new_entity_id="sensor.idx_renamed"
+        )
+        await hass.async_block_till_done()
+        assert index.async_get("sensor.idx_live") is None
+        assert index.async_get("sensor.idx_renamed") is not None
+
+        entity_reg.async_remove("sensor.idx_renamed")
+        await hass.async_block_till_done()
+        assert len(index) == 0
+        assert index.async_platforms() == []
+    finally:
+        index.async_stop()
+
+
+async def test_index_query_intersects_filters(
+    hass: HomeAssistant, register_entity: Callable[[str], er.RegistryEntry]
+) -> None:
+    entity_reg = er.async_get(hass)
+    register_entity("sensor.idx_x")
+    register_entity("sensor.idx_y")
+    entity_reg.async_update_entity(
+        "sensor.idx_y", disabled_by=er.RegistryEntryDisabler.USER
+    )
+
+    index = async_get_registry_index(hass)
+
+    enabled = index.async_query({"domain": {"sensor"}}, state="enabled")
+    assert [e.entity_id for e in enabled] == ["sensor.idx_x"]
+    none_device = index.async_query(
+        {"device_id": {"no_device"}, "disabled_by": {"user"}}
+    )
+    assert [e.entity_id for e in none_device] == ["sensor.idx_y"]
@@ -0,0 +1,137 @@
+"""Unit tests for the YAML template definition index."""
+
+from pathlib import Path
+from unittest.mock import MagicMock
+
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import async_mock_service
+
+from custom_components.entity_manager.backups import async_get_backup_store
+from custom_components.entity_manager.template_index import (
+    parse_template_definitions,
+)
+from custom_components.entity_manager.websocket_api import (
+    handle_list_yaml_templates,
+    handle_register_all_templates,
+    handle_register_template,
+)
+
+CONFIG = """\
+template:
+  - sensor:
+      - name: "Outdoor Temp"
+        state: >
+          {{ states('sensor.x') }}
+          name: not a key
+      - name: Has Id
+        unique_id: abc
+        state: "{{ 1 }}"
+    binary_sensor:
+    - name: Door open
+      state: "{{ true }}"
+sensor:
+  - platform: template
+    sensors:
+      power_total:
+        friendly_name: "Power total"
+        value_template: "{{ 1 }}"
+  - platform: mqtt
+    name: Not a template
+"""
+
+
+def test_parse_template_definitions() -> None:
+    rows = parse_template_definitions(CONFIG)
+
+    assert [(r["domain"], r["object_id"], r["style"]) for r in rows] == [
+        ("sensor", "outdoor_temp", "template"),
+        ("sensor", "has_id", "template"),
+        ("binary_sensor", "door_open", "template"),
+        ("sensor", "power_total", "legacy"),
+    ]
+    assert [r["has_unique_id"] for r in rows] == [False, True, False, False]
+    assert rows[0]["anchor"] == 3
+    assert rows[3]["name"] == "Power total"
+    assert rows[3]["indent"] == 8
+
+
+def test_included_template_file_is_recognised() -> None:
+    rows = parse_template_definitions("- sensor:\n    - name: Inc\n      state: 1\n")
+    assert [(r["domain"], r["name"], r["anchor"]) for r in rows] == [
+        ("sensor", "Inc", 2)
+    ]
+
+
+def test_quoted_hash_is_not_a_comment() -> None:
+    rows = parse_template_definitions(
+        'template:\n  - sensor:\n      - name: "Room #1 Temp"  # upstairs\n'
+        "        state: 1\n"
+    )
+    assert [(r["name"], r["object_id"]) for r in rows] == [
+        ("Room #1 Temp", "room_1_temp")
+    ]
+
+
+async def test_list_and_register_all_templates(
+    hass: HomeAssistant, tmp_path: Path
+) -> None:
+    hass.config.config_dir = str(tmp_path)
+    config = tmp_path / "configuration.yaml"
+    config.write_text(CONFIG, encoding="utf-8")
+
+    conn = MagicMock()
+    handle_list_yaml_templates(
+        hass, conn, {"id": 1, "type": "entity_manager/list_yaml_templates"}
+    )
+    await hass.async_block_till_done(wait_background_tasks=True)
+    listed = conn.send_result.call_args[0][1]
+    assert [t["entity_id"] for t in listed["templates"]] == [
+        "sensor.outdoor_temp",
+        "binary_sensor.door_open",
+        "sensor.power_total",
+    ]
+
+    reloads = async_mock_service(hass, "template", "reload")
+    conn = MagicMock()
+    handle_register_all_templates(
+        hass, conn, {"id": 2, "type": "entity_manager/register_all_templates"}
+    )
+    await hass.async_block_till_done(wait_background_tasks=True)
+    result = conn.send_result.call_args[0][1]
+    assert len(result["registered"]) == 3
+    assert result["errors"] == []
+    assert len(reloads) == 1
+
+    rows = parse_template_definitions(config.read_text(encoding="utf-8"))
+    assert all(r["has_unique_id"] for r in rows)
+    backups = async_get_backup_store(hass).entries("configuration.yaml")
+    assert [b["reason"] for b in backups] == ["register_template"]
+    assert async_get_backup_store(hass).read(backups[0]["id"])[1] == CONFIG
+
+
+async def test_register_template_uses_index(
+    hass: HomeAssistant, tmp_path: Path
+) -> None:
+    hass.config.config_dir = str(tmp_path)
+    config = tmp_path / "configuration.yaml"
+    config.write_text(CONFIG, encoding="utf-8")
+    hass.states.async_set("sensor.power_total", "1", {"friendly_name": "Power total"})
+
+    async_mock_service(hass, "template", "reload")
+    conn = MagicMock()
+    handle_register_template(
+        hass,
+        conn,
+        {
+            "id": 3,
+            "type": "entity_manager/register_template",
+            "entity_id": "sensor.power_total",
+        },
+    )
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    result = conn.send_result.call_args[0][1]
+    assert result["success"] is True
+    lines = config.read_text(encoding="utf-8").split("\n")
+    assert lines[15] == "      power_total:"
+    assert lines[16] == f"        unique_id: {result['unique_id']}"
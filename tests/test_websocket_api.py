@@ -1,18 +1,27 @@
 """Unit tests for websocket_api.py core functions."""
 
 from pathlib import Path
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 import pytest
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers import entity_registry as er
+from pytest_homeassistant_custom_component.common import async_capture_events
 
+from custom_components.entity_manager.journal import (
+    async_get_journal,
+    async_setup_journal,
+)
 from custom_components.entity_manager.websocket_api import (
+    _async_bulk_toggle,
+    _async_import_entity_states,
+    _async_send_chunked,
     _bulk_toggle,
     disable_entity,
     enable_entity,
     handle_bulk_disable,
     handle_bulk_enable,
+    handle_bulk_rename,
     handle_disable_entity,
     handle_enable_entity,
     handle_export_states,
@@ -21,9 +30,14 @@ from custom_components.entity_manager.websocket_api import (
     handle_get_disabled_entities,
     handle_get_entity_details,
     handle_get_template_sensors,
+    handle_import_add_chunk,
+    handle_import_apply,
+    handle_import_begin,
     handle_import_entity_states,
+    handle_import_plan,
     handle_remove_entity,
     handle_rename_entity,
+    handle_subscribe_entities,
     handle_update_entity_display_name,
     handle_update_yaml_references,
 )
@@ -61,6 +75,11 @@ def _mock_conn() -> MagicMock:
     return MagicMock()
 
 
+def _events(conn: MagicMock) -> list[dict]:
+    """Return the event payloads sent on a mocked subscription connection."""
+    return [call[0][0]["event"] for call in conn.send_message.call_args_list]
+
+
 # ---------------------------------------------------------------------------
 # enable_entity / disable_entity  (pure-Python helpers, no WS layer)
 # ---------------------------------------------------------------------------
@@ -136,6 +155,25 @@ async def test_bulk_toggle_disable_all_success(hass: HomeAssistant) -> None:
     assert result["failed"] == []
 
 
+async def test_bulk_toggle_skips_noop_writes(hass: HomeAssistant) -> None:
+    """Entities already in the requested state succeed without a registry event."""
+    entity_reg = er.async_get(hass)
+    _register(entity_reg, "sensor.bulk_noop", disabled=True)
+    _register(entity_reg, "sensor.bulk_change")
+    await hass.async_block_till_done()
+    events = async_capture_events(hass, er.EVENT_ENTITY_REGISTRY_UPDATED)
+
+    result = _bulk_toggle(
+        hass,
+        ["sensor.bulk_noop", "sensor.bulk_change", "sensor.bulk_change"],
+        "disable",
+    )
+    await hass.async_block_till_done()
+
+    assert result["success"] == ["sensor.bulk_noop", "sensor.bulk_change"]
+    assert [e.data["entity_id"] for e in events] == ["sensor.bulk_change"]
+
+
 # ---------------------------------------------------------------------------
 # handle_enable_entity  (WebSocket handler)
 # ---------------------------------------------------------------------------
@@ -242,6 +280,46 @@ async def test_ws_bulk_disable_partial(hass: HomeAssistant) -> None:
     assert "sensor.bd_missing" in failed_ids
 
 
+async def test_bulk_toggle_applies_every_batch(hass: HomeAssistant) -> None:
+    """Background bulk toggles larger than one write batch are applied in full."""
+    entity_reg = er.async_get(hass)
+    entity_ids = [f"sensor.big_{i}" for i in range(1200)]
+    for entity_id in entity_ids:
+        _register(entity_reg, entity_id)
+
+    result = await _async_bulk_toggle(hass, entity_ids, "disable")
+
+    assert len(result["success"]) == 1200
+    assert result["failed"] == []
+    assert all(entity_reg.async_get(e).disabled_by for e in entity_ids)
+
+
+async def test_ws_bulk_disable_marks_integration_disabled_as_user(
+    hass: HomeAssistant,
+) -> None:
+    entity_reg = er.async_get(hass)
+    entry = _register(entity_reg, "sensor.bd_integration")
+    entity_reg.async_update_entity(
+        entry.entity_id, disabled_by=er.RegistryEntryDisabler.INTEGRATION
+    )
+    conn = _mock_conn()
+    msg = {
+        "id": 91,
+        "type": "entity_manager/bulk_disable",
+        "entity_ids": [entry.entity_id],
+    }
+
+    handle_bulk_disable(hass, conn, msg)
+    await hass.async_block_till_done()
+
+    assert conn.send_result.call_args[0][1]["success"] == [entry.entity_id]
+    # A later integration re-enable must not turn it back on
+    assert (
+        entity_reg.async_get(entry.entity_id).disabled_by
+        == er.RegistryEntryDisabler.USER
+    )
+
+
 # ---------------------------------------------------------------------------
 # handle_get_disabled_entities  (WebSocket handler)
 # ---------------------------------------------------------------------------
@@ -291,6 +369,173 @@ async def test_ws_get_all(hass: HomeAssistant) -> None:
     assert "sensor.ga_enabled" in all_entity_ids
 
 
+async def test_ws_get_paged_with_totals(hass: HomeAssistant) -> None:
+    """limit/offset return one sorted page plus totals for every matching group."""
+    entity_reg = er.async_get(hass)
+    _register(entity_reg, "sensor.pg_c")
+    _register(entity_reg, "sensor.pg_a", disabled=True)
+    _register(entity_reg, "sensor.pg_b")
+    conn = _mock_conn()
+    msg = {
+        "id": 70,
+        "type": "entity_manager/get_disabled_entities",
+        "state": "all",
+        "search": "pg_",
+        "sort_desc": False,
+        "offset": 0,
+        "limit": 2,
+    }
+
+    handle_get_disabled_entities(hass, conn, msg)
+    await hass.async_block_till_done()
+
+    result = conn.send_result.call_args[0][1]
+    page_ids = [
+        e["entity_id"]
+        for integ in result["integrations"]
+        for device in integ["devices"].values()
+        for e in device["entities"]
+    ]
+    assert page_ids == ["sensor.pg_a", "sensor.pg_b"]
+    assert result["total"] == 3
+    assert result["next_offset"] == 2
+    totals = {t["integration"]: t for t in result["totals"]}
+    assert totals["test"]["matching_entities"] == 3
+    assert totals["test"]["disabled_entities"] == 1
+
+
+async def test_ws_get_paged_last_page(hass: HomeAssistant) -> None:
+    """The final page reports next_offset=None."""
+    entity_reg = er.async_get(hass)
+    _register(entity_reg, "sensor.lp_a")
+    _register(entity_reg, "sensor.lp_b")
+    conn = _mock_conn()
+    msg = {
+        "id": 71,
+        "type": "entity_manager/get_disabled_entities",
+        "state": "all",
+        "search": "lp_",
+        "sort_desc": False,
+        "offset": 1,
+        "limit": 5,
+    }
+
+    handle_get_disabled_entities(hass, conn, msg)
+    await hass.async_block_till_done()
+
+    result = conn.send_result.call_args[0][1]
+    assert result["total"] == 2
+    assert result["next_offset"] is None
+
+
+async def test_ws_get_filters_domain_and_disabled_by(hass: HomeAssistant) -> None:
+    """Server-side filters narrow the legacy tree response too."""
+    entity_reg = er.async_get(hass)
+    _register(entity_reg, "sensor.flt_disabled", disabled=True)
+    _register(entity_reg, "sensor.flt_enabled")
+    _register(entity_reg, "light.flt_disabled", disabled=True)
+    conn = _mock_conn()
+    msg = {
+        "id": 72,
+        "type": "entity_manager/get_disabled_entities",
+        "state": "all",
+        "domain": ["sensor"],
+        "disabled_by": ["user"],
+        "sort_desc": False,
+        "offset": 0,
+    }
+
+    handle_get_disabled_entities(hass, conn, msg)
+    await hass.async_block_till_done()
+
+    integrations = conn.send_result.call_args[0][1]
+    all_entity_ids = [
+        e["entity_id"]
+        for integ in integrations
+        for device in integ["devices"].values()
+        for e in device["entities"]
+    ]
+    assert all_entity_ids == ["sensor.flt_disabled"]
+
+
+async def test_ws_get_columnar_with_totals(hass: HomeAssistant) -> None:
+    entity_reg = er.async_get(hass)
+    _register(entity_reg, "sensor.gc_a", disabled=True)
+    _register(entity_reg, "sensor.gc_b", disabled=True)
+    conn = _mock_conn()
+    msg = {
+        "id": 73,
+        "type": "entity_manager/get_disabled_entities",
+        "state": "disabled",
+        "sort_desc": False,
+        "offset": 0,
+        "format": "columnar",
+    }
+
+    handle_get_disabled_entities(hass, conn, msg)
+    await hass.async_block_till_done()
+
+    result = conn.send_result.call_args[0][1]
+    assert result["columns"]["entity_id"] == ["sensor.gc_a", "sensor.gc_b"]
+    assert result["total"] == 2
+    assert result["totals"][0]["disabled_entities"] == 2
+
+
+# ---------------------------------------------------------------------------
+# handle_subscribe_entities  (WebSocket subscription)
+# ---------------------------------------------------------------------------
+
+
+async def test_ws_subscribe_snapshot_then_deltas(hass: HomeAssistant) -> None:
+    entity_reg = er.async_get(hass)
+    _register(entity_reg, "sensor.sub_a")
+    conn = _mock_conn()
+    conn.subscriptions = {}
+    msg = {"id": 80, "type": "entity_manager/subscribe_entities", "state": "all"}
+
+    handle_subscribe_entities(hass, conn, msg)
+
+    conn.send_result.assert_called_once_with(80)
+    snapshot = _events(conn)[0]
+    assert snapshot["type"] == "snapshot"
+    assert snapshot["integrations"][0]["integration"] == "test"
+
+    # Two changes in one loop iteration coalesce into one delta
+    entity_reg.async_update_entity(
+        "sensor.sub_a", disabled_by=er.RegistryEntryDisabler.USER
+    )
+    _register(entity_reg, "sensor.sub_b")
+    await hass.async_block_till_done()
+
+    delta = _events(conn)[1]
+    assert delta["type"] == "delta"
+    assert [r["entity_id"] for r in delta["updated"]] == ["sensor.sub_a"]
+    assert [r["entity_id"] for r in delta["added"]] == ["sensor.sub_b"]
+    assert delta["totals"]["test"]["disabled_entities"] == 1
+
+    entity_reg.async_remove("sensor.sub_b")
+    await hass.async_block_till_done()
+    assert _events(conn)[2]["removed"] == ["sensor.sub_b"]
+
+    conn.subscriptions[80]()
+
+
+async def test_ws_subscribe_state_filter_removes_on_enable(hass: HomeAssistant) -> None:
+    """An entity leaving the subscribed state is reported as removed."""
+    entity_reg = er.async_get(hass)
+    _register(entity_reg, "sensor.sub_dis", disabled=True)
+    conn = _mock_conn()
+    conn.subscriptions = {}
+    msg = {"id": 81, "type": "entity_manager/subscribe_entities", "state": "disabled"}
+
+    handle_subscribe_entities(hass, conn, msg)
+    entity_reg.async_update_entity("sensor.sub_dis", disabled_by=None)
+    await hass.async_block_till_done()
+
+    assert _events(conn)[-1]["removed"] == ["sensor.sub_dis"]
+    conn.subscriptions[81]()
+
+
 # ---------------------------------------------------------------------------
 # handle_rename_entity  (WebSocket handler)
 # ---------------------------------------------------------------------------
@@ -373,6 +618,188 @@ async def test_ws_rename_already_exists(hass: HomeAssistant) -> None:
     assert conn.send_error.call_args[0][1] == "rename_failed"
 
 
+class _StorageDashboard:
+    """Stand-in for a lovelace storage dashboard."""
+
+    mode = "storage"
+
+    def __init__(self, config: dict) -> None:
+        self.config = {"title": "Wall"}
+        self.stored = config
+        self.saves = 0
+
+    async def async_load(self, force: bool) -> dict:
+        return self.stored
+
+    async def async_save(self, config: dict) -> None:
+        self.stored = config
+        self.saves += 1
+
+
+async def test_ws_rename_updates_storage_dashboards(hass: HomeAssistant) -> None:
+    entity_reg = er.async_get(hass)
+    _register(entity_reg, "sensor.rename_dash")
+    wall = _StorageDashboard(
+        {
+            "views": [
+                {"cards": [{"entity": "sensor.rename_dash"}, "sensor.rename_dash_2"]}
+            ]
+        }
+    )
+    other = _StorageDashboard({"views": [{"cards": [{"entity": "light.x"}]}]})
+    hass.data["lovelace"] = {"dashboards": {"wall": wall, "other": other}}
+    conn = _mock_conn()
+    msg = {
+        "id": 12,
+        "type": "entity_manager/rename_entity",
+        "old_entity_id": "sensor.rename_dash",
+        "new_entity_id": "sensor.rename_dash_new",
+        "update_dashboards": True,
+    }
+
+    handle_rename_entity(hass, conn, msg)
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    result = conn.send_result.call_args[0][1]
+    assert result["dashboards"]["dashboards_updated"] == [
+        {"dashboard": "wall", "title": "Wall", "replacements": 1}
+    ]
+    # Whole-token match: the longer sensor.rename_dash_2 is left alone
+    assert wall.stored == {
+        "views": [
+            {"cards": [{"entity": "sensor.rename_dash_new"}, "sensor.rename_dash_2"]}
+        ]
+    }
+    assert wall.saves == 1
+    assert other.saves == 0
+
+
+# ---------------------------------------------------------------------------
+# handle_bulk_rename  (WebSocket handler)
+# ---------------------------------------------------------------------------
+
+
+async def test_ws_bulk_rename_registry_and_yaml(
+    hass: HomeAssistant, tmp_path: Path
+) -> None:
+    """A mapping renames every entity and rewrites YAML in one pass."""
+    hass.config.config_dir = str(tmp_path)
+    entity_reg = er.async_get(hass)
+    _register(entity_reg, "sensor.br_a")
+    _register(entity_reg, "sensor.br_a_b")
+    yaml_file = tmp_path / "automations.yaml"
+    yaml_file.write_text(
+        "- entity_id: [sensor.br_a, sensor.br_a_b]\n  x: binary_sensor.br_a\n",
+        encoding="utf-8",
+    )
+
+    conn = _mock_conn()
+    msg = {
+        "id": 40,
+        "type": "entity_manager/bulk_rename",
+        "renames": {"sensor.br_a": "sensor.br_x", "sensor.br_a_b": "sensor.br_y"},
+    }
+    handle_bulk_rename(hass, conn, msg)
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    result = conn.send_result.call_args[0][1]
+    assert result["errors"] == []
+    assert result["yaml"]["total_replacements"] == 2
+    assert entity_reg.async_get("sensor.br_x") is not None
+    assert entity_reg.async_get("sensor.br_y") is not None
+    assert yaml_file.read_text(encoding="utf-8") == (
+        "- entity_id: [sensor.br_x, sensor.br_y]\n  x: binary_sensor.br_a\n"
+    )
+
+
+async def test_ws_bulk_rename_collision_rejects_batch(hass: HomeAssistant) -> None:
+    """Any invalid rename blocks the batch; a dry run lists the errors."""
+    entity_reg = er.async_get(hass)
+    _register(entity_reg, "sensor.br_src")
+    _register(entity_reg, "sensor.br_taken")
+    _register(entity_reg, "sensor.br_ok")
+    renames = {
+        "sensor.br_src": "sensor.br_taken",
+        "sensor.br_ok": "sensor.br_ok_new",
+        "sensor.br_missing": "sensor.br_other",
+    }
+
+    conn = _mock_conn()
+    msg = {"id": 41, "type": "entity_manager/bulk_rename", "renames": renames}
+    handle_bulk_rename(hass, conn, {**msg, "update_yaml": False})
+    await hass.async_block_till_done()
+    assert conn.send_error.call_args[0][1] == "rename_failed"
+    assert entity_reg.async_get("sensor.br_ok") is not None
+
+    conn = _mock_conn()
+    handle_bulk_rename(hass, conn, {**msg, "update_yaml": False, "dry_run": True})
+    await hass.async_block_till_done()
+    result = conn.send_result.call_args[0][1]
+    assert result["renames"] == [{"old": "sensor.br_ok", "new": "sensor.br_ok_new"}]
+    assert sorted(e["entity_id"] for e in result["errors"]) == [
+        "sensor.br_missing",
+        "sensor.br_src",
+    ]
+
+
+async def test_ws_bulk_rename_reports_and_journals_partial_pass(
+    hass: HomeAssistant,
+) -> None:
+    """A registry failure mid-pass reports and journals the renames applied."""
+    entity_reg = er.async_get(hass)
+    _register(entity_reg, "sensor.br_p1")
+    _register(entity_reg, "sensor.br_p2")
+    await async_setup_journal(hass)
+    update = entity_reg.async_update_entity
+
+    def _update(entity_id: str, **kwargs) -> er.RegistryEntry:
+        if entity_id == "sensor.br_p2":
+            raise ValueError("registry busy")
+        return update(entity_id, **kwargs)
+
+    conn = _mock_conn()
+    msg = {
+        "id": 43,
+        "type": "entity_manager/bulk_rename",
+        "renames": {"sensor.br_p1": "sensor.br_q1", "sensor.br_p2": "sensor.br_q2"},
+        "update_yaml": False,
+    }
+    with patch.object(entity_reg, "async_update_entity", _update):
+        handle_bulk_rename(hass, conn, msg)
+        await hass.async_block_till_done()
+
+    code, message = conn.send_error.call_args[0][1:]
+    assert code == "rename_failed"
+    assert "Renamed 1 of 2 entities before sensor.br_p2 failed" in message
+    assert "sensor.br_p1 → sensor.br_q1" in message
+    entry = async_get_journal(hass).async_list()["undo"][0]
+    assert (entry["kind"], entry["count"]) == ("bulk_rename", 1)
+
+
+async def test_ws_bulk_rename_rule(hass: HomeAssistant) -> None:
+    """A regex rule expands to renames over the registry."""
+    entity_reg = er.async_get(hass)
+    _register(entity_reg, "sensor.old_temp")
+    _register(entity_reg, "sensor.old_humidity")
+    _register(entity_reg, "sensor.kept")
+
+    conn = _mock_conn()
+    msg = {
+        "id": 42,
+        "type": "entity_manager/bulk_rename",
+        "rule": {"find": r"^sensor\.old_", "replace": "sensor.new_"},
+        "update_yaml": False,
+    }
+    handle_bulk_rename(hass, conn, msg)
+    await hass.async_block_till_done()
+
+    result = conn.send_result.call_args[0][1]
+    assert len(result["renames"]) == 2
+    assert entity_reg.async_get("sensor.new_temp") is not None
+    assert entity_reg.async_get("sensor.new_humidity") is not None
+    assert entity_reg.async_get("sensor.kept") is not None
+
+
 # ---------------------------------------------------------------------------
 # handle_update_entity_display_name  (WebSocket handler)
 # ---------------------------------------------------------------------------
@@ -658,7 +1085,7 @@ async def test_ws_update_yaml_dry_run(hass: HomeAssistant, tmp_path: Path) -> No
     }
 
     handle_update_yaml_references(hass, conn, msg)
-    await hass.async_block_till_done()
+    await hass.async_block_till_done(wait_background_tasks=True)
 
     conn.send_result.assert_called_once()
     result = conn.send_result.call_args[0][1]
@@ -693,7 +1120,7 @@ async def test_ws_update_yaml_applies_replacements(
     }
 
     handle_update_yaml_references(hass, conn, msg)
-    await hass.async_block_till_done()
+    await hass.async_block_till_done(wait_background_tasks=True)
 
     result = conn.send_result.call_args[0][1]
     assert result["total_replacements"] == 2
@@ -719,7 +1146,7 @@ async def test_ws_update_yaml_no_matches(hass: HomeAssistant, tmp_path: Path) ->
     }
 
     handle_update_yaml_references(hass, conn, msg)
-    await hass.async_block_till_done()
+    await hass.async_block_till_done(wait_background_tasks=True)
 
     result = conn.send_result.call_args[0][1]
     assert result["total_replacements"] == 0
@@ -791,6 +1218,71 @@ async def test_ws_export_states_disabled_flag(hass: HomeAssistant) -> None:
     assert by_id["sensor.exp_disabled"]["is_disabled"] is True
 
 
+async def test_ws_export_states_columnar(hass: HomeAssistant) -> None:
+    """Columnar export interns repeated values and keeps row order."""
+    entity_reg = er.async_get(hass)
+    _register(entity_reg, "sensor.col_b", disabled=True)
+    _register(entity_reg, "sensor.col_a")
+
+    conn = _mock_conn()
+    msg = {"id": 43, "type": "entity_manager/export_states", "format": "columnar"}
+
+    handle_export_states(hass, conn, msg)
+    await hass.async_block_till_done()
+
+    result = conn.send_result.call_args[0][1]
+    assert result["format"] == "columnar"
+    columns, tables = result["columns"], result["tables"]
+    assert columns["entity_id"] == ["sensor.col_a", "sensor.col_b"]
+    assert tables["platforms"] == ["test"]
+    assert columns["platform"] == [0, 0]
+    assert columns["disabled_by"][0] is None
+    assert tables["disabled_by"][columns["disabled_by"][1]] == "user"
+
+
+async def test_ws_export_states_chunked(hass: HomeAssistant) -> None:
+    """chunk_size streams fixed-size batches followed by an end terminator."""
+    entity_reg = er.async_get(hass)
+    for name in ("ch_a", "ch_b", "ch_c"):
+        _register(entity_reg, f"sensor.{name}")
+
+    conn = _mock_conn()
+    conn.subscriptions = {}
+    msg = {"id": 44, "type": "entity_manager/export_states", "chunk_size": 2}
+
+    handle_export_states(hass, conn, msg)
+    # async_response handlers run as background tasks; the stream yields between chunks
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    conn.send_result.assert_called_once_with(44)
+    events = _events(conn)
+    assert [e["type"] for e in events] == ["chunk", "chunk", "end"]
+    assert [len(e["items"]) for e in events[:2]] == [2, 1]
+    streamed = [row["entity_id"] for e in events[:2] for row in e["items"]]
+    assert streamed == ["sensor.ch_a", "sensor.ch_b", "sensor.ch_c"]
+    assert events[2]["total"] == 3
+    assert events[2]["chunks"] == 2
+    assert conn.subscriptions == {}
+
+
+async def test_chunked_stream_ends_with_error_event(hass: HomeAssistant) -> None:
+    """A failure after the ack ends the stream with an error event, not a result."""
+
+    def _encode(batch: list[int]) -> list[int]:
+        if batch[0] > 1:
+            raise ValueError("boom")
+        return batch
+
+    conn = _mock_conn()
+    conn.subscriptions = {}
+    await _async_send_chunked(conn, 45, [0, 1, 2, 3], 2, _encode)
+
+    conn.send_result.assert_called_once_with(45)
+    conn.send_error.assert_not_called()
+    assert _events(conn)[-1] == {"type": "error", "seq": 1, "message": "boom"}
+    assert conn.subscriptions == {}
+
+
 # ---------------------------------------------------------------------------
 # handle_import_entity_states
 # ---------------------------------------------------------------------------
@@ -908,3 +1400,125 @@ async def test_ws_import_partial_success(hass: HomeAssistant) -> None:
     result = conn.send_result.call_args[0][1]
     assert result["success"] == 1
     assert result["failed"] == 1
+
+
+async def test_import_job_progress_counts_every_row(hass: HomeAssistant) -> None:
+    """Progress advances per batch, including the last partial one."""
+    rows = [{"entity_id": f"sensor.imp_{i}", "is_disabled": True} for i in range(620)]
+    job = MagicMock()
+
+    await _async_import_entity_states(hass, rows, job)
+
+    job.set_total.assert_called_once_with(620)
+    assert [c.args[0] for c in job.advance.call_args_list] == [500, 120]
+
+
+# ---------------------------------------------------------------------------
+# import/* sessions
+# ---------------------------------------------------------------------------
+
+
+async def test_ws_import_session_plans_and_applies_diff(hass: HomeAssistant) -> None:
+    """Chunks merge by entity_id; the plan lists only rows that would change."""
+    entity_reg = er.async_get(hass)
+    _register(entity_reg, "sensor.sess_on")
+    _register(entity_reg, "sensor.sess_off", disabled=True)
+    _register(entity_reg, "sensor.sess_same")
+
+    conn = _mock_conn()
+    handle_import_begin(hass, conn, {"id": 60, "type": "entity_manager/import/begin"})
+    session_id = conn.send_result.call_args[0][1]["session_id"]
+
+    chunks = [
+        [
+            {"entity_id": "sensor.sess_on", "is_disabled": False},
+            {"entity_id": "sensor.sess_off", "is_disabled": False},
+        ],
+        [
+            {"entity_id": "sensor.sess_on", "is_disabled": True},
+            {"entity_id": "sensor.sess_same", "is_disabled": False},
+            {"entity_id": "sensor.sess_missing", "is_disabled": True},
+        ],
+    ]
+    for n, chunk in enumerate(chunks):
+        conn = _mock_conn()
+        handle_import_add_chunk(
+            hass,
+            conn,
+            {
+                "id": 61 + n,
+                "type": "entity_manager/import/add_chunk",
+                "session_id": session_id,
+                "entities": chunk,
+            },
+        )
+    assert conn.send_result.call_args[0][1]["rows"] == 4
+
+    conn = _mock_conn()
+    handle_import_plan(
+        hass,
+        conn,
+        {"id": 63, "type": "entity_manager/import/plan", "session_id": session_id},
+    )
+    plan = conn.send_result.call_args[0][1]
+    assert {c["entity_id"] for c in plan["changes"]} == {
+        "sensor.sess_on",
+        "sensor.sess_off",
+    }
+    assert plan["counts"] == {
+        "total": 4,
+        "to_enable": 1,
+        "to_disable": 1,
+        "unchanged": 1,
+        "not_found": 1,
+    }
+
+    conn = _mock_conn()
+    handle_import_apply(
+        hass,
+        conn,
+        {
+            "id": 64,
+            "type": "entity_manager/import/apply",
+            "session_id": session_id,
+            "background": False,
+        },
+    )
+    await hass.async_block_till_done()
+
+    result = conn.send_result.call_args[0][1]
+    assert result["success"] == 2
+    assert entity_reg.async_get("sensor.sess_on").disabled_by is not None
+    assert entity_reg.async_get("sensor.sess_off").disabled_by is None
+
+    # The session is closed after apply
+    conn = _mock_conn()
+    handle_import_plan(
+        hass,
+        conn,
+        {"id": 65, "type": "entity_manager/import/plan", "session_id": session_id},
+    )
+    assert conn.send_error.call_args[0][1] == "not_found"
+
+
+async def test_ws_import_session_row_cap(hass: HomeAssistant) -> None:
+    conn = _mock_conn()
+    handle_import_begin(hass, conn, {"id": 66, "type": "entity_manager/import/begin"})
+    session_id = conn.send_result.call_args[0][1]["session_id"]
+
+    conn = _mock_conn()
+    with patch("custom_components.entity_manager.importer.MAX_IMPORT_ROWS", 1):
+        handle_import_add_chunk(
+            hass,
+            conn,
+            {
+                "id": 67,
+                "type": "entity_manager/import/add_chunk",
+                "session_id": session_id,
+                "entities": [
+                    {"entity_id": "sensor.cap_a", "is_disabled": True},
+                    {"entity_id": "sensor.cap_b", "is_disabled": True},
+                ],
+            },
+        )
+    assert conn.send_error.call_args[0][1] == "too_many_rows"
@@ -0,0 +1,142 @@
+"""Unit tests for the persistent YAML reference index."""
+
+import os
+from pathlib import Path
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.entity_manager.websocket_api import (
+    _replace_yaml_references,
+    handle_find_yaml_references,
+    handle_update_yaml_references,
+)
+from custom_components.entity_manager.yaml_index import (
+    STORAGE_KEY,
+    YamlReferenceIndex,
+    refresh_files,
+    scan_file_refs,
+)
+
+CORPUS = {
+    "automations.yaml": (
+        "- trigger:\n"
+        "    entity_id: sensor.target\n"
+        "  action: light.turn_on  # not an entity, still a token\n"
+        "  target: {entity_id: [sensor.target, sensor.target_2]}\n"
+        "  cond: \"{{ states('sensor.target') }} sensor.target\"\n"
+    ),
+    "packages/p.yaml": "x: binary_sensor.target\ny: sensor.targets\nz: sensor.target.attr\n",
+    "scripts.yaml": "a: 1\n",
+}
+
+
+def _write(root: Path, files: dict[str, str]) -> None:
+    for rel, body in files.items():
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(body, encoding="utf-8")
+
+
+def test_scan_file_refs_lines_and_counts(tmp_path: Path) -> None:
+    _write(tmp_path, CORPUS)
+
+    refs = scan_file_refs(tmp_path / "automations.yaml")["refs"]
+    assert refs["sensor.target"] == [[2, 1], [4, 1], [5, 2]]
+    assert refs["sensor.target_2"] == [[4, 1]]
+
+
+def test_index_counts_match_rewrite_counts(tmp_path: Path) -> None:
+    _write(tmp_path, CORPUS)
+    files, _ = refresh_files(tmp_path, {})
+
+    for entity_id in ("sensor.target", "binary_sensor.target", "sensor.targets"):
+        scan = _replace_yaml_references(tmp_path, entity_id, "sensor.new", True)
+        indexed = {
+            rel: sum(c for _, c in data["refs"].get(entity_id, []))
+            for rel, data in files.items()
+            if entity_id in data["refs"]
+        }
+        assert indexed == {r["file"]: r["replacements"] for r in scan["files_updated"]}
+
+
+def test_refresh_only_rescans_changed_files(tmp_path: Path) -> None:
+    _write(tmp_path, CORPUS)
+    files, rescanned = refresh_files(tmp_path, {})
+    assert rescanned == 3
+
+    files, rescanned = refresh_files(tmp_path, files)
+    assert rescanned == 0
+
+    path = tmp_path / "scripts.yaml"
+    path.write_text("a: sensor.added_here\n", encoding="utf-8")
+    os.utime(path, ns=(1, 1))
+    files, rescanned = refresh_files(tmp_path, files)
+    assert rescanned == 1
+    assert "sensor.added_here" in files["scripts.yaml"]["refs"]
+
+
+async def test_find_yaml_references_and_indexed_dry_run(
+    hass: HomeAssistant, tmp_path: Path
+) -> None:
+    hass.config.config_dir = str(tmp_path)
+    _write(tmp_path, CORPUS)
+
+    conn = MagicMock()
+    handle_find_yaml_references(
+        hass,
+        conn,
+        {
+            "id": 1,
+            "type": "entity_manager/find_yaml_references",
+            "entity_ids": ["sensor.target", "sensor.unused"],
+        },
+    )
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    result = conn.send_result.call_args[0][1]
+    assert result["files_indexed"] == 3
+    assert result["references"]["sensor.unused"] == []
+    assert result["references"]["sensor.target"][0] == {
+        "file": "automations.yaml",
+        "line": 2,
+        "count": 1,
+    }
+
+    conn = MagicMock()
+    handle_update_yaml_references(
+        hass,
+        conn,
+        {
+            "id": 2,
+            "type": "entity_manager/update_yaml_references",
+            "old_entity_id": "sensor.target",
+            "new_entity_id": "sensor.renamed",
+            "dry_run": True,
+        },
+    )
+    await hass.async_block_till_done(wait_background_tasks=True)
+    assert conn.send_result.call_args[0][1] == _replace_yaml_references(
+        tmp_path, "sensor.target", "sensor.renamed", True
+    )
+
+
+async def test_index_persists_between_instances(
+    hass: HomeAssistant, hass_storage: dict[str, Any], tmp_path: Path
+) -> None:
+    hass.config.config_dir = str(tmp_path)
+    _write(tmp_path, CORPUS)
+    first = YamlReferenceIndex(hass)
+    await first.async_refresh()
+    await first._store.async_save(first._data_to_save())
+    assert STORAGE_KEY in hass_storage
+
+    second = YamlReferenceIndex(hass)
+    with patch("custom_components.entity_manager.yaml_index.scan_file_refs") as scan:
+        await second.async_refresh()
+    scan.assert_not_called()
+    assert second.async_file_counts("sensor.target") == [
+        ("automations.yaml", 4),
+        ("packages/p.yaml", 1),
+    ]
@@ -0,0 +1,215 @@
+"""Unit tests for the shared YAML file scanner."""
+
+from pathlib import Path
+
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.entity_manager.const import (
+    DOMAIN,
+    YAML_SCAN_ALL,
+    YAML_SCAN_INCLUDE_GRAPH,
+)
+from custom_components.entity_manager.websocket_api import _replace_yaml_references
+from custom_components.entity_manager.yaml_scan import (
+    ScanOptions,
+    async_get_scan_options,
+    iter_yaml_files,
+    map_files,
+    strip_yaml_comment,
+)
+
+
+def _write(root: Path, files: dict[str, str]) -> None:
+    for rel, body in files.items():
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(body, encoding="utf-8")
+
+
+def test_iter_yaml_files_skips_protected_paths(tmp_path: Path) -> None:
+    for rel in (
+        "configuration.yaml",
+        "secrets.yaml",
+        "packages/lights.yaml",
+        "packages/secrets.yaml",
+        ".storage/core.yaml",
+        "custom_components/x/services.yaml",
+        ".hidden/a.yaml",
+    ):
+        path = tmp_path / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("a: 1\n", encoding="utf-8")
+
+    options = ScanOptions(mode=YAML_SCAN_ALL)
+    files = [
+        p.relative_to(tmp_path).as_posix() for p in iter_yaml_files(tmp_path, options)
+    ]
+    assert files == ["configuration.yaml", "packages/lights.yaml"]
+
+
+def test_include_graph_ignores_targets_outside_config(tmp_path: Path) -> None:
+    config = tmp_path / "config"
+    _write(
+        tmp_path,
+        {
+            "config/configuration.yaml": (
+                "lovelace:\n"
+                "  dashboards:\n"
+                "    outside:\n"
+                "      filename: ../outside.yaml\n"
+                "    inside:\n"
+                '      filename: "dash #1.yaml"  # quoted hash\n'
+                "group: !include ../groups.yaml\n"
+            ),
+            "config/dash #1.yaml": "views: []\n",
+            "outside.yaml": "views: []\n",
+            "groups.yaml": "g: {}\n",
+        },
+    )
+
+    options = ScanOptions(mode=YAML_SCAN_INCLUDE_GRAPH)
+    files = [p.relative_to(config).as_posix() for p in iter_yaml_files(config, options)]
+    assert files == ["configuration.yaml", "dash #1.yaml"]
+
+
+def test_strip_yaml_comment_respects_quotes() -> None:
+    assert strip_yaml_comment("a: b # c") == "a: b "
+    assert strip_yaml_comment("# all comment") == ""
+    assert strip_yaml_comment('name: "Room #1" # c') == 'name: "Room #1" '
+    assert strip_yaml_comment("name: 'it''s #1'") == "name: 'it''s #1'"
+    assert strip_yaml_comment(r'x: "a \" #b" # c') == r'x: "a \" #b" '
+    assert strip_yaml_comment("x: Bob's room # c") == "x: Bob's room "
+    assert strip_yaml_comment("url: http://h/#frag") == "url: http://h/#frag"
+
+
+def test_iter_yaml_files_follows_includes(tmp_path: Path) -> None:
+    _write(
+        tmp_path,
+        {
+            "configuration.yaml": (
+                "automation: !include automations.yaml\n"
+                "homeassistant:\n"
+                "  packages: !include_dir_named packages\n"
+                "sensor: !include_dir_merge_list 'sensors/'\n"
+                "# script: !include scripts.yaml\n"
+                "lovelace:\n"
+                "  dashboards:\n"
+                "    lovelace-x:\n"
+                "      filename: dashboards/x.yaml\n"
+            ),
+            "automations.yaml": "- id: a\n",
+            "scripts.yaml": "s: 1\n",
+            "packages/p.yaml": "template: !include ../templates/t.yaml\n",
+            "packages/.hidden/h.yaml": "a: 1\n",
+            "templates/t.yaml": "- sensor: []\n",
+            "sensors/deep/s.yaml": "- platform: x\n",
+            "dashboards/x.yaml": "views: []\n",
+            "blueprints/automation/me/motion.yaml": "blueprint: {}\n",
+            "zigbee2mqtt/state.yaml": "big: 1\n",
+            "esphome/.esphome/build.yaml": "x: 1\n",
+        },
+    )
+
+    options = ScanOptions(mode=YAML_SCAN_INCLUDE_GRAPH)
+    files = [
+        p.relative_to(tmp_path).as_posix() for p in iter_yaml_files(tmp_path, options)
+    ]
+    # Blueprints are loaded without an include
+    assert files == [
+        "automations.yaml",
+        "blueprints/automation/me/motion.yaml",
+        "configuration.yaml",
+        "dashboards/x.yaml",
+        "packages/p.yaml",
+        "sensors/deep/s.yaml",
+        "templates/t.yaml",
+    ]
+
+
+def test_iter_yaml_files_excludes_and_size_cap(tmp_path: Path) -> None:
+    _write(
+        tmp_path,
+        {
+            "a.yaml": "a: 1\n",
+            "big.yaml": "x" * 4096,
+            "node-red/flows.yaml": "a: 1\n",
+            "media/deep/m.yaml": "a: 1\n",
+            "keep/m.yaml": "a: 1\n",
+        },
+    )
+
+    options = ScanOptions(
+        mode=YAML_SCAN_ALL, exclude=["node-red", "media/*", ""], max_bytes=1024
+    )
+    files = [
+        p.relative_to(tmp_path).as_posix() for p in iter_yaml_files(tmp_path, options)
+    ]
+    assert files == ["a.yaml", "keep/m.yaml"]
+
+
+def test_map_files_keeps_input_order(tmp_path: Path) -> None:
+    files = [tmp_path / f"f{n:02}.yaml" for n in range(20)]
+    assert map_files(lambda p: p.name, files, workers=4) == [p.name for p in files]
+
+
+def test_parallel_replace_matches_sequential_result(tmp_path: Path) -> None:
+    for n in range(12):
+        body = "x: sensor.target\ny: binary_sensor.target\n" if n % 3 else "x: 1\n"
+        (tmp_path / f"f{n:02}.yaml").write_text(body, encoding="utf-8")
+
+    result = _replace_yaml_references(
+        tmp_path, "sensor.target", "sensor.renamed", dry_run=True
+    )
+
+    assert [r["file"] for r in result["files_updated"]] == [
+        f"f{n:02}.yaml" for n in range(12) if n % 3
+    ]
+    assert result["total_replacements"] == 8
+    assert result["errors"] == []
+
+
+def test_default_scan_rewrites_files_outside_the_include_graph(
+    tmp_path: Path,
+) -> None:
+    _write(
+        tmp_path,
+        {
+            "configuration.yaml": "automation: !include automations.yaml\n",
+            "automations.yaml": "- trigger: {entity_id: sensor.target}\n",
+            "blueprints/automation/me/motion.yaml": (
+                "blueprint:\n  input:\n    s: {default: sensor.target}\n"
+            ),
+            "notes/unused.yaml": "x: sensor.target\n",
+        },
+    )
+
+    result = _replace_yaml_references(
+        tmp_path, "sensor.target", "sensor.renamed", dry_run=False
+    )
+
+    assert sorted(r["file"] for r in result["files_updated"]) == [
+        "automations.yaml",
+        "blueprints/automation/me/motion.yaml",
+        "notes/unused.yaml",
+    ]
+    blueprint = tmp_path / "blueprints/automation/me/motion.yaml"
+    assert "sensor.renamed" in blueprint.read_text(encoding="utf-8")
+
+
+async def test_scan_options_from_config_entry(hass: HomeAssistant) -> None:
+    assert async_get_scan_options(hass).mode == YAML_SCAN_ALL
+
+    MockConfigEntry(
+        domain=DOMAIN,
+        options={
+            "yaml_scan_mode": YAML_SCAN_ALL,
+            "yaml_exclude": "zigbee2mqtt,\nesphome/*",
+            "yaml_max_file_kb": 2,
+        },
+    ).add_to_hass(hass)
+    options = async_get_scan_options(hass)
+    assert options.mode == YAML_SCAN_ALL
+    assert options.exclude == ("zigbee2mqtt", "esphome/*")
+    assert options.max_bytes == 2048
+    assert options.excluded("zigbee2mqtt/state.yaml")